@@ -2,16 +2,48 @@
 Hydraulic Systems - Data Preparation
 =====================================
 Einlesen, Zusammenführen und Bereinigen der UCI Hydraulic Systems Sensordaten.
+
+Die Bereinigung (Statistiken, IQR-Ausreißer, Missing-Policies, Winsorisieren)
+läuft über die CleaningEngine: eine zusammenhängende Matrix Zeilen × Spalten
+(43.680 Rohspalten), alle Kennzahlen in einem Durchgang über Spaltenblöcke,
+Imputation und Winsorisieren direkt in der Matrix (keine Kopien des Frames).
 """
 
+import sys
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 from pathlib import Path
-from typing import Dict, Tuple
+from typing import Dict, List, Optional, Tuple, Union
 from sklearn.feature_selection import mutual_info_classif, mutual_info_regression
 
+# Gemeinsame Korrelations-Engine liegt im Repo-Root (correlation.py)
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from correlation import correlation_matrix, correlation_pairs  # noqa: E402
+from exporters import export_raw, split_sensor_blocks  # noqa: E402
+from quantile_sketch import approximate_quantiles  # noqa: E402
+
+
+# Spalten pro Block beim Profilieren (Sortier-Puffer: Zeilen × Block × 8 Bytes)
+CLEAN_BLOCK_COLS = 1024
+
+# Quantile, die pro Spalte gebraucht werden (p1, q25, q75, p99)
+PROFILE_QUANTILES = (0.01, 0.25, 0.75, 0.99)
+
+# Bis zu so vielen Spalten: dichte corr.csv + Heatmap. Darüber (43.680² ≈ 15 GB)
+# nur die stärksten Partner pro Spalte (corr_pairs.csv)
+DENSE_CORR_MAX_COLS = 2000
+
+# Layout der Matrix-Exporte (exporters.py) statt breiter Parquet-Dateien mit 43.680 Spalten:
+# 'tensor' = pro Sensor eine .npy (Memory-Map), 'long' = Parquet (sensor, cycle, t, value)
+RAW_LAYOUT = 'tensor'
+
+# Winsorisier-Grenzen p1/p99 aus dem Quantil-Sketch (quantile_sketch.py) mit diesem
+# Rangfehler statt aus der Sortierung, None = exakt. p1/p99 liegen am Rand → klein
+# wählen (0.002 heißt: Grenze liegt zwischen p0.8 und p1.2)
+WINSORIZE_QUANTILE_ERROR = None
+
 
 def load_txt_folder(path: str = "data") -> Dict[str, pd.DataFrame]:
     """
@@ -67,7 +99,25 @@ def merge_tables(tables: Dict[str, pd.DataFrame]) -> pd.DataFrame:
     Returns:
         Zusammengeführter DataFrame
     """
-    print("[merge_tables] Führe Tabellen zusammen...")
+    values, columns = merge_arrays(tables)
+    return pd.DataFrame(values, columns=columns, copy=False)
+
+
+def merge_arrays(tables: Dict[str, pd.DataFrame]) -> Tuple[np.ndarray, List[str]]:
+    """
+    Führt alle Tabellen spaltenweise in EINE Matrix zusammen (inner join auf Zeilenindex).
+    
+    Die Matrix ist spaltenweise zusammenhängend (Fortran-Order): Das ist das
+    Speicherlayout von pandas für einen Block → DataFrame darauf ohne Kopie,
+    und Reduktionen pro Spalte laufen über zusammenhängenden Speicher.
+    
+    Args:
+        tables: Dictionary mit DataFrames
+        
+    Returns:
+        Tuple aus (Matrix Zeilen × Spalten, Spaltennamen)
+    """
+    print("[merge_arrays] Führe Tabellen zusammen...")
     
     # Finde minimale Zeilenanzahl
     row_counts = {name: df.shape[0] for name, df in tables.items()}
@@ -81,209 +131,426 @@ def merge_tables(tables: Dict[str, pd.DataFrame]) -> pd.DataFrame:
             if count != min_rows:
                 print(f"    └─ {name}: {count} Zeilen → {count - min_rows} Zeilen werden abgeschnitten")
     
-    # Alle auf minimale Länge kürzen
-    trimmed_tables = {name: df.iloc[:min_rows].reset_index(drop=True) 
-                      for name, df in tables.items()}
+    # Alle auf minimale Länge kürzen und spaltenweise in die Matrix kopieren
+    columns = [col for df in tables.values() for col in df.columns]
+    merged = np.empty((min_rows, len(columns)), dtype=np.float64, order='F')
     
-    # Spaltenweise zusammenführen
-    merged = pd.concat(trimmed_tables.values(), axis=1)
+    start = 0
+    for df in tables.values():
+        merged[:, start:start + df.shape[1]] = df.iloc[:min_rows].to_numpy(dtype=np.float64)
+        start += df.shape[1]
     
     print(f"  ✓ Merged: {merged.shape[0]} Zeilen × {merged.shape[1]} Spalten\n")
-    return merged
+    return merged, columns
+
+
+def _lerp(a: np.ndarray, b: np.ndarray, t: np.ndarray) -> np.ndarray:
+    """Lineare Interpolation zwischen a und b (gleiche Formel wie np.quantile/pandas)."""
+    diff = b - a
+    return np.where(t >= 0.5, b - diff * (1 - t), a + diff * t)
+
+
+def _sorted_quantile(srt: np.ndarray, count: np.ndarray, q: float) -> np.ndarray:
+    """
+    Quantil q jeder Spalte einer spaltenweise sortierten Matrix (NaN am Ende).
+    
+    Args:
+        srt: sortierte Matrix Zeilen × Spalten
+        count: Anzahl gültiger Werte pro Spalte (> 0)
+        q: Quantil zwischen 0 und 1
+        
+    Returns:
+        Array mit einem Wert pro Spalte
+    """
+    position = (count - 1) * q
+    lower = np.floor(position).astype(np.intp)
+    upper = np.minimum(lower + 1, count - 1)
+    cols = np.arange(srt.shape[1])
+    return _lerp(srt[lower, cols], srt[upper, cols], position - lower)
+
+
+def _sorted_median(srt: np.ndarray, count: np.ndarray) -> np.ndarray:
+    """Median jeder Spalte einer sortierten Matrix (Mittel der beiden Mittelwerte wie np.median)."""
+    cols = np.arange(srt.shape[1])
+    return (srt[(count - 1) // 2, cols] + srt[count // 2, cols]) / 2
+
+
+def _column_moments(values: np.ndarray, count: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Mittelwert und Standardabweichung (ddof=1) pro Spalte einer Matrix ohne NaN.
+    
+    Gleicher Rechenweg wie pandas (Summe / n, dann Summe der quadrierten
+    Abweichungen) → bitgleiche Werte wie Series.mean() / Series.std().
+    """
+    mean = values.sum(axis=0) / count
+    var = ((mean - values) ** 2).sum(axis=0) / (count - 1)
+    return mean, np.sqrt(var)
+
+
+class CleaningEngine:
+    """
+    Bereinigung der zusammengeführten Rohmatrix (Zeilen × Spalten) ohne Spalten-Schleifen.
+    
+    - profile: alle Kennzahlen pro Spalte (Fehlwerte, min/max, mean/std,
+      p1/q25/median/q75/p99, IQR-Ausreißer) in EINEM Durchgang, blockweise
+      über CLEAN_BLOCK_COLS Spalten (ein np.sort pro Block)
+    - impute_missing / winsorize: arbeiten direkt in der Matrix (in place)
+    - frame(): DataFrame als View auf die Matrix (keine Kopie)
+    
+    Die Ergebnisse sind identisch zu den früheren pandas-Schleifen pro Spalte.
+    """
+    
+    def __init__(self, values: np.ndarray, columns: List[str]):
+        """
+        Args:
+            values: Matrix Zeilen × Spalten (float64, am besten Fortran-Order,
+                    sonst wird einmal umkopiert). Wird in place verändert!
+            columns: Spaltennamen
+        """
+        if values.dtype != np.float64 or not values.flags.f_contiguous or not values.flags.writeable:
+            values = np.array(values, dtype=np.float64, order='F')
+        self.values = values
+        self.columns = list(columns)
+        self.n_rows = values.shape[0]
+        self._profile = None
+        self._imputed = None  # Maske der imputierten Spalten (nach impute_missing)
+    
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> 'CleaningEngine':
+        """
+        Engine auf einer Kopie der Daten eines DataFrames (Typos → NaN).
+        
+        Args:
+            df: Input DataFrame (bleibt unverändert)
+            
+        Returns:
+            CleaningEngine
+        """
+        if not all(pd.api.types.is_numeric_dtype(dtype) for dtype in df.dtypes):
+            df = df.apply(pd.to_numeric, errors='coerce')
+        return cls(np.array(df.to_numpy(dtype=np.float64), order='F'), df.columns)
+    
+    def frame(self) -> pd.DataFrame:
+        """Aktueller Stand als DataFrame (View auf die Matrix, keine Kopie)."""
+        return pd.DataFrame(self.values, columns=self.columns, copy=False)
+    
+    @property
+    def profile(self) -> Dict[str, np.ndarray]:
+        """
+        Kennzahlen aller Spalten der Rohdaten (einmal berechnet, danach wiederverwendet).
+        
+        Returns:
+            Dictionary mit einem Array pro Kennzahl (Länge = Anzahl Spalten):
+            count, n_missing, min, max, mean, std, median, p1, q25, q75, p99, n_outliers
+        """
+        if self._profile is None:
+            blocks = [self._profile_block(self.values[:, start:start + CLEAN_BLOCK_COLS])
+                      for start in range(0, self.values.shape[1], CLEAN_BLOCK_COLS)]
+            self._profile = {key: np.concatenate([block[key] for block in blocks])
+                             for key in blocks[0]} if blocks else {}
+        return self._profile
+    
+    def _profile_block(self, block: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Kennzahlen für einen Spaltenblock: ein Sortier-Durchgang für alle Quantile.
+        
+        Args:
+            block: View Zeilen × Block-Spalten
+            
+        Returns:
+            Dictionary Kennzahl → Array (eine Zahl pro Spalte)
+        """
+        n_cols = block.shape[1]
+        missing = np.isnan(block)
+        n_missing = missing.sum(axis=0)
+        count = self.n_rows - n_missing
+        valid = count > 0
+        
+        res = {'count': count, 'n_missing': n_missing}
+        for key in ('min', 'max', 'mean', 'std', 'median', 'p1', 'q25', 'q75', 'p99'):
+            res[key] = np.full(n_cols, np.nan)
+        
+        # Sortieren pro Spalte, NaN landen am Ende → Quantile über die ersten count Werte
+        srt = np.sort(block[:, valid], axis=0)
+        n_valid = count[valid]
+        cols = np.arange(srt.shape[1])
+        res['min'][valid] = srt[0]
+        res['max'][valid] = srt[n_valid - 1, cols]
+        res['median'][valid] = _sorted_median(srt, n_valid)
+        for key, q in zip(('p1', 'q25', 'q75', 'p99'), PROFILE_QUANTILES):
+            res[key][valid] = _sorted_quantile(srt, n_valid, q)
+        
+        # Momente: Spalten ohne Fehlwerte direkt, Spalten mit Typos einzeln ohne NaN
+        complete = n_missing == 0
+        with np.errstate(invalid='ignore', divide='ignore'):
+            res['mean'][complete], res['std'][complete] = _column_moments(block[:, complete], count[complete])
+            for j in np.flatnonzero(valid & ~complete):
+                col = block[~missing[:, j], j]
+                mean, std = _column_moments(col[:, None], count[j:j + 1])
+                res['mean'][j], res['std'][j] = mean[0], std[0]
+        res['std'][count < 2] = np.nan  # wie pandas: std braucht mindestens 2 Werte
+        
+        # Ausreißer nach IQR-Regel (NaN-Vergleiche sind False → zählen nicht)
+        iqr = res['q75'] - res['q25']
+        lower = res['q25'] - 1.5 * iqr
+        upper = res['q75'] + 1.5 * iqr
+        with np.errstate(invalid='ignore'):
+            res['n_outliers'] = ((block < lower) | (block > upper)).sum(axis=0)
+        
+        return res
+    
+    def impute_missing(self, max_pct_missing: float = 40) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Missing-Policies in place: Median-Imputation, Spalten über max_pct_missing weg.
+        
+        Args:
+            max_pct_missing: Spalten mit mehr Fehlwerten (in %) werden entfernt
+            
+        Returns:
+            Tuple aus (Maske der entfernten Spalten, Maske der imputierten Spalten)
+        """
+        profile = self.profile
+        pct_missing = 100 * profile['n_missing'] / max(self.n_rows, 1)
+        drop = pct_missing > max_pct_missing
+        impute = ~drop & (pct_missing > 0)
+        
+        for j in np.flatnonzero(impute):
+            col = self.values[:, j]
+            col[np.isnan(col)] = profile['median'][j]
+        self._imputed = impute
+        
+        if drop.any():
+            # Nur beim Entfernen von Spalten wird (einmal) umkopiert
+            keep = np.flatnonzero(~drop)
+            values = np.empty((self.n_rows, len(keep)), dtype=np.float64, order='F')
+            np.take(self.values, keep, axis=1, out=values, mode='clip')
+            self.values = values
+            self.columns = [self.columns[j] for j in keep]
+            self._profile = {key: arr[keep] for key, arr in profile.items()}
+            self._imputed = self._imputed[keep]
+        
+        return drop, impute
+    
+    def winsorize(self, quantile_error: Optional[float] = None) -> np.ndarray:
+        """
+        Winsorisiert alle Spalten in place auf [p1, p99].
+        
+        Die Quantile beziehen sich auf den aktuellen Stand: Unveränderte Spalten
+        nehmen p1/p99 aus dem Profil, nur die (wenigen) imputierten Spalten
+        werden neu ausgewertet.
+        
+        Mit quantile_error kommen p1/p99 stattdessen aus dem Quantil-Sketch:
+        pro Spaltenblock laufen die Zeilen blockweise hinein, ohne Profil
+        und ohne Sortierung der Spalten.
+        
+        Args:
+            quantile_error: Rangfehler der Näherungs-Grenzen (None = exakt)
+        
+        Returns:
+            Array Spalten × 2 mit den Grenzen (p1, p99)
+        """
+        if quantile_error is not None:
+            bounds = np.empty((self.values.shape[1], 2))
+            for start in range(0, self.values.shape[1], CLEAN_BLOCK_COLS):
+                block = self.values[:, start:start + CLEAN_BLOCK_COLS]
+                bounds[start:start + block.shape[1]] = approximate_quantiles(block, [0.01, 0.99],
+                                                                             quantile_error, axis=0)
+        else:
+            bounds = self._exact_winsor_bounds()
+        
+        for start in range(0, self.values.shape[1], CLEAN_BLOCK_COLS):
+            block = self.values[:, start:start + CLEAN_BLOCK_COLS]
+            lower, upper = bounds[start:start + CLEAN_BLOCK_COLS].T
+            # Spalten ohne gültige Werte bleiben unverändert (Grenzen NaN)
+            np.clip(block, np.where(np.isnan(lower), -np.inf, lower),
+                    np.where(np.isnan(upper), np.inf, upper), out=block)
+        
+        return bounds
+    
+    def _exact_winsor_bounds(self) -> np.ndarray:
+        """Exakte Grenzen (p1, p99) pro Spalte aus Profil bzw. imputierten Spalten."""
+        profile = self.profile
+        bounds = np.column_stack([profile['p1'], profile['p99']])
+        
+        if self._imputed is not None:
+            imputed = np.flatnonzero(self._imputed)
+            if len(imputed) > 0:
+                bounds[imputed] = np.quantile(self.values[:, imputed], [0.01, 0.99], axis=0).T
+        
+        return bounds
 
 
-def basic_stats(df: pd.DataFrame) -> pd.DataFrame:
+def _as_engine(data: Union[pd.DataFrame, CleaningEngine]) -> CleaningEngine:
+    """Engine für die Daten (DataFrame → Kopie, Engine → unverändert, also in place)."""
+    return data if isinstance(data, CleaningEngine) else CleaningEngine.from_frame(data)
+
+
+def basic_stats(data: Union[pd.DataFrame, CleaningEngine]) -> pd.DataFrame:
     """
     Erstellt Basis-Statistiken für alle Spalten.
     
     Args:
-        df: Input DataFrame
+        data: Input DataFrame oder CleaningEngine (Profil wird wiederverwendet)
         
     Returns:
         DataFrame mit Statistiken
     """
     print("[basic_stats] Erstelle Statistiken...")
     
-    stats_list = []
-    
-    for col in df.columns:
-        series = df[col].dropna()
-        n_total = len(df[col])
-        n_missing = df[col].isna().sum()
-        pct_missing = 100 * n_missing / n_total if n_total > 0 else 0
-        
-        if len(series) > 0:
-            stats_list.append({
-                'column': col,
-                'count': len(series),
-                'n_missing': n_missing,
-                'pct_missing': round(pct_missing, 2),
-                'min': series.min(),
-                'p1': series.quantile(0.01),
-                'mean': series.mean(),
-                'median': series.median(),
-                'p99': series.quantile(0.99),
-                'max': series.max(),
-                'std': series.std()
-            })
-        else:
-            stats_list.append({
-                'column': col,
-                'count': 0,
-                'n_missing': n_missing,
-                'pct_missing': 100.0,
-                'min': np.nan,
-                'p1': np.nan,
-                'mean': np.nan,
-                'median': np.nan,
-                'p99': np.nan,
-                'max': np.nan,
-                'std': np.nan
-            })
-    
-    stats_df = pd.DataFrame(stats_list)
+    engine = _as_engine(data)
+    profile = engine.profile
+    n_total = engine.n_rows
+    
+    stats_df = pd.DataFrame({
+        'column': engine.columns,
+        'count': profile['count'],
+        'n_missing': profile['n_missing'],
+        'pct_missing': np.round(100 * profile['n_missing'] / max(n_total, 1), 2),
+        'min': profile['min'],
+        'p1': profile['p1'],
+        'mean': profile['mean'],
+        'median': profile['median'],
+        'p99': profile['p99'],
+        'max': profile['max'],
+        'std': profile['std']
+    })
     stats_df.to_csv("out/stats.csv", index=False)
     print(f"  ✓ Statistiken gespeichert: out/stats.csv\n")
     
     return stats_df
 
 
-def validate_and_flag(df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+def validate_and_flag(data: Union[pd.DataFrame, CleaningEngine]) -> Tuple[pd.DataFrame, pd.DataFrame]:
     """
     Validiert Daten und markiert Ausreißer via IQR-Regel.
     
     Args:
-        df: Input DataFrame
+        data: Input DataFrame oder CleaningEngine
         
     Returns:
         Tuple aus (bereinigter DataFrame, Quality-Report DataFrame)
     """
     print("[validate_and_flag] Validiere Daten und markiere Ausreißer...")
     
-    # Zahlen erzwingen
-    df_clean = df.apply(pd.to_numeric, errors='coerce')
-    
-    quality_list = []
-    
-    for col in df_clean.columns:
-        series = df_clean[col].dropna()
-        n_total = len(df_clean[col])
-        n_missing = df_clean[col].isna().sum()
-        
-        # Ausreißer via IQR
-        if len(series) > 0:
-            q1 = series.quantile(0.25)
-            q3 = series.quantile(0.75)
-            iqr = q3 - q1
-            lower = q1 - 1.5 * iqr
-            upper = q3 + 1.5 * iqr
-            
-            n_outliers = ((series < lower) | (series > upper)).sum()
-            pct_outliers = 100 * n_outliers / n_total if n_total > 0 else 0
-        else:
-            n_outliers = 0
-            pct_outliers = 0
-        
-        # Typos (bereits zu NaN konvertiert beim Einlesen)
-        n_typos = n_missing
-        
-        quality_list.append({
-            'column': col,
-            'n_outliers': n_outliers,
-            'pct_outliers': round(pct_outliers, 2),
-            'n_typos': n_typos,
-            'pct_typos': round(100 * n_typos / n_total, 2) if n_total > 0 else 0
-        })
-    
-    quality_df = pd.DataFrame(quality_list)
+    # Zahlen erzwingen (from_frame: Typos → NaN)
+    engine = _as_engine(data)
+    profile = engine.profile
+    n_total = max(engine.n_rows, 1)
+    
+    # Ausreißer via IQR (im Profil gezählt), Typos = beim Einlesen zu NaN konvertiert
+    quality_df = pd.DataFrame({
+        'column': engine.columns,
+        'n_outliers': profile['n_outliers'],
+        'pct_outliers': np.round(100 * profile['n_outliers'] / n_total, 2),
+        'n_typos': profile['n_missing'],
+        'pct_typos': np.round(100 * profile['n_missing'] / n_total, 2)
+    })
     quality_df.to_csv("out/quality.csv", index=False)
     print(f"  ✓ Quality-Report gespeichert: out/quality.csv\n")
     
-    return df_clean, quality_df
+    return engine.frame(), quality_df
 
 
-def apply_missing_policies(df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+def apply_missing_policies(data: Union[pd.DataFrame, CleaningEngine]) -> Tuple[pd.DataFrame, pd.DataFrame]:
     """
     Wendet Missing-Value-Policies an:
     - Spalten mit >40% Missing: droppen
     - Spalten mit 0-40% Missing: Median-Imputation
     
+    Mit einer CleaningEngine wird direkt in deren Matrix imputiert (in place).
+    
     Args:
-        df: Input DataFrame
+        data: Input DataFrame oder CleaningEngine
         
     Returns:
         Tuple aus (bereinigter DataFrame, Policies DataFrame)
     """
     print("[apply_missing_policies] Wende Missing-Policies an...")
     
-    policies_list = []
-    df_clean = df.copy()
+    engine = _as_engine(data)
+    columns = engine.columns
+    profile = engine.profile
+    pct_missing = 100 * profile['n_missing'] / max(engine.n_rows, 1)
     
-    for col in df.columns:
-        n_total = len(df[col])
-        n_missing = df[col].isna().sum()
-        pct_missing = 100 * n_missing / n_total if n_total > 0 else 0
-        
-        if pct_missing > 40:
-            action = "DROP (>40% missing)"
-            df_clean = df_clean.drop(columns=[col])
-        elif pct_missing > 0:
-            action = f"IMPUTE with median ({df[col].median():.4f})"
-            df_clean[col] = df_clean[col].fillna(df[col].median())
-        else:
-            action = "NO ACTION (no missing)"
-        
-        policies_list.append({
-            'column': col,
-            'pct_missing': round(pct_missing, 2),
-            'action': action
-        })
+    drop, impute = engine.impute_missing(max_pct_missing=40)
+    
+    actions = np.full(len(columns), "NO ACTION (no missing)", dtype=object)
+    actions[drop] = "DROP (>40% missing)"
+    for j in np.flatnonzero(impute):
+        actions[j] = f"IMPUTE with median ({profile['median'][j]:.4f})"
     
-    policies_df = pd.DataFrame(policies_list)
+    policies_df = pd.DataFrame({
+        'column': columns,
+        'pct_missing': np.round(pct_missing, 2),
+        'action': actions
+    })
     policies_df.to_csv("out/policies.csv", index=False)
     print(f"  ✓ Policies gespeichert: out/policies.csv")
-    print(f"  ✓ Spalten nach Bereinigung: {df_clean.shape[1]} (von {df.shape[1]})\n")
+    print(f"  ✓ Spalten nach Bereinigung: {len(engine.columns)} (von {len(columns)})\n")
     
-    return df_clean, policies_df
+    return engine.frame(), policies_df
 
 
-def winsorize_outliers(df: pd.DataFrame) -> pd.DataFrame:
+def winsorize_outliers(data: Union[pd.DataFrame, CleaningEngine],
+                       quantile_error: Optional[float] = None) -> pd.DataFrame:
     """
     Winsorisiert Ausreißer auf [p1, p99] pro Spalte.
     
+    Mit einer CleaningEngine wird direkt in deren Matrix geclippt (in place).
+    
     Args:
-        df: Input DataFrame
+        data: Input DataFrame oder CleaningEngine
+        quantile_error: p1/p99 aus dem Quantil-Sketch mit diesem Rangfehler (None = exakt)
         
     Returns:
         Winsorisierter DataFrame
     """
     print("[winsorize_outliers] Winsorisiere auf [p1, p99]...")
     
-    df_winsor = df.copy()
-    
-    for col in df_winsor.columns:
-        if df_winsor[col].notna().sum() > 0:
-            p1 = df_winsor[col].quantile(0.01)
-            p99 = df_winsor[col].quantile(0.99)
-            df_winsor[col] = df_winsor[col].clip(lower=p1, upper=p99)
+    engine = _as_engine(data)
+    engine.winsorize(quantile_error)
     
     print(f"  ✓ Winsorisierung abgeschlossen\n")
-    return df_winsor
+    return engine.frame()
 
 
-def compute_correlation(df: pd.DataFrame) -> pd.DataFrame:
+def compute_correlation(df: pd.DataFrame, top_k: int = 20, threshold: float = 0.5,
+                        memmap_path: Optional[str] = None) -> pd.DataFrame:
     """
     Berechnet Pearson-Korrelation und erstellt Heatmap.
     
+    Gekachelt über correlation.py (Matrixprodukte statt df.corr):
+    - bis DENSE_CORR_MAX_COLS Spalten: dichte Matrix → corr.csv + Heatmap
+    - darüber (Rohdaten): pro Spalte die top_k Partner mit |r| >= threshold
+      → corr_pairs.csv; optional zusätzlich die dichte Matrix als
+      memory-mapped .npy (float32, z.B. out/corr.npy)
+    
     Args:
         df: Input DataFrame
+        top_k: Partner pro Spalte (nur breite Matrizen)
+        threshold: Mindestbetrag |r| (nur breite Matrizen)
+        memmap_path: Optional Ziel-Datei für die dichte Matrix (nur breite Matrizen)
         
     Returns:
-        Korrelationsmatrix
+        Korrelationsmatrix bzw. Paare (feature, other, r)
     """
     print("[compute_correlation] Berechne Korrelationsmatrix...")
     
-    corr = df.corr(numeric_only=True)
+    numeric = df.select_dtypes(include='number')
+    columns = list(numeric.columns)
+    values = numeric.to_numpy(dtype=np.float64)
+    
+    if len(columns) > DENSE_CORR_MAX_COLS:
+        if memmap_path is not None:
+            correlation_matrix(values, dtype=np.float32, out=memmap_path)
+            print(f"  ✓ Dichte Matrix (memory-mapped) gespeichert: {memmap_path}")
+        pairs = correlation_pairs(values, columns, k=top_k, threshold=threshold)
+        pairs.to_csv("out/corr_pairs.csv", index=False)
+        print(f"  ✓ {len(pairs)} Paare (Top-{top_k}, |r| >= {threshold}) gespeichert: out/corr_pairs.csv")
+        print(f"  ℹ {len(columns)} Spalten → keine Heatmap\n")
+        return pairs
+    
+    corr = pd.DataFrame(correlation_matrix(values), index=columns, columns=columns)
     corr.to_csv("out/corr.csv")
     print(f"  ✓ Korrelation gespeichert: out/corr.csv")
     
@@ -348,6 +615,22 @@ def compute_mutual_info(df: pd.DataFrame) -> None:
     print(f"  ✓ Mutual Information gespeichert: out/mi.csv\n")
 
 
+def export_matrix(engine: CleaningEngine, name: str, layout: str = RAW_LAYOUT) -> Path:
+    """
+    Speichert die Matrix der Engine im Roh-Layout (ein Block pro Sensor).
+    
+    Args:
+        engine: CleaningEngine (Spalten '<sensor>_<t>')
+        name: Name unter out/ (z.B. raw_merged)
+        layout: 'tensor' (Ordner) oder 'long' (.parquet)
+        
+    Returns:
+        Pfad des Exports
+    """
+    path = Path("out") / (f"{name}.parquet" if layout == 'long' else name)
+    return export_raw(split_sensor_blocks(engine.values, engine.columns), path, layout)
+
+
 def main():
     """
     Hauptfunktion: Führt komplette Datenaufbereitung durch.
@@ -359,43 +642,47 @@ def main():
     # 1. Laden
     tables = load_txt_folder("data")
     
-    # 2. Merge
-    df_merged = merge_tables(tables)
+    # 2. Merge (eine Matrix, alle weiteren Schritte arbeiten direkt darauf)
+    values, columns = merge_arrays(tables)
+    del tables
+    engine = CleaningEngine(values, columns)
+    df_merged = engine.frame()
     
     print(f"[main] Speichere raw_merged ({df_merged.shape})...")
-    df_merged.to_parquet("out/raw_merged.parquet", index=False)
-    print(f"  ✓ Raw merged gespeichert: out/raw_merged.parquet")
+    path = export_matrix(engine, "raw_merged")
+    print(f"  ✓ Raw merged gespeichert: {path} (Layout {RAW_LAYOUT})")
     
     # Preview: erste 100 Spalten als CSV
     df_merged.iloc[:, :100].to_csv("out/raw_merged_preview.csv", index=False)
     print(f"  ✓ Preview (erste 100 Spalten) gespeichert: out/raw_merged_preview.csv\n")
     
-    # 3. Basic Stats
-    stats_df = basic_stats(df_merged)
+    # 3. Basic Stats (Profil aller Spalten in einem Durchgang)
+    stats_df = basic_stats(engine)
     
-    # 4. Validate & Flag
-    df_validated, quality_df = validate_and_flag(df_merged)
+    # 4. Validate & Flag (gleiches Profil)
+    df_validated, quality_df = validate_and_flag(engine)
     
-    # 5. Apply Missing Policies
-    df_clean, policies_df = apply_missing_policies(df_validated)
+    # 5. Apply Missing Policies (Imputation in place)
+    df_clean, policies_df = apply_missing_policies(engine)
     
     # 6. Exports (mit und ohne Winsorize)
-    # Bei vielen Spalten: Parquet nutzen (schneller & kompakter)
-    df_clean_nowinsor = df_clean.copy()
+    # Bei vielen Spalten: Roh-Layout statt CSV (schneller & kompakter, Zyklen/Sensoren einzeln lesbar)
+    # Erst exportieren, dann in place winsorisieren → keine Kopie nötig
+    df_clean_nowinsor = df_clean
     
     print(f"[main] Speichere clean_nowinsor ({df_clean_nowinsor.shape})...")
-    df_clean_nowinsor.to_parquet("out/clean_nowinsor.parquet", index=False)
-    print(f"  ✓ Clean (ohne Winsorize) gespeichert: out/clean_nowinsor.parquet")
+    path = export_matrix(engine, "clean_nowinsor")
+    print(f"  ✓ Clean (ohne Winsorize) gespeichert: {path} (Layout {RAW_LAYOUT})")
     
     # Nur erste 100 Spalten als CSV (für Quick View)
     df_clean_nowinsor.iloc[:, :100].to_csv("out/clean_nowinsor_preview.csv", index=False)
     print(f"  ✓ Preview (erste 100 Spalten) gespeichert: out/clean_nowinsor_preview.csv\n")
     
-    df_clean_winsor = winsorize_outliers(df_clean)
+    df_clean_winsor = winsorize_outliers(engine, WINSORIZE_QUANTILE_ERROR)
     
     print(f"[main] Speichere clean ({df_clean_winsor.shape})...")
-    df_clean_winsor.to_parquet("out/clean.parquet", index=False)
-    print(f"  ✓ Clean (mit Winsorize) gespeichert: out/clean.parquet")
+    path = export_matrix(engine, "clean")
+    print(f"  ✓ Clean (mit Winsorize) gespeichert: {path} (Layout {RAW_LAYOUT})")
     
     # Nur erste 100 Spalten als CSV (für Quick View)
     df_clean_winsor.iloc[:, :100].to_csv("out/clean_preview.csv", index=False)
@@ -411,17 +698,16 @@ def main():
     print("✓ DATA PREPARATION ABGESCHLOSSEN")
     print("=" * 70)
     print("\nExportierte Dateien:")
-    print("  • out/raw_merged.parquet (Hauptdatei)")
+    print(f"  • out/raw_merged (Hauptdatei, Layout {RAW_LAYOUT}, lesen mit exporters.read_raw)")
     print("  • out/raw_merged_preview.csv (erste 100 Spalten)")
     print("  • out/stats.csv")
     print("  • out/quality.csv")
     print("  • out/policies.csv")
-    print("  • out/clean_nowinsor.parquet (Hauptdatei)")
+    print(f"  • out/clean_nowinsor (Hauptdatei, Layout {RAW_LAYOUT})")
     print("  • out/clean_nowinsor_preview.csv (erste 100 Spalten)")
-    print("  • out/clean.parquet (Hauptdatei)")
+    print(f"  • out/clean (Hauptdatei, Layout {RAW_LAYOUT})")
     print("  • out/clean_preview.csv (erste 100 Spalten)")
-    print("  • out/corr.csv")
-    print("  • out/corr_heatmap.png")
+    print("  • out/corr.csv + out/corr_heatmap.png (bzw. out/corr_pairs.csv bei vielen Spalten)")
     print("  • out/mi.csv (falls Zielspalte vorhanden)")
     print()
 
@@ -1,24 +1,29 @@
 """
-Quick script to extract 8 features from the first row of VS1.txt
+Quick script to extract 8 features from one row of VS1.txt (default: the first).
 Demonstrates feature engineering on a single time-series.
+
+Aufruf:
+    python archive/temp_getFeaturesVS1.py [zyklus]
 """
 
+import sys
 import numpy as np
 from pathlib import Path
 
+# Zeilen-Index liegt im Repo-Root (row_index.py)
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from row_index import RowIndex  # noqa: E402
+
 # Pfade
 DATA_DIR = Path('data')
-vs1_file = DATA_DIR / 'VS1.txt'
-
-# Erste Zeile laden
-with open(vs1_file, 'r') as f:
-    first_row = f.readline().strip()
+CYCLE = int(sys.argv[1]) if len(sys.argv) > 1 else 0
 
-# In Zahlenwerte konvertieren (tab-getrennt)
-values = np.array([float(x) for x in first_row.split('\t')])
+# Nur diese Zeile lesen (Byte-Offset aus dem Index, Typos → NaN)
+with RowIndex(DATA_DIR) as index:
+    values = index.get_cycle('vs1', CYCLE)
 
 print("=" * 70)
-print("VS1 - ERSTE ZEILE (VIBRATIONSSENSOR)")
+print(f"VS1 - ZYKLUS {CYCLE} (VIBRATIONSSENSOR)")
 print("=" * 70)
 print(f"Anzahl Messpunkte: {len(values)}")
 print(f"Erste 10 Werte: {values[:10]}\n")
@@ -36,7 +41,7 @@ features = {
 }
 
 # Ausgabe
-print("FEATURES FÜR ZYKLUS 1:")
+print(f"FEATURES FÜR ZYKLUS {CYCLE}:")
 print("-" * 70)
 for feature_name, value in features.items():
     print(f"vs1_{feature_name:6s} = {value:10.4f}")
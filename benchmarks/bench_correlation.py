@@ -0,0 +1,65 @@
+"""
+Benchmark: Korrelation breiter Matrizen
+========================================
+Vergleicht df.corr() mit der gekachelten Engine (correlation.py) auf
+synthetischen Rohdaten (2205 Zeilen × N Spalten) und prüft die Abweichung.
+Für große N nur die Engine (dicht als memmap und Top-k).
+
+Aufruf:
+    python benchmarks/bench_correlation.py [--cols 500 2000 8000] [--pandas-max 2000]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from correlation import correlation_matrix, correlation_pairs  # noqa: E402
+
+
+def timed(func):
+    """Laufzeit eines Aufrufs (Sekunden) und Ergebnis."""
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--cols', type=int, nargs='+', default=[500, 2000, 8000], help='Spaltenzahlen')
+    parser.add_argument('--rows', type=int, default=2205, help='Zeilen (Zyklen)')
+    parser.add_argument('--pandas-max', type=int, default=2000, help='df.corr() nur bis zu so vielen Spalten')
+    args = parser.parse_args()
+
+    print(f"{'Spalten':>8} {'pandas [s]':>11} {'dicht [s]':>10} {'memmap [s]':>11} "
+          f"{'Top-10 [s]':>11} {'max. Abw.':>10}")
+    print("-" * 66)
+
+    rng = np.random.default_rng(42)
+    for n_cols in args.cols:
+        values = rng.standard_normal((args.rows, n_cols)).cumsum(axis=0)
+        columns = [f"c{i}" for i in range(n_cols)]
+
+        t_dense, corr = timed(lambda: correlation_matrix(values))
+        with tempfile.TemporaryDirectory() as tmp:
+            t_memmap, _ = timed(lambda: correlation_matrix(values, dtype=np.float32, out=Path(tmp) / "corr.npy"))
+        t_pairs, _ = timed(lambda: correlation_pairs(values, columns, k=10))
+
+        if n_cols <= args.pandas_max:
+            t_pandas, reference = timed(lambda: pd.DataFrame(values).corr().to_numpy())
+            pandas_info = f"{t_pandas:>11.2f}"
+            deviation = f"{np.nanmax(np.abs(corr - reference)):>10.1e}"
+        else:
+            pandas_info, deviation = f"{'-':>11}", f"{'-':>10}"
+        del corr
+
+        print(f"{n_cols:>8} {pandas_info} {t_dense:>10.2f} {t_memmap:>11.2f} {t_pairs:>11.2f} {deviation}")
+
+
+if __name__ == "__main__":
+    main()
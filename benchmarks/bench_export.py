@@ -0,0 +1,152 @@
+"""
+Benchmark: Export-Formate (exporters.py) gegen CSV
+==================================================
+Features (Zyklen × 141 Spalten): CSV, CSV.gz, Parquet, Arrow (je mit und ohne
+Kompression). Rohdaten (17 Sensoren, 43.680 Spalten): die Layouts 'long' und
+'tensor', optional gegen breite CSV und breite Parquet-Datei (bisheriger Weg
+im Archiv-Skript). Vorsicht: Der Parquet-Writer puffert pro Spalte, bei
+43.680 Spalten braucht die breite Datei sehr viel Arbeitsspeicher.
+
+Gemessen pro Format:
+- Schreiben, Dateigröße
+- Lesen komplett
+- Lesen einer Auswahl (5 Spalten bzw. 1 Sensor, 100 Zyklen)
+
+Nutzt out/features_complete.csv falls vorhanden (auf --cycles Zeilen
+wiederholt), sonst synthetische Daten. Parquet/Arrow brauchen pyarrow.
+
+Aufruf:
+    python benchmarks/bench_export.py [--cycles 22050] [--raw-cycles 500] [--raw-csv] [--raw-wide-parquet]
+"""
+
+import argparse
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from exporters import export_raw, export_table, read_raw, read_table  # noqa: E402
+from prep_corrected import CYCLE_SECONDS, SAMPLING_RATES, TARGET_COLUMNS  # noqa: E402
+
+
+def timed(func):
+    """Laufzeit eines Aufrufs (Sekunden) und Ergebnis."""
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def size_of(path: Path) -> int:
+    """Größe einer Datei oder eines Ordners in Bytes."""
+    return sum(f.stat().st_size for f in path.rglob('*')) if path.is_dir() else path.stat().st_size
+
+
+def load_features(path: Path, n_cycles: int) -> pd.DataFrame:
+    """Echte Features (auf n_cycles Zeilen wiederholt) oder synthetische Tabelle gleicher Form."""
+    if path.exists():
+        df = pd.read_csv(path)
+        return pd.concat([df] * -(-n_cycles // len(df)), ignore_index=True).iloc[:n_cycles]
+
+    rng = np.random.default_rng(42)
+    df = pd.DataFrame(100 + rng.standard_normal((n_cycles, 136)),
+                      columns=[f"f{i}" for i in range(136)])
+    for col in TARGET_COLUMNS:
+        df[col] = rng.integers(0, 4, n_cycles)
+    return df
+
+
+def bench_features(df: pd.DataFrame, tmp: Path):
+    """Tabellen-Formate für den Feature-Datensatz."""
+    columns = list(df.columns[:4]) + [TARGET_COLUMNS[0]]
+    cycles = slice(len(df) // 2, len(df) // 2 + 100)
+
+    print(f"\nFeatures: {len(df)} Zyklen × {df.shape[1]} Spalten")
+    print(f"{'Format':<16} {'Schreiben':>10} {'Größe [MB]':>11} {'Lesen':>8} {'5 Spalten':>10} {'100 Zyklen':>11}")
+    print("-" * 70)
+
+    variants = [('csv', None, 'f.csv'), ('csv.gz', None, 'f.csv.gz'),
+                ('parquet', None, 'f.parquet'), ('parquet zstd', 'zstd', 'f_zstd.parquet'),
+                ('arrow', None, 'f.arrow'), ('arrow zstd', 'zstd', 'f_zstd.arrow')]
+    for name, compression, filename in variants:
+        path = tmp / filename
+        t_write, _ = timed(lambda: export_table(df, path, compression=compression))
+        t_read, _ = timed(lambda: read_table(path))
+        t_cols, _ = timed(lambda: read_table(path, columns=columns))
+        t_cycles, _ = timed(lambda: read_table(path, cycles=cycles))
+        print(f"{name:<16} {t_write:>9.3f}s {size_of(path) / 1e6:>11.1f} {t_read:>7.3f}s "
+              f"{t_cols:>9.3f}s {t_cycles:>10.3f}s")
+
+
+def bench_raw(n_cycles: int, tmp: Path, with_csv: bool, with_wide_parquet: bool):
+    """Roh-Layouts gegen die breite Parquet-Datei (und optional breite CSV)."""
+    rng = np.random.default_rng(0)
+    raw = {sensor: 100 + rng.standard_normal((n_cycles, CYCLE_SECONDS * rate)).cumsum(axis=1)
+           for sensor, rate in sorted(SAMPLING_RATES.items())}
+    columns = [f"{sensor}_{i}" for sensor, values in raw.items() for i in range(values.shape[1])]
+    cycles = slice(n_cycles // 2, n_cycles // 2 + min(100, n_cycles // 2))
+    blocks = lambda: ((sensor, values, None) for sensor, values in raw.items())  # noqa: E731
+
+    def wide():
+        return pd.DataFrame(np.hstack(list(raw.values())), columns=columns)
+
+    print(f"\nRohdaten: {n_cycles} Zyklen × {len(columns)} Spalten (17 Sensoren)")
+    print(f"{'Layout':<16} {'Schreiben':>10} {'Größe [MB]':>11} {'Lesen':>8} {'PS1, 100 Zykl.':>15}")
+    print("-" * 64)
+
+    variants = []
+    if with_csv:
+        variants.append(('breit csv', tmp / 'raw.csv',
+                         lambda p: wide().to_csv(p, index=False),
+                         lambda p: pd.read_csv(p),
+                         lambda p: pd.read_csv(p, usecols=[f"ps1_{i}" for i in range(6000)],
+                                               skiprows=range(1, cycles.start + 1), nrows=100)))
+    if with_wide_parquet:
+        variants.append(('breit parquet', tmp / 'raw_wide.parquet',
+                         lambda p: wide().to_parquet(p, index=False),
+                         lambda p: pd.read_parquet(p),
+                         lambda p: pd.read_parquet(p, columns=[f"ps1_{i}" for i in range(6000)]).iloc[cycles]))
+    variants += [
+        ('long zstd', tmp / 'raw_long.parquet',
+         lambda p: export_raw(blocks(), p, 'long'),
+         lambda p: read_raw(p),
+         lambda p: read_raw(p, sensors=['ps1'], cycles=cycles)),
+        ('tensor', tmp / 'raw_tensor',
+         lambda p: export_raw(blocks(), p, 'tensor'),
+         lambda p: read_raw(p),
+         lambda p: read_raw(p, sensors=['ps1'], cycles=cycles)),
+    ]
+
+    for name, path, write, read_all, read_part in variants:
+        t_write, _ = timed(lambda: write(path))
+        t_read, _ = timed(lambda: read_all(path))
+        t_part, _ = timed(lambda: read_part(path))
+        print(f"{name:<16} {t_write:>9.2f}s {size_of(path) / 1e6:>11.1f} {t_read:>7.2f}s {t_part:>14.3f}s")
+        if path.is_dir():
+            shutil.rmtree(path)
+        else:
+            path.unlink()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--features', default='out/features_complete.csv', help='Feature-Tabelle')
+    parser.add_argument('--cycles', type=int, default=22050, help='Zyklen im Feature-Benchmark')
+    parser.add_argument('--raw-cycles', type=int, default=500, help='Zyklen im Rohdaten-Benchmark (0 = aus)')
+    parser.add_argument('--raw-csv', action='store_true', help='Breite CSV mitmessen (sehr langsam)')
+    parser.add_argument('--raw-wide-parquet', action='store_true',
+                        help='Breite Parquet-Datei mitmessen (sehr langsam, sehr viel Speicher)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        bench_features(load_features(Path(args.features), args.cycles), Path(tmp))
+        if args.raw_cycles:
+            bench_raw(args.raw_cycles, Path(tmp), args.raw_csv, args.raw_wide_parquet)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Benchmark: Feature-Extraktion pro Sensor
+=========================================
+Vergleicht die bisherigen 7 pandas-Reduktionen (mean, std, min, max,
+median, quantile 0.25/0.75) mit dem fusionierten Kernel
+compute_sensor_features() und prüft die Abweichung.
+
+Nutzt die Dateien aus data/ falls vorhanden, sonst synthetische Matrizen
+in Originalgröße (2205 Zyklen × 60/600/6000 Zeitpunkte).
+
+Aufruf:
+    python benchmarks/bench_features.py [--data data] [--sensors ps1 fs1 ts1] [--repeat 3]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from prep_corrected import FEATURE_STATS, compute_sensor_features, read_sensor_file  # noqa: E402
+
+# Zeitpunkte pro Zyklus (60 s bei 1/10/100 Hz), für synthetische Daten
+SYNTHETIC_WIDTH = {'ps': 6000, 'ep': 6000, 'fs': 600}
+
+
+def legacy_features(values: np.ndarray) -> np.ndarray:
+    """Bisheriger Weg: einzelne pandas-Reduktionen auf dem DataFrame."""
+    df = pd.DataFrame(values).apply(pd.to_numeric, errors='coerce')
+    features = pd.DataFrame()
+    features['mean'] = df.mean(axis=1)
+    features['std'] = df.std(axis=1)
+    features['min'] = df.min(axis=1)
+    features['max'] = df.max(axis=1)
+    features['median'] = df.median(axis=1)
+    features['q25'] = df.quantile(0.25, axis=1)
+    features['q75'] = df.quantile(0.75, axis=1)
+    features['range'] = features['max'] - features['min']
+    return features.to_numpy()
+
+
+def load_values(data_dir: Path, sensor: str) -> np.ndarray:
+    """Echte Sensor-Matrix oder synthetische Matrix gleicher Form."""
+    file_path = data_dir / f"{sensor.upper()}.txt"
+    if file_path.exists():
+        return read_sensor_file(file_path)[0]
+    
+    rng = np.random.default_rng(42)
+    width = SYNTHETIC_WIDTH.get(sensor[:2], 60)
+    values = 100 + rng.standard_normal((2205, width)).cumsum(axis=1)
+    values[1000, 17] = np.nan  # ein Typo
+    return values
+
+
+def best_time(func, values: np.ndarray, repeat: int) -> float:
+    """Bestzeit aus mehreren Durchläufen (Sekunden)."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(values)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--data', default='data', help='Datenordner mit den Sensor-Dateien')
+    parser.add_argument('--sensors', nargs='+', default=['ps1', 'eps1', 'fs1', 'ts1'])
+    parser.add_argument('--repeat', type=int, default=3, help='Anzahl Wiederholungen')
+    args = parser.parse_args()
+    
+    print(f"{'Sensor':<8} {'Form':>12} {'pandas [s]':>11} {'Kernel [s]':>11} {'Speedup':>8} {'max. rel. Abw.':>15}")
+    print("-" * 70)
+    
+    for sensor in args.sensors:
+        values = load_values(Path(args.data), sensor)
+        
+        reference = legacy_features(values)
+        fused = compute_sensor_features(values)
+        scale = np.maximum(np.abs(reference), 1e-12)
+        max_rel = np.nanmax(np.abs(fused - reference) / scale)
+        assert np.allclose(fused, reference, rtol=1e-9, atol=1e-9, equal_nan=True), \
+            f"{sensor}: Abweichung in {FEATURE_STATS}"
+        
+        t_legacy = best_time(legacy_features, values, args.repeat)
+        t_fused = best_time(compute_sensor_features, values, args.repeat)
+        
+        shape = f"{values.shape[0]}×{values.shape[1]}"
+        print(f"{sensor:<8} {shape:>12} {t_legacy:>11.3f} {t_fused:>11.3f} "
+              f"{t_legacy / t_fused:>7.1f}x {max_rel:>15.2e}")
+
+
+if __name__ == "__main__":
+    main()
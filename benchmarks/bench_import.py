@@ -0,0 +1,96 @@
+"""
+Benchmark: Import-Zeit der Module
+=================================
+Misst mit `python -X importtime` in einem frischen Prozess, wie lange
+`import <modul>` dauert und welche Pakete dabei am meisten kosten.
+Prüft außerdem, dass matplotlib, seaborn, sklearn und scipy nicht schon
+beim Import geladen werden (die brauchen nur Plots und Mutual Information).
+
+Mit --budget-ms endet das Skript mit Exit-Code 1, wenn ein Modul länger
+braucht (z.B. als Regressionstest), --json schreibt die Messwerte als
+maschinenlesbare Datei.
+
+Aufruf:
+    python benchmarks/bench_import.py [--modules prep_corrected pipeline] [--repeat 5]
+                                      [--budget-ms 1500] [--json import_times.json]
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_DIR = Path(__file__).resolve().parents[1]
+
+# Schwere Abhängigkeiten, die erst in den jeweiligen Stufen geladen werden sollen
+HEAVY_PACKAGES = ['matplotlib', 'seaborn', 'sklearn', 'scipy']
+
+
+def import_profile(module: str) -> dict:
+    """
+    Importiert ein Modul in einem frischen Prozess mit -X importtime.
+
+    Args:
+        module: Modulname (z.B. prep_corrected)
+
+    Returns:
+        Dictionary {paket: kumulierte Zeit in µs} für alle geladenen Module
+    """
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            cwd=REPO_DIR, capture_output=True, text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        times[name.strip()] = int(cumulative)  # Einrückung = Verschachtelung, hier egal
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--modules', nargs='+',
+                        default=['prep_corrected', 'pipeline', 'online_features', 'feature_store', 'sensor_cache'],
+                        help='Zu messende Module')
+    parser.add_argument('--repeat', type=int, default=5, help='Wiederholungen (Minimum zählt)')
+    parser.add_argument('--top', type=int, default=5, help='Teuerste Pakete pro Modul anzeigen')
+    parser.add_argument('--budget-ms', type=float, default=None, help='Maximal erlaubte Import-Zeit pro Modul')
+    parser.add_argument('--json', default=None, help='Ergebnisse zusätzlich als JSON speichern')
+    args = parser.parse_args()
+
+    print(f"{'Modul':<18} {'Import [ms]':>12}   {'schwere Pakete geladen':<24}")
+    print("-" * 58)
+
+    results, over_budget = {}, []
+    for module in args.modules:
+        runs = [import_profile(module) for _ in range(args.repeat)]
+        best = min(runs, key=lambda times: times[module])
+        total_ms = best[module] / 1000
+        heavy = [pkg for pkg in HEAVY_PACKAGES if pkg in best]
+        top = sorted(((t, name) for name, t in best.items()
+                      if name != module and '.' not in name), reverse=True)[:args.top]
+
+        results[module] = {
+            'import_ms': total_ms,
+            'heavy_packages': heavy,
+            'top_packages_ms': {name: t / 1000 for t, name in top},
+        }
+        if args.budget_ms is not None and total_ms > args.budget_ms:
+            over_budget.append(module)
+
+        print(f"{module:<18} {total_ms:>12.0f}   {', '.join(heavy) or '-':<24}")
+        for t, name in top:
+            print(f"  {name:<16} {t / 1000:>12.0f}")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps({'python': sys.version.split()[0], 'modules': results}, indent=2))
+        print(f"\n✓ Ergebnisse gespeichert: {args.json}")
+
+    if over_budget:
+        print(f"\n✗ Über dem Budget von {args.budget_ms:.0f} ms: {', '.join(over_budget)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
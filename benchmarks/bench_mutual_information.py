@@ -0,0 +1,84 @@
+"""
+Benchmark: Mutual Information für alle Zielvariablen
+=====================================================
+Vergleicht fünfmal mutual_info_classif (ein Aufruf pro Zielvariable) mit
+mutual_information_table (geteilte Skalierung/Sortierung, optional parallel)
+und misst die Kosten der Subsampling-Stabilitätsintervalle.
+
+Nutzt out/features_complete.csv falls vorhanden, sonst synthetische
+Features (2205 Zyklen × 136 Features, Zielvariablen wie in profile.txt).
+
+Aufruf:
+    python benchmarks/bench_mutual_information.py [--jobs 0] [--bootstrap 20]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from sklearn.feature_selection import mutual_info_classif
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from mutual_information import mutual_information_table  # noqa: E402
+from prep_corrected import TARGET_COLUMNS  # noqa: E402
+
+# Klassen der Zielvariablen (profile.txt)
+TARGET_CLASSES = {
+    'cooler_condition': [3, 20, 100],
+    'valve_condition': [73, 80, 90, 100],
+    'pump_leakage': [0, 1, 2],
+    'accumulator_pressure': [90, 100, 115, 130],
+    'stable_flag': [0, 1],
+}
+
+
+def load_features(path: Path) -> pd.DataFrame:
+    """Echte Features oder synthetische Tabelle gleicher Form."""
+    if path.exists():
+        return pd.read_csv(path)
+
+    rng = np.random.default_rng(42)
+    df = pd.DataFrame(rng.standard_normal((2205, 136)).cumsum(axis=0),
+                      columns=[f"f{i}" for i in range(136)])
+    for col, classes in TARGET_CLASSES.items():
+        df[col] = rng.choice(classes, size=len(df))
+    return df
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--features', default='out/features_complete.csv', help='Feature-Tabelle')
+    parser.add_argument('--jobs', type=int, default=0, help='Prozesse für den parallelen Lauf (0 = alle Kerne)')
+    parser.add_argument('--bootstrap', type=int, default=20, help='Subsampling-Wiederholungen')
+    args = parser.parse_args()
+
+    df = load_features(Path(args.features))
+    feature_cols = [col for col in df.columns if col not in TARGET_COLUMNS]
+    print(f"{len(df)} Zyklen × {len(feature_cols)} Features, {len(TARGET_COLUMNS)} Zielvariablen\n")
+
+    start = time.perf_counter()
+    reference = {col: mutual_info_classif(df[feature_cols].fillna(0), df[col], random_state=42)
+                 for col in TARGET_COLUMNS}
+    t_sklearn = time.perf_counter() - start
+
+    runs = [('geteilt, seriell', dict(n_jobs=1)),
+            (f'geteilt, --jobs {args.jobs}', dict(n_jobs=args.jobs)),
+            (f'+ {args.bootstrap} × Subsampling', dict(n_jobs=args.jobs, n_bootstrap=args.bootstrap))]
+
+    print(f"{'Variante':<28} {'Zeit [s]':>9} {'Speedup':>8} {'max. Abw.':>10}")
+    print("-" * 58)
+    print(f"{'5 × mutual_info_classif':<28} {t_sklearn:>9.2f} {1:>7.1f}x {0:>10.1e}")
+
+    for name, options in runs:
+        start = time.perf_counter()
+        mi_df = mutual_information_table(df, feature_cols, TARGET_COLUMNS, **options)
+        elapsed = time.perf_counter() - start
+        deviation = max(np.abs(mi_df[col].to_numpy() - reference[col]).max() for col in TARGET_COLUMNS)
+        print(f"{name:<28} {elapsed:>9.2f} {t_sklearn / elapsed:>7.1f}x {deviation:>10.1e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Benchmark: Latenz der Online-Features
+======================================
+Misst p50/p99 der Zeit, die OnlineFeatureExtractor für einen Zyklus
+(17 Sensoren, 60/600/6000 Werte) bzw. für Micro-Batches braucht. Die letzte
+Spalte (p50 pro Zyklus) stellt transform_batch direkt neben transform.
+Prüft außerdem, dass das Ergebnis mit extract_features übereinstimmt.
+
+Aufruf:
+    python benchmarks/bench_online.py [--iterations 2000] [--batch-sizes 1 8 64]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from prep_corrected import CYCLE_SECONDS, SAMPLING_RATES, extract_features  # noqa: E402
+from online_features import OnlineFeatureExtractor  # noqa: E402
+
+
+def synthetic_cycles(n_cycles: int, seed: int = 0) -> dict:
+    """Zyklen mit den Original-Längen pro Sensor (Zyklen × Messwerte)."""
+    rng = np.random.default_rng(seed)
+    return {sensor: 100 + rng.standard_normal((n_cycles, CYCLE_SECONDS * rate)).cumsum(axis=1)
+            for sensor, rate in SAMPLING_RATES.items()}
+
+
+def percentiles_us(timings: list) -> tuple:
+    """p50 und p99 in Mikrosekunden."""
+    values = np.array(timings) * 1e6
+    return np.percentile(values, 50), np.percentile(values, 99)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--iterations', type=int, default=2000, help='Messungen pro Variante')
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 8, 64])
+    args = parser.parse_args()
+    
+    extractor = OnlineFeatureExtractor()
+    
+    # Korrektheit: gleiche Werte und Spaltenreihenfolge wie der Batch-Pfad
+    cycles = synthetic_cycles(16)
+    reference = pd.concat([extract_features(cycles[s], s) for s in extractor.sensor_names], axis=1)
+    assert list(reference.columns) == extractor.feature_names
+    assert np.array_equal(extractor.transform_batch(cycles), reference.to_numpy(), equal_nan=True)
+    single = {s: v[3] for s, v in cycles.items()}
+    assert np.array_equal(extractor.transform(single), reference.to_numpy()[3], equal_nan=True)
+    one = {s: v[3:4] for s, v in cycles.items()}
+    assert np.array_equal(extractor.transform_batch(one)[0], reference.to_numpy()[3], equal_nan=True)
+    
+    print(f"{'Variante':<22} {'p50 [µs]':>10} {'p99 [µs]':>10} {'p50/Zyklus [µs]':>16}")
+    print("-" * 62)
+    
+    # Einzelner Zyklus
+    timings = []
+    for _ in range(args.iterations):
+        start = time.perf_counter()
+        extractor.transform(single)
+        timings.append(time.perf_counter() - start)
+    p50, p99 = percentiles_us(timings)
+    print(f"{'transform':<22} {p50:>10.1f} {p99:>10.1f} {p50:>16.1f}")
+    
+    # Micro-Batches
+    for batch_size in args.batch_sizes:
+        batch = synthetic_cycles(batch_size, seed=batch_size)
+        out = np.empty((batch_size, extractor.n_features))
+        timings = []
+        for _ in range(max(args.iterations // batch_size, 50)):
+            start = time.perf_counter()
+            extractor.transform_batch(batch, out=out)
+            timings.append(time.perf_counter() - start)
+        p50, p99 = percentiles_us(timings)
+        print(f"{f'transform_batch({batch_size})':<22} {p50:>10.1f} {p99:>10.1f} {p50 / batch_size:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Benchmark: Einlesen der Sensor-Dateien
+=======================================
+Vergleicht den bisherigen Reader (pd.read_csv mit engine='python')
+mit read_sensor_file() (np.loadtxt in C + gezielte Typo-Konvertierung).
+
+Nutzt die echten 100-Hz-Dateien aus data/ (PS1, EPS1, ...). Fehlen sie,
+wird eine synthetische Datei in voller Größe (2205 × 6000) erzeugt.
+
+Aufruf:
+    python benchmarks/bench_parser.py [--data data] [--sensors ps1 eps1] [--repeat 3]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from prep_corrected import read_sensor_file  # noqa: E402
+
+
+def legacy_reader(file_path: Path) -> np.ndarray:
+    """Bisheriger Weg: Python-Parser + pd.to_numeric(errors='coerce')."""
+    df = pd.read_csv(file_path, sep=r'\s+', header=None, engine='python')
+    return df.apply(pd.to_numeric, errors='coerce').to_numpy(dtype=np.float64)
+
+
+def write_synthetic_file(file_path: Path, n_cycles: int = 2205, n_points: int = 6000):
+    """Schreibt eine 100-Hz-Datei in Originalgröße mit einem Typo."""
+    rng = np.random.default_rng(42)
+    values = 150 + 10 * rng.standard_normal((n_cycles, n_points))
+    df = pd.DataFrame(values).round(2).astype(str)
+    df.iloc[n_cycles // 2, n_points // 3] = '151.3x'
+    df.to_csv(file_path, sep='\t', header=False, index=False)
+
+
+def time_call(func, file_path: Path, repeat: int) -> float:
+    """Bestzeit aus mehreren Durchläufen (Sekunden)."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(file_path)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--data', default='data', help='Datenordner mit den Sensor-Dateien')
+    parser.add_argument('--sensors', nargs='+', default=['ps1', 'eps1'], help='100-Hz-Sensoren')
+    parser.add_argument('--repeat', type=int, default=3, help='Anzahl Wiederholungen')
+    args = parser.parse_args()
+    
+    tmp_dir = tempfile.TemporaryDirectory()
+    
+    print(f"{'Sensor':<8} {'Form':>12} {'python [s]':>11} {'C [s]':>8} {'Speedup':>8} {'Typos':>6}")
+    print("-" * 58)
+    
+    for sensor in args.sensors:
+        file_path = Path(args.data) / f"{sensor.upper()}.txt"
+        if not file_path.exists():
+            file_path = Path(tmp_dir.name) / f"{sensor.upper()}.txt"
+            write_synthetic_file(file_path)
+        
+        values, n_coerced = read_sensor_file(file_path)
+        reference = legacy_reader(file_path)
+        assert np.array_equal(values, reference, equal_nan=True), f"{sensor}: Ergebnisse weichen ab!"
+        
+        t_legacy = time_call(legacy_reader, file_path, args.repeat)
+        t_fast = time_call(read_sensor_file, file_path, args.repeat)
+        
+        shape = f"{values.shape[0]}×{values.shape[1]}"
+        print(f"{sensor:<8} {shape:>12} {t_legacy:>11.2f} {t_fast:>8.2f} {t_legacy / t_fast:>7.1f}x {n_coerced:>6}")
+    
+    tmp_dir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Benchmark: float64 vs. float32 (--precision)
+============================================
+Läuft die Kette Parsen → extract_features → Statistiken → Korrelation
+einmal in float64 und einmal in float32 und misst pro Durchgang:
+- Laufzeit
+- Spitzen-Speicher (tracemalloc, alle NumPy/pandas-Allokationen)
+- maximale Abweichung der float32-Ergebnisse von float64
+
+Nutzt die Dateien aus data/ falls vorhanden, sonst synthetische Matrizen
+in Originalgröße (dann ohne Parsen).
+
+Aufruf:
+    python benchmarks/bench_precision.py [--data data]
+"""
+
+import argparse
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from correlation import correlation_matrix  # noqa: E402
+from prep_corrected import (CYCLE_SECONDS, SAMPLING_RATES, _describe_compact,  # noqa: E402
+                            extract_features, find_sensor_files, read_sensor_file)
+
+
+def load_values(data_dir: Path, sensor: str, dtype) -> np.ndarray:
+    """Echte Sensor-Matrix (geparst in dtype) oder synthetische Matrix gleicher Form."""
+    file_path = data_dir / f"{sensor.upper()}.txt"
+    if file_path.exists():
+        return read_sensor_file(file_path, dtype=dtype)[0]
+
+    rng = np.random.default_rng(sorted(SAMPLING_RATES).index(sensor))
+    n_cols = CYCLE_SECONDS * SAMPLING_RATES[sensor]
+    return (100 + rng.standard_normal((2205, n_cols)).cumsum(axis=1)).astype(dtype)
+
+
+def run_pipeline(data_dir: Path, sensors: list, dtype) -> tuple:
+    """Features, Statistiken und Korrelation aller Sensoren in einem Datentyp."""
+    blocks = []
+    for sensor in sensors:
+        values = load_values(data_dir, sensor, dtype)
+        blocks.append(extract_features(values, sensor))
+        del values
+    features = pd.concat(blocks, axis=1)
+
+    if np.dtype(dtype) == np.float32:
+        stats = _describe_compact(features.to_numpy(dtype=np.float32), list(features.columns))
+    else:
+        stats = features.describe().T
+    corr = correlation_matrix(features.to_numpy(dtype=dtype), dtype=dtype)
+
+    return features.to_numpy(dtype=np.float64), stats[['mean', 'std', '25%', '50%', '75%']].to_numpy(), corr
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--data', default='data', help='Datenordner mit den Sensor-Dateien')
+    args = parser.parse_args()
+
+    data_dir = Path(args.data)
+    sensors = [f.stem.lower() for f in find_sensor_files(args.data)] or sorted(SAMPLING_RATES)
+
+    print(f"{'dtype':<8} {'Zeit [s]':>9} {'Peak [MB]':>10} {'Features':>10} {'Statistik':>10} {'Korrelation':>12}")
+    print(f"{'':<8} {'':>9} {'':>10} {'(max. relative Abweichung zu float64)':>34}")
+    print("-" * 64)
+
+    reference = None
+    for dtype in (np.float64, np.float32):
+        tracemalloc.start()
+        start = time.perf_counter()
+        results = run_pipeline(data_dir, sensors, dtype)
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        if reference is None:
+            reference = results
+        features, stats, corr = results
+        dev_features = np.nanmax(np.abs(features - reference[0]) / np.maximum(np.abs(reference[0]), 1e-12))
+        dev_stats = np.nanmax(np.abs(stats - reference[1]) / np.maximum(np.abs(reference[1]), 1e-12))
+        dev_corr = np.nanmax(np.abs(corr - reference[2]))  # absolut, r liegt in [-1, 1]
+
+        print(f"{np.dtype(dtype).name:<8} {elapsed:>9.2f} {peak / 1e6:>10.0f} "
+              f"{dev_features:>10.1e} {dev_stats:>10.1e} {dev_corr:>12.1e}")
+
+    print("\nKorrelation: absolute Abweichung (r liegt in [-1, 1])")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""
+Benchmark: Quantil-Sketch vs. exakte Quantile (--quantile-error)
+================================================================
+Vergleicht für mehrere Fehlerschranken epsilon die Näherungs-Quantile aus
+quantile_sketch.py mit dem exakten Weg:
+- Zyklen: median/q25/q75 pro Zyklus (compute_sensor_features mit/ohne
+  quantile_error) für einen 1-, 10- und 100-Hz-Sensor
+- Spalten: Quartile und p1/p99 pro Spalte über einen langen Strom von
+  Zyklen (wie compute_statistics bzw. winsorize_outliers)
+- Plateaus: Zyklen aus wenigen Stufen mit vielen gleichen Werten
+  (np.repeat(rng.integers(0, 5, (rows, 60)), 100, axis=1)); hier lag
+  die alte, interpolierende Variante deutlich über epsilon
+
+Gemessen werden Laufzeit, Spitzen-Speicher (tracemalloc), der tatsächliche
+Rangfehler (Anteil der Werte zwischen exaktem und genähertem Quantil, muss
+unter epsilon liegen), die Wert-Abweichung relativ zur Spannweite und die
+Sketch-Größe, die approximate_quantiles für epsilon wählt (plan_blocks).
+
+Nutzt die Dateien aus data/ falls vorhanden, sonst synthetische Matrizen
+in Originalgröße.
+
+Aufruf:
+    python benchmarks/bench_quantile_sketch.py [--data data] [--errors 0.05 0.01 0.005 0.001]
+                                               [--sensors ps1 fs1 ts1] [--stream-rows 200000]
+                                               [--plateau-rows 2000]
+"""
+
+import argparse
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from prep_corrected import CYCLE_SECONDS, SAMPLING_RATES, compute_sensor_features, read_sensor_file  # noqa: E402
+from quantile_sketch import approximate_quantiles, plan_blocks  # noqa: E402
+
+FEATURE_QUANTILES = [0.25, 0.5, 0.75]
+FEATURE_COLUMNS = [5, 4, 6]  # q25, median, q75 in FEATURE_STATS
+STREAM_QUANTILES = [0.01, 0.25, 0.5, 0.75, 0.99]
+
+
+def load_values(data_dir: Path, sensor: str) -> np.ndarray:
+    """Echte Sensor-Matrix oder synthetische Matrix gleicher Form (Random Walk)."""
+    file_path = data_dir / f"{sensor.upper()}.txt"
+    if file_path.exists():
+        return read_sensor_file(file_path)[0]
+
+    rng = np.random.default_rng(sorted(SAMPLING_RATES).index(sensor))
+    n_cols = CYCLE_SECONDS * SAMPLING_RATES[sensor]
+    return 100 + rng.standard_normal((2205, n_cols)).cumsum(axis=1)
+
+
+def rank_error(values: np.ndarray, estimates: np.ndarray, q: list) -> np.ndarray:
+    """
+    Rangfehler pro Quantil: Abstand der Soll-Position q · (n - 1) zu den
+    Positionen, die der Schätzwert im sortierten Datensatz einnehmen kann.
+
+    Args:
+        values: Array Zeilen × Werte
+        estimates: Array Zeilen × len(q)
+        q: Quantile
+
+    Returns:
+        Array len(q) mit dem maximalen Rangfehler (Anteil der Werte) über alle Zeilen
+    """
+    n = (~np.isnan(values)).sum(axis=1)  # NaN (Typos) zählen nicht mit
+    errors = []
+    for k, quantile in enumerate(q):
+        est = estimates[:, k:k + 1]
+        below = (values < est).sum(axis=1)
+        at_or_below = (values <= est).sum(axis=1)
+        target = quantile * (n - 1)
+        # Schätzwert zwischen sortiert[below - 1] und sortiert[at_or_below] → Positionen dazwischen
+        gap = np.maximum(np.maximum((below - 1) - target, target - at_or_below), 0)
+        errors.append((gap / np.maximum(n, 1)).max())
+    return np.array(errors)
+
+
+def measure(func):
+    """Laufzeit und tracemalloc-Spitze eines Aufrufs."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak / 1e6
+
+
+def bench_cycles(data_dir: Path, sensors: list, errors: list):
+    """median/q25/q75 pro Zyklus: exakt vs. Sketch."""
+    print(f"{'Sensor':<7} {'epsilon':>8} {'Größe':>6} {'Zeit [s]':>9} {'Peak [MB]':>10} "
+          f"{'Rangfehler':>11} {'Wert/Spannw.':>13}")
+    print("-" * 70)
+    for sensor in sensors:
+        values = load_values(data_dir, sensor)
+        exact, elapsed, peak = measure(lambda: compute_sensor_features(values))
+        print(f"{sensor:<7} {'exakt':>8} {'-':>6} {elapsed:>9.2f} {peak:>10.1f} {0:>11.4f} {0:>13.1e}")
+        spread = np.maximum(exact[:, 7:8], 1e-12)
+
+        for epsilon in errors:
+            approx, elapsed, peak = measure(lambda: compute_sensor_features(values, quantile_error=epsilon))
+            rank = rank_error(values, approx[:, FEATURE_COLUMNS], FEATURE_QUANTILES).max()
+            value = np.nanmax(np.abs(approx[:, FEATURE_COLUMNS] - exact[:, FEATURE_COLUMNS]) / spread)
+            flag = "" if rank <= epsilon else "  ← über epsilon"
+            size = plan_blocks(values.shape[1], epsilon)[1]
+            print(f"{'':<7} {epsilon:>8g} {size:>6} {elapsed:>9.2f} {peak:>10.1f} "
+                  f"{rank:>11.4f} {value:>13.1e}{flag}")
+        del values
+
+
+def bench_stream(n_rows: int, n_cols: int, errors: list):
+    """Quantile pro Spalte über einen langen Strom von Zyklen (wie compute_statistics)."""
+    rng = np.random.default_rng(0)
+    # Feature-ähnliche Spalten: schiefe Verteilungen mit Ausreißern
+    values = rng.lognormal(0, 1, (n_rows, n_cols)) + rng.standard_t(3, (n_rows, n_cols))
+
+    print(f"\nSpalten-Strom: {n_rows:,} Zyklen × {n_cols} Spalten, Quantile {STREAM_QUANTILES}")
+    print(f"{'epsilon':>8} {'Größe':>6} {'Zeit [s]':>9} {'Peak [MB]':>10} {'Rangfehler':>11} {'p1/p99':>9}")
+    print("-" * 58)
+    exact, elapsed, peak = measure(lambda: np.quantile(values, STREAM_QUANTILES, axis=0).T)
+    print(f"{'exakt':>8} {'-':>6} {elapsed:>9.2f} {peak:>10.1f} {0:>11.4f} {0:>9.4f}")
+
+    columns = np.ascontiguousarray(values.T)
+    for epsilon in errors:
+        approx, elapsed, peak = measure(lambda: approximate_quantiles(values, STREAM_QUANTILES, epsilon, axis=0))
+        rank = rank_error(columns, approx, STREAM_QUANTILES)
+        flag = "" if rank.max() <= epsilon else "  ← über epsilon"
+        print(f"{epsilon:>8g} {plan_blocks(n_rows, epsilon)[1]:>6} {elapsed:>9.2f} {peak:>10.1f} "
+              f"{rank.max():>11.4f} {max(rank[0], rank[-1]):>9.4f}{flag}")
+
+
+def bench_plateaus(n_rows: int, errors: list):
+    """Quantile pro Zeile auf Stufen-Daten mit vielen gleichen Werten."""
+    rng = np.random.default_rng(0)
+    values = np.repeat(rng.integers(0, 5, (n_rows, 60)), 100, axis=1).astype(np.float64)
+    quantiles = np.linspace(0.05, 0.95, 19).tolist()
+
+    print(f"\nPlateaus: {n_rows:,} Zeilen × {values.shape[1]} Werte (5 Stufen), {len(quantiles)} Quantile")
+    print(f"{'epsilon':>8} {'Größe':>6} {'Zeit [s]':>9} {'Rangfehler':>11} {'außerhalb':>10}")
+    print("-" * 48)
+    for epsilon in errors:
+        approx, elapsed, _ = measure(lambda: approximate_quantiles(values, quantiles, epsilon))
+        # außerhalb: Ergebnisse, die kein Quantil aus [q - epsilon, q + epsilon] annimmt
+        low = np.quantile(values, np.clip(np.array(quantiles) - epsilon, 0, 1), axis=1).T
+        high = np.quantile(values, np.clip(np.array(quantiles) + epsilon, 0, 1), axis=1).T
+        outside = int(((approx < low) | (approx > high)).sum())
+        rank = rank_error(values, approx, quantiles).max()
+        flag = "" if rank <= epsilon and outside == 0 else "  ← über epsilon"
+        print(f"{epsilon:>8g} {plan_blocks(values.shape[1], epsilon)[1]:>6} {elapsed:>9.2f} "
+              f"{rank:>11.4f} {outside:>6}/{approx.size}{flag}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--data', default='data', help='Datenordner mit den Sensor-Dateien')
+    parser.add_argument('--errors', nargs='+', type=float, default=[0.05, 0.01, 0.005, 0.001],
+                        help='Fehlerschranken epsilon (Rangfehler)')
+    parser.add_argument('--sensors', nargs='+', default=['ts1', 'fs1', 'ps1'],
+                        help='Sensoren für die Zyklen-Quantile (1, 10, 100 Hz)')
+    parser.add_argument('--stream-rows', type=int, default=200_000, help='Zyklen im Spalten-Strom')
+    parser.add_argument('--stream-cols', type=int, default=16, help='Spalten im Spalten-Strom')
+    parser.add_argument('--plateau-rows', type=int, default=2000, help='Zeilen im Plateau-Fall')
+    args = parser.parse_args()
+
+    bench_cycles(Path(args.data), args.sensors, args.errors)
+    bench_stream(args.stream_rows, args.stream_cols, args.errors)
+    bench_plateaus(args.plateau_rows, args.errors)
+    print("\nRangfehler: Anteil der Werte zwischen exaktem und genähertem Quantil (Soll: unter epsilon)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Benchmark: Einzelne Zyklen lesen (RowIndex vs. ganze Datei)
+===========================================================
+Misst pro Sensor-Datei:
+- Aufbau des Zeilen-Index (ein Durchgang, kalt) und Laden des gespeicherten Index
+- get_cycle(sensor, i) für zufällige Zyklen (Median über mehrere Aufrufe)
+- get_cycles(sensor, slice) für einen Block von 100 Zyklen
+- zum Vergleich: read_sensor_file (ganze Datei parsen) und Zeile herausnehmen
+
+Der Index landet in einem temporären Ordner, der Cache unter cache/ bleibt
+unberührt.
+
+Aufruf:
+    python benchmarks/bench_row_index.py [--data data] [--sensors ps1 fs1 ts1] [--repeat 50]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from prep_corrected import read_sensor_file  # noqa: E402
+from row_index import RowIndex  # noqa: E402
+
+
+def timed(func) -> float:
+    """Laufzeit eines Aufrufs in Sekunden."""
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--data', default='data', help='Datenordner mit den Sensor-Dateien')
+    parser.add_argument('--sensors', nargs='+', default=['ps1', 'fs1', 'ts1'], help='Sensoren (100, 10, 1 Hz)')
+    parser.add_argument('--repeat', type=int, default=50, help='Aufrufe von get_cycle pro Sensor')
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{'Sensor':<7} {'Datei [MB]':>10} {'Index [ms]':>11} {'geladen [ms]':>13} {'Zyklus [ms]':>12} "
+          f"{'100 Zykl. [ms]':>15} {'ganze Datei [s]':>16} {'Faktor':>8}")
+    print("-" * 100)
+
+    with tempfile.TemporaryDirectory() as index_dir:
+        for sensor in args.sensors:
+            file_path = Path(args.data) / f"{sensor.upper()}.txt"
+            if not file_path.exists():
+                print(f"{sensor:<7} fehlt in {args.data}/")
+                continue
+
+            with RowIndex(args.data, index_dir) as index:
+                build = timed(lambda: index.build(sensor))
+            with RowIndex(args.data, index_dir) as index:
+                load = timed(lambda: index.n_cycles(sensor))
+                n_cycles = index.n_cycles(sensor)
+                cycles = rng.integers(0, n_cycles, args.repeat)
+                single = np.median([timed(lambda: index.get_cycle(sensor, int(i))) for i in cycles])
+                start = int(rng.integers(0, max(n_cycles - 100, 1)))
+                block = timed(lambda: index.get_cycles(sensor, slice(start, start + 100)))
+                reference = index.get_cycle(sensor, int(cycles[0]))
+
+            full_start = time.perf_counter()
+            values, _ = read_sensor_file(file_path)
+            row = values[int(cycles[0])]
+            full = time.perf_counter() - full_start
+            assert np.array_equal(row, reference, equal_nan=True), f"{sensor}: Zyklus weicht ab"
+
+            print(f"{sensor:<7} {file_path.stat().st_size / 1e6:>10.1f} {build * 1e3:>11.1f} {load * 1e3:>13.2f} "
+                  f"{single * 1e3:>12.3f} {block * 1e3:>15.1f} {full:>16.2f} {full / single:>7.0f}×")
+
+    print("\nFaktor: ganze Datei parsen vs. ein Zyklus über den Index")
+
+
+if __name__ == "__main__":
+    main()
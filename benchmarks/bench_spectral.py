@@ -0,0 +1,63 @@
+"""
+Benchmark: Spektral-Features (FFT)
+===================================
+Misst extract_spectral_features() für alle 100-Hz-Sensoren (7 × 2205 × 6000)
+und die 10-Hz-Sensoren (2 × 2205 × 600), jeweils in float64 und float32.
+
+Nutzt die Dateien aus data/ falls vorhanden, sonst synthetische Matrizen.
+
+Aufruf:
+    python benchmarks/bench_spectral.py [--data data]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from prep_corrected import (CYCLE_SECONDS, SAMPLING_RATES, SPECTRAL_BANDS,  # noqa: E402
+                            extract_spectral_features, read_sensor_file)
+
+
+def load_values(data_dir: Path, sensor: str) -> np.ndarray:
+    """Echte Sensor-Matrix oder synthetische Matrix gleicher Form."""
+    file_path = data_dir / f"{sensor.upper()}.txt"
+    if file_path.exists():
+        return read_sensor_file(file_path)[0]
+    
+    rng = np.random.default_rng(42)
+    n_cols = CYCLE_SECONDS * SAMPLING_RATES[sensor]
+    return 100 + rng.standard_normal((2205, n_cols)).cumsum(axis=1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--data', default='data', help='Datenordner mit den Sensor-Dateien')
+    args = parser.parse_args()
+    
+    sensors = [s for s, rate in SAMPLING_RATES.items() if rate in SPECTRAL_BANDS]
+    matrices = {s: load_values(Path(args.data), s) for s in sensors}
+    
+    print(f"{'dtype':<8} {'Sensoren':>9} {'Werte':>14} {'Zeit [s]':>9} {'max. Abw. zu float64':>22}")
+    print("-" * 66)
+    
+    reference = None
+    for dtype in (np.float64, np.float32):
+        start = time.perf_counter()
+        results = [extract_spectral_features(matrices[s], s, SAMPLING_RATES[s], dtype=dtype) for s in sensors]
+        elapsed = time.perf_counter() - start
+        
+        values = np.concatenate([r.to_numpy() for r in results], axis=1)
+        if reference is None:
+            reference = values
+        deviation = np.nanmax(np.abs(values - reference) / np.maximum(np.abs(reference), 1e-12))
+        
+        n_values = sum(m.size for m in matrices.values())
+        print(f"{np.dtype(dtype).name:<8} {len(sensors):>9} {n_values:>14,} {elapsed:>9.2f} {deviation:>22.2e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,285 @@
+"""
+Benchmark: Stufen der Datenaufbereitung auf synthetischen Daten
+===============================================================
+Erzeugt mit synthetic_data.py Datensätze in UCI-Form (Standard: 2205
+Zyklen, z.B. auch 22050 oder 220500) und misst jede Stufe von
+prep_corrected.main einzeln:
+
+- parse: Sensor-Dateien → Matrizen (read_sensor_file bzw. iter_sensor_blocks)
+- features: extract_features pro Sensor
+- merge: Zielvariablen laden und anhängen
+- statistics, correlation (ohne Heatmap), mutual_information
+- export: out/features_complete.csv
+
+Pro Stufe: Laufzeit, Zyklen/s und Speicher-Spitze. Die Spitze ist die
+RSS des Prozesses während der Stufe (Linux: VmHWM, vor jeder Stufe über
+/proc/self/clear_refs zurückgesetzt, kostet nichts). Mit --tracemalloc
+zusätzlich die Spitze laut tracemalloc (auch ohne /proc, bremst aber das
+Parsen deutlich). Jede Größe läuft in einem eigenen Prozess, damit sich
+die Speicher-Werte nicht vermischen.
+
+Mit --json werden die Ergebnisse maschinenlesbar gespeichert. Mit
+--baseline (eine frühere JSON-Datei) endet das Skript mit Exit-Code 1,
+wenn eine Stufe um mehr als --tolerance langsamer wird oder mehr Speicher
+braucht, ebenso bei Überschreiten von --memory-budget-mb.
+
+Für 220500 Zyklen passt eine 100-Hz-Matrix nicht mehr in den Speicher →
+--chunk-size setzen (wie --chunk-size in prep_corrected.py). Die Daten
+brauchen ca. 0,6 GB Platte pro 2205 Zyklen, mit --workdir bleiben sie für
+weitere Läufe liegen.
+
+Aufruf:
+    python benchmarks/bench_stages.py [--scales 2205 22050] [--chunk-size 256]
+                                      [--workdir bench_data] [--json stages.json]
+                                      [--baseline stages_alt.json] [--tolerance 1.3]
+                                      [--memory-budget-mb 4000] [--tracemalloc]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+import prep_corrected as prep  # noqa: E402
+from exporters import export_table  # noqa: E402
+from instrumentation import max_rss_mb, peak_rss_mb, reset_peak_rss  # noqa: E402
+from plots import PlotRenderer  # noqa: E402
+from synthetic_data import generate_dataset  # noqa: E402
+
+STAGES = ['parse', 'features', 'merge', 'statistics', 'correlation', 'mutual_information', 'export']
+
+# Kleinere Unterschiede gelten beim Vergleich mit --baseline als Rauschen
+MIN_SECONDS_DELTA = 0.05
+MIN_MEMORY_DELTA_MB = 16
+
+
+class StageTimer:
+    """Summiert Laufzeit und Speicher-Spitzen pro Stufe (auch über mehrere Aufrufe)."""
+
+    def __init__(self, trace_memory: bool = False):
+        self.trace_memory = trace_memory
+        self.results = {name: {'seconds': 0.0, 'peak_mb': None} for name in STAGES}
+        if trace_memory:
+            for result in self.results.values():
+                result['traced_peak_mb'] = 0.0
+
+    @contextlib.contextmanager
+    def measure(self, name: str):
+        """Misst den Block als (Teil der) Stufe name, Konsolen-Ausgaben werden verschluckt."""
+        result = self.results[name]
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+        rss = reset_peak_rss()
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            yield
+        result['seconds'] += time.perf_counter() - start
+        if rss:
+            result['peak_mb'] = max(result['peak_mb'] or 0.0, peak_rss_mb())
+        if self.trace_memory:
+            traced_mb = tracemalloc.get_traced_memory()[1] / 1e6
+            result['traced_peak_mb'] = max(result['traced_peak_mb'], traced_mb)
+            if not rss:
+                result['peak_mb'] = result['traced_peak_mb']
+
+
+def run_scale(root: str, chunk_size: int = None, trace_memory: bool = False) -> dict:
+    """
+    Führt alle Stufen auf dem Datensatz unter root aus (läuft im eigenen Prozess).
+
+    Args:
+        root: Ordner mit data/ und docs/profile.txt
+        chunk_size: Zyklen pro Block beim Parsen (None = ganze Datei)
+        trace_memory: Zusätzlich Speicher-Spitzen mit tracemalloc messen
+
+    Returns:
+        Dictionary mit den Messwerten pro Stufe
+    """
+    os.chdir(root)
+    Path('out').mkdir(exist_ok=True)
+    if trace_memory:
+        tracemalloc.start()
+    timer = StageTimer(trace_memory)
+    bytes_read, n_typos = 0, 0
+
+    # Parsen und Features pro Sensor (wie load_and_aggregate_sensors, nie mehr als ein Sensor im Speicher)
+    all_features = []
+    for file_path in prep.find_sensor_files('data'):
+        sensor = file_path.stem.lower()
+        bytes_read += file_path.stat().st_size
+        if chunk_size:
+            blocks = iter(prep.iter_sensor_blocks(file_path, chunk_size))
+        else:
+            blocks = None
+        parts = []
+        while True:
+            with timer.measure('parse'):
+                if blocks is None:
+                    block = prep.read_sensor_file(file_path) if not parts else None
+                else:
+                    block = next(blocks, None)
+            if block is None:
+                break
+            values, coerced = block
+            n_typos += coerced
+            with timer.measure('features'):
+                parts.append(prep.sensor_features(values, sensor))
+            del values, block
+        with timer.measure('features'):
+            all_features.append(pd.concat(parts, axis=0, ignore_index=True))
+
+    with timer.measure('merge'):
+        features = pd.concat(all_features, axis=1)
+        targets = prep.load_targets('docs/profile.txt')
+        n_cycles = min(len(features), len(targets))
+        df = pd.concat([features.iloc[:n_cycles], targets.iloc[:n_cycles]], axis=1)
+        feature_cols = list(features.columns)
+    del all_features, features
+
+    with timer.measure('statistics'):
+        prep.compute_statistics(df, feature_cols)
+    with timer.measure('correlation'):
+        prep.compute_correlation(df, feature_cols, renderer=PlotRenderer('off'))
+    with timer.measure('mutual_information'):
+        prep.compute_mutual_information(df, feature_cols)
+    with timer.measure('export'):
+        export_table(df, 'out/features_complete.csv')
+
+    stages = timer.results
+    for name, result in stages.items():
+        result['cycles_per_s'] = n_cycles / result['seconds'] if result['seconds'] else None
+    stages['parse']['bytes_read'] = bytes_read
+    stages['parse']['typos'] = n_typos
+
+    # ru_maxrss wird mit VmHWM zurückgesetzt → Maximum über die Stufen nehmen
+    peaks = [stage['peak_mb'] for stage in stages.values() if stage['peak_mb']] + [max_rss_mb() or 0]
+    return {
+        'cycles': n_cycles,
+        'shape': list(df.shape),
+        'total_seconds': sum(result['seconds'] for result in stages.values()),
+        'max_rss_mb': max(peaks) or None,
+        'stages': stages,
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """
+    Vergleicht die Messwerte mit einer früheren JSON-Datei.
+
+    Args:
+        results: Aktuelle Messwerte (Schlüssel 'scales')
+        baseline: Frühere Messwerte (gleiche Struktur)
+        tolerance: Erlaubter Faktor (z.B. 1.3 = 30 % langsamer/mehr Speicher)
+
+    Returns:
+        Liste der Regressionen als Text
+    """
+    regressions = []
+    for scale, current in results['scales'].items():
+        old = baseline.get('scales', {}).get(scale)
+        if old is None:
+            continue
+        for name, stage in current['stages'].items():
+            old_stage = old['stages'].get(name)
+            if old_stage is None:
+                continue
+            if (stage['seconds'] > old_stage['seconds'] * tolerance
+                    and stage['seconds'] - old_stage['seconds'] > MIN_SECONDS_DELTA):
+                regressions.append(f"{scale} Zyklen, {name}: {old_stage['seconds']:.2f}s → {stage['seconds']:.2f}s")
+            if (old_stage['peak_mb'] and stage['peak_mb']
+                    and stage['peak_mb'] > old_stage['peak_mb'] * tolerance
+                    and stage['peak_mb'] - old_stage['peak_mb'] > MIN_MEMORY_DELTA_MB):
+                regressions.append(f"{scale} Zyklen, {name}: {old_stage['peak_mb']:.0f} MB → {stage['peak_mb']:.0f} MB")
+    return regressions
+
+
+def print_scale(scale: int, result: dict):
+    """Tabelle der Stufen für eine Größe."""
+    rss = f", max. RSS {result['max_rss_mb']:.0f} MB" if result['max_rss_mb'] else ""
+    print(f"\n{scale} Zyklen → {result['shape'][0]} × {result['shape'][1]}"
+          f" ({result['stages']['parse']['bytes_read'] / 1e9:.2f} GB Text{rss})")
+    print(f"{'Stufe':<20} {'Zeit [s]':>9} {'Zyklen/s':>10} {'Spitze [MB]':>12}")
+    print("-" * 54)
+    for name, stage in result['stages'].items():
+        rate = f"{stage['cycles_per_s']:,.0f}" if stage['cycles_per_s'] else "-"
+        peak = f"{stage['peak_mb']:.0f}" if stage['peak_mb'] is not None else "-"
+        print(f"{name:<20} {stage['seconds']:>9.2f} {rate:>10} {peak:>12}")
+    print(f"{'gesamt':<20} {result['total_seconds']:>9.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scales', type=int, nargs='+', default=[2205], help='Zyklen pro Datensatz')
+    parser.add_argument('--chunk-size', type=int, default=None, help='Zyklen pro Block beim Parsen')
+    parser.add_argument('--workdir', default=None, help='Ordner für die Datensätze (Standard: temporär)')
+    parser.add_argument('--seed', type=int, default=42, help='Seed der synthetischen Daten')
+    parser.add_argument('--tracemalloc', action='store_true',
+                        help='Speicher zusätzlich mit tracemalloc messen (bremst das Parsen)')
+    parser.add_argument('--json', default=None, help='Ergebnisse als JSON speichern')
+    parser.add_argument('--baseline', default=None, help='Frühere JSON-Datei zum Vergleich')
+    parser.add_argument('--tolerance', type=float, default=1.3, help='Erlaubter Faktor gegenüber --baseline')
+    parser.add_argument('--memory-budget-mb', type=float, default=None,
+                        help='Maximal erlaubte Speicher-Spitze pro Stufe bzw. RSS')
+    args = parser.parse_args()
+
+    tmp_dir = None
+    if args.workdir is None:
+        tmp_dir = tempfile.TemporaryDirectory()
+    workdir = Path(args.workdir or tmp_dir.name).resolve()
+
+    results = {
+        'python': sys.version.split()[0], 'numpy': np.__version__, 'pandas': pd.__version__,
+        'cpu_count': os.cpu_count(), 'chunk_size': args.chunk_size, 'trace_memory': args.tracemalloc,
+        'scales': {},
+    }
+    try:
+        for scale in args.scales:
+            root = workdir / f"cycles_{scale}"
+            start = time.perf_counter()
+            generate_dataset(root, scale, seed=args.seed)
+            print(f"  (Datensatz bereit nach {time.perf_counter() - start:.1f}s)")
+
+            # Eigener Prozess pro Größe → Speicher-Werte unabhängig voneinander
+            context = multiprocessing.get_context('spawn')
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                result = executor.submit(run_scale, str(root), args.chunk_size, args.tracemalloc).result()
+            results['scales'][str(scale)] = result
+            print_scale(scale, result)
+    finally:
+        if tmp_dir is not None:
+            tmp_dir.cleanup()
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+        print(f"\n✓ Ergebnisse gespeichert: {args.json}")
+
+    failures = []
+    if args.baseline:
+        failures += compare(results, json.loads(Path(args.baseline).read_text()), args.tolerance)
+    if args.memory_budget_mb is not None:
+        for scale, result in results['scales'].items():
+            peaks = [stage['peak_mb'] or 0 for stage in result['stages'].values()] + [result['max_rss_mb'] or 0]
+            if max(peaks) > args.memory_budget_mb:
+                failures.append(f"{scale} Zyklen: {max(peaks):.0f} MB > Budget {args.memory_budget_mb:.0f} MB")
+
+    if failures:
+        print("\n✗ Regressionen:")
+        for failure in failures:
+            print(f"  {failure}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+"""
+Hydraulic Systems - Korrelations-Engine
+=======================================
+Pearson-Korrelation für sehr breite Matrizen (bis 43.680 Rohspalten)
+
+KONZEPT:
+df.corr() rechnet paarweise in einer Schleife und hält die komplette
+Matrix im Speicher. Bei 43.680 Spalten sind das 43.680² Werte ≈ 15 GB
+(float64) → nicht machbar. Deshalb:
+
+- Einmal standardisieren: Spalten zentrieren und auf Länge 1 normieren
+  → Korrelation = Skalarprodukt zweier Spalten
+- Kacheln: Spaltenblöcke werden per Matrixprodukt (BLAS) multipliziert
+- Ausgabe wahlweise
+  - dicht: in ein Array oder direkt in eine memory-mapped .npy-Datei
+  - dünn: pro Spalte nur die k stärksten Partner über einer Schwelle
+
+Fehlende Werte (NaN) werden wie bei pandas paarweise ausgelassen (dann
+mit fünf statt einem Matrixprodukt pro Kachel).
+
+Nutzung:
+    from correlation import correlation_matrix, correlation_pairs
+    corr = correlation_matrix(values)                                # dicht
+    correlation_matrix(values, out="out/corr.npy")                   # memmap
+    pairs = correlation_pairs(values, columns, k=10, threshold=0.9)  # dünn
+"""
+
+import warnings
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import List, Optional, Tuple, Union
+
+
+# Spalten pro Kachel (dicht) bzw. pro Streifen (Top-k)
+CORR_BLOCK_COLS = 1024
+PAIRS_BLOCK_COLS = 256
+
+
+def standardize(values: np.ndarray, dtype=np.float64) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """
+    Bereitet eine Matrix für die gekachelte Korrelation vor (einmal für alle Kacheln).
+
+    Ohne NaN: Spalten zentriert und auf Länge 1 normiert (konstante Spalten → NaN).
+    Mit NaN: Spalten zentriert, NaN → 0, dazu die Maske der gültigen Werte.
+    Mittelwert und Normen werden immer in float64 berechnet.
+
+    Args:
+        values: Matrix Zeilen × Spalten
+        dtype: Datentyp der vorbereiteten Matrix (np.float32 halbiert den Speicher)
+
+    Returns:
+        Tuple aus (vorbereitete Matrix, Maske als 0/1-Matrix oder None)
+    """
+    values = np.asarray(values)
+    valid = ~np.isnan(values)
+
+    with warnings.catch_warnings(), np.errstate(invalid='ignore', divide='ignore'):
+        # Spalten ganz ohne gültige Werte → NaN, ohne Warnung
+        warnings.simplefilter('ignore', RuntimeWarning)
+        mean = np.nanmean(values, axis=0, dtype=np.float64)
+        centered = values - mean
+
+        if valid.all():
+            norms = np.sqrt(np.einsum('ij,ij->j', centered, centered))
+            return (centered / norms).astype(dtype, copy=False), None
+
+    centered[~valid] = 0
+    return centered.astype(dtype, copy=False), valid.astype(dtype)
+
+
+def _tile(prepared: Tuple[np.ndarray, Optional[np.ndarray]], rows, cols) -> np.ndarray:
+    """
+    Korrelationen der Spalten `rows` mit den Spalten `cols` (eine Kachel).
+
+    Args:
+        prepared: Rückgabe von standardize
+        rows, cols: Spalten-Slices der vorbereiteten Matrix
+
+    Returns:
+        Array len(rows) × len(cols)
+    """
+    unit, mask = prepared
+    a, b = unit[:, rows], unit[:, cols]
+
+    if mask is None:
+        return np.clip(a.T @ b, -1, 1)
+
+    # Paarweise: Summen nur über Zeilen, in denen beide Spalten gültig sind
+    ma, mb = mask[:, rows], mask[:, cols]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        n = ma.T @ mb
+        sx, sy = a.T @ mb, ma.T @ b
+        cov = a.T @ b - sx * sy / n
+        var_x = (a * a).T @ mb - sx * sx / n
+        var_y = ma.T @ (b * b) - sy * sy / n
+        return np.clip(cov / np.sqrt(var_x * var_y), -1, 1)
+
+
+def _blocks(n_cols: int, block_cols: int) -> List[slice]:
+    """Spalten-Slices der Kacheln."""
+    return [slice(start, min(start + block_cols, n_cols)) for start in range(0, n_cols, block_cols)]
+
+
+def correlation_matrix(values: np.ndarray, block_cols: int = CORR_BLOCK_COLS, dtype=np.float64,
+                       out: Union[str, Path, None] = None) -> np.ndarray:
+    """
+    Dichte Korrelationsmatrix, gekachelt über Matrixprodukte.
+
+    Nur Kacheln oberhalb der Diagonale werden berechnet (die Matrix ist
+    symmetrisch), die Diagonale ist 1 (NaN für konstante/leere Spalten).
+
+    Args:
+        values: Matrix Zeilen × Spalten
+        block_cols: Spalten pro Kachel
+        dtype: Rechen- und Ausgabe-Datentyp (np.float32 halbiert Speicher und Datei)
+        out: None → Array im Speicher, Pfad → Ergebnis als memory-mapped .npy-Datei
+
+    Returns:
+        Korrelationsmatrix Spalten × Spalten (ggf. np.memmap)
+    """
+    prepared = standardize(values, dtype)
+    n_cols = prepared[0].shape[1]
+
+    if out is None:
+        corr = np.empty((n_cols, n_cols), dtype=dtype)
+    else:
+        Path(out).parent.mkdir(parents=True, exist_ok=True)
+        corr = np.lib.format.open_memmap(out, mode='w+', dtype=dtype, shape=(n_cols, n_cols))
+
+    blocks = _blocks(n_cols, block_cols)
+    for i, rows in enumerate(blocks):
+        for cols in blocks[i:]:
+            tile = _tile(prepared, rows, cols)
+            corr[rows, cols] = tile
+            corr[cols, rows] = tile.T
+
+    diagonal = np.einsum('ii->i', corr)
+    diagonal[~np.isnan(diagonal)] = 1.0
+
+    if out is not None:
+        corr.flush()
+    return corr
+
+
+def correlation_pairs(values: np.ndarray, columns: List[str], k: Optional[int] = 10,
+                      threshold: float = 0.0, block_cols: int = PAIRS_BLOCK_COLS,
+                      dtype=np.float64) -> pd.DataFrame:
+    """
+    Dünne Korrelation: pro Spalte die k stärksten Partner mit |r| >= threshold.
+
+    Die Matrix wird in Streifen (block_cols Spalten gegen alle) berechnet,
+    pro Streifen bleiben nur die Top-k → Speicher ∝ block_cols × Spalten.
+
+    Args:
+        values: Matrix Zeilen × Spalten
+        columns: Spaltennamen
+        k: Partner pro Spalte (None = alle über der Schwelle)
+        threshold: Mindestbetrag |r|
+        block_cols: Spalten pro Streifen
+        dtype: Rechen-Datentyp
+
+    Returns:
+        DataFrame mit Spalten feature, other, r (pro feature nach |r| absteigend)
+    """
+    prepared = standardize(values, dtype)
+    n_cols = prepared[0].shape[1]
+    columns = np.asarray(columns, dtype=object)
+
+    features, others, rs = [], [], []
+    for rows in _blocks(n_cols, block_cols):
+        strip = _tile(prepared, rows, slice(None))
+        strength = np.abs(strip)
+        strength[np.arange(strip.shape[0]), np.arange(rows.start, rows.stop)] = np.nan  # ohne sich selbst
+        strength = np.where(strength >= threshold, strength, -1.0)  # NaN/unter Schwelle → -1
+
+        if k is not None and k < n_cols:
+            top = np.argpartition(-strength, k - 1, axis=1)[:, :k]
+        else:
+            top = np.broadcast_to(np.arange(n_cols), strength.shape)
+        order = np.argsort(-np.take_along_axis(strength, top, axis=1), axis=1, kind='stable')
+        top = np.take_along_axis(top, order, axis=1)
+
+        row_idx, pos = np.nonzero(np.take_along_axis(strength, top, axis=1) >= 0)
+        col_idx = top[row_idx, pos]
+        features.append(columns[rows.start + row_idx])
+        others.append(columns[col_idx])
+        rs.append(strip[row_idx, col_idx])
+
+    return pd.DataFrame({
+        'feature': np.concatenate(features) if features else [],
+        'other': np.concatenate(others) if others else [],
+        'r': np.concatenate(rs) if rs else [],
+    })
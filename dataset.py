@@ -0,0 +1,289 @@
+"""
+Hydraulic Systems - Datensatz-Objekt
+====================================
+Ein Einstieg für Sensoren, Zielvariablen und Features (lazy, mit LRU-Cache)
+
+KONZEPT:
+Notebooks und Skripte haben bisher jeweils eigenen Code für "lade Sensor X".
+Der HydraulicDataset bündelt das auf Basis von SENSOR_NAMES, SAMPLING_RATES
+und TARGET_COLUMNS aus prep_corrected.py:
+
+- Sensoren werden erst beim ersten Zugriff geparst (read_sensor_file oder
+  optional über den SensorCache)
+- Geparste Matrizen liegen in einem LRU-Cache mit Speicherbudget: Vor dem
+  Laden wird anhand der erwarteten Größe (Zyklen × Rate × 60 s) Platz
+  geschaffen, die am längsten nicht benutzten Sensoren fliegen zuerst raus
+  (ein 100-Hz-Sensor hat in float64 ca. 106 MB)
+- Zugriff auf einzelne Zyklen eines nicht geladenen Sensors geht über den
+  RowIndex (row_index.py) → nur diese Zeilen werden geparst
+- features() merkt sich die Ausgabe von extract_features pro Sensor und
+  Optionen, Zielvariablen werden einmal aus profile.txt gelesen
+
+Nutzung (z.B. im Notebook):
+    from dataset import HydraulicDataset
+    ds = HydraulicDataset("data", max_bytes=512 * 1024 ** 2)
+    ps1 = ds['ps1']                      # Matrix Zyklen × 6000
+    block = ds['ps1', 100:200]           # nur diese Zyklen
+    cycle = ds.cycle(1800)               # {sensor: Array} für OnlineFeatureExtractor
+    df = ds.features(with_targets=True)  # wie features_complete.csv
+"""
+
+import numpy as np
+import pandas as pd
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+from prep_corrected import (CYCLE_SECONDS, SAMPLING_RATES, SENSOR_NAMES, TARGET_COLUMNS,
+                            extract_features, read_sensor_file)
+from row_index import DEFAULT_INDEX_DIR, RowIndex
+
+
+DEFAULT_MAX_BYTES = 512 * 1024 ** 2  # ca. 4 der 100-Hz-Sensoren in float64
+
+Cycles = Union[int, slice, Sequence[int]]
+
+
+class HydraulicDataset:
+    """
+    Lazy geladener Datensatz: Sensor-Matrizen, Zielvariablen und Features.
+
+    Indizierung:
+    - ds['ps1'] → Matrix Zyklen × Zeitpunkte (geladen und gecacht)
+    - ds['ps1', cycles] → nur diese Zyklen (int → 1-D, slice/Liste → 2-D)
+    - ds[['ps1', 'ts1'], cycles] → Dictionary {sensor: Array}
+    """
+
+    def __init__(self, data_path: str = "data", profile_path: str = "docs/profile.txt",
+                 max_bytes: int = DEFAULT_MAX_BYTES, dtype=np.float64, cache=None,
+                 index_dir: str = DEFAULT_INDEX_DIR):
+        """
+        Args:
+            data_path: Ordner mit den Sensor-Dateien
+            profile_path: Pfad zu profile.txt (Zielvariablen)
+            max_bytes: Speicherbudget für geladene Sensor-Matrizen
+            dtype: Datentyp der Matrizen (np.float32 halbiert den Speicher)
+            cache: Optional SensorCache (sensor_cache.py) → .npy-Memory-Maps statt Parsen
+            index_dir: Ordner für den Zeilen-Index (Zugriff auf einzelne Zyklen)
+        """
+        self.data_path = Path(data_path)
+        self.profile_path = Path(profile_path)
+        self.max_bytes = max_bytes
+        self.dtype = np.dtype(dtype)
+        self.cache = cache
+        self.sensors: List[str] = [name for name in SENSOR_NAMES
+                                   if (self.data_path / f"{name.upper()}.txt").exists()]
+        self.typos: Dict[str, int] = {}
+
+        self._index = RowIndex(data_path, index_dir)
+        self._matrices: 'OrderedDict[str, np.ndarray]' = OrderedDict()
+        self._features: Dict[Tuple, pd.DataFrame] = {}
+        self._targets: Optional[pd.DataFrame] = None
+        self._hits = 0
+        self._misses = 0
+
+    # ------------------------------------------------------------------
+    # Sensoren
+    # ------------------------------------------------------------------
+
+    def sensor(self, name: str) -> np.ndarray:
+        """
+        Matrix eines Sensors (beim ersten Zugriff geparst, danach aus dem LRU-Cache).
+
+        Args:
+            name: Sensorname (z.B. 'ps1')
+
+        Returns:
+            Array Zyklen × Zeitpunkte (Typos → NaN)
+        """
+        name = self._check_sensor(name)
+        if name in self._matrices:
+            self._hits += 1
+            self._matrices.move_to_end(name)
+            return self._matrices[name]
+
+        self._misses += 1
+        # Vorher Platz schaffen → Spitze bleibt im Budget
+        self._evict(self.max_bytes - self.expected_bytes(name))
+        file_path = self.data_path / f"{name.upper()}.txt"
+        if self.cache is not None:
+            values, n_coerced = self.cache.load(file_path, dtype=self.dtype)
+        else:
+            values, n_coerced = read_sensor_file(file_path, dtype=self.dtype)
+        self.typos[name] = n_coerced
+
+        if values.nbytes <= self.max_bytes:
+            self._matrices[name] = values
+            self._evict(self.max_bytes)
+        return values
+
+    def cycles(self, name: str, cycles: Cycles) -> np.ndarray:
+        """
+        Ausgewählte Zyklen eines Sensors.
+
+        Ist der Sensor schon geladen, wird aus dem Cache geschnitten, sonst
+        werden über den Zeilen-Index nur diese Zeilen geparst.
+
+        Args:
+            name: Sensorname (z.B. 'ps1')
+            cycles: Zyklus-Nummer, slice oder Liste von Nummern
+
+        Returns:
+            Array Zeitpunkte (int) bzw. Zyklen × Zeitpunkte (slice/Liste)
+        """
+        name = self._check_sensor(name)
+        if name in self._matrices:
+            self._hits += 1
+            self._matrices.move_to_end(name)
+            return self._matrices[name][cycles]
+
+        if isinstance(cycles, (int, np.integer)):
+            return self._index.get_cycle(name, int(cycles), self.dtype)
+        return self._index.get_cycles(name, cycles, self.dtype)
+
+    def cycle(self, i: int, sensors: Optional[Sequence[str]] = None) -> Dict[str, np.ndarray]:
+        """
+        Ein Zyklus aller (bzw. der gewählten) Sensoren.
+
+        Args:
+            i: Zyklus-Nummer (0-basiert)
+            sensors: Sensornamen (None = alle vorhandenen)
+
+        Returns:
+            Dictionary {sensor: 1-D Array}, direkt nutzbar für OnlineFeatureExtractor.transform
+        """
+        return {name: self.cycles(name, i) for name in (sensors or self.sensors)}
+
+    def __getitem__(self, key) -> Union[np.ndarray, Dict[str, np.ndarray]]:
+        if isinstance(key, tuple):
+            names, cycles = key
+            if isinstance(names, str):
+                return self.cycles(names, cycles)
+            return {name: self.cycles(name, cycles) for name in names}
+        if isinstance(key, str):
+            return self.sensor(key)
+        return {name: self.sensor(name) for name in key}
+
+    def __len__(self) -> int:
+        return self.n_cycles
+
+    @property
+    def n_cycles(self) -> int:
+        """Zyklen, die alle Sensoren haben (aus dem Zeilen-Index, ohne Parsen)."""
+        return min((self._index.n_cycles(name) for name in self.sensors), default=0)
+
+    def expected_bytes(self, name: str) -> int:
+        """Speicherbedarf der Matrix eines Sensors (Zyklen × Rate × 60 s × Bytes pro Wert)."""
+        name = self._check_sensor(name)
+        n_cols = CYCLE_SECONDS * SAMPLING_RATES[name]
+        return self._index.n_cycles(name) * n_cols * self.dtype.itemsize
+
+    # ------------------------------------------------------------------
+    # Zielvariablen und Features
+    # ------------------------------------------------------------------
+
+    @property
+    def targets(self) -> pd.DataFrame:
+        """Zielvariablen aus profile.txt (Spalten TARGET_COLUMNS, einmal gelesen)."""
+        if self._targets is None:
+            self._targets = pd.read_csv(self.profile_path, sep='\t', header=None, names=TARGET_COLUMNS)
+        return self._targets
+
+    def features(self, sensors: Optional[Sequence[str]] = None, n_windows: int = 1,
+                 quantile_error: Optional[float] = None, with_targets: bool = False) -> pd.DataFrame:
+        """
+        Features der Sensoren (extract_features), pro Sensor und Optionen gemerkt.
+
+        Einmal berechnete Features brauchen die Rohdaten nicht mehr → ein
+        zweiter Aufruf lädt nichts nach, auch wenn die Matrix längst aus dem
+        LRU-Cache verdrängt wurde.
+
+        Args:
+            sensors: Sensornamen (None = alle vorhandenen)
+            n_windows: Zusätzlich 8 Features pro Zeitfenster (siehe extract_features)
+            quantile_error: Näherungs-Quantile (siehe extract_features), None = exakt
+            with_targets: Zielvariablen anhängen (nur Zyklen mit beidem, wie features_complete.csv)
+
+        Returns:
+            DataFrame Zyklen × Features (+ Zielvariablen)
+        """
+        blocks = []
+        for name in (sensors or self.sensors):
+            name = self._check_sensor(name)
+            key = (name, n_windows, quantile_error, self.dtype.name)
+            if key not in self._features:
+                self._features[key] = extract_features(self.sensor(name), name, n_windows=n_windows,
+                                                       quantile_error=quantile_error)
+            blocks.append(self._features[key])
+
+        features = pd.concat(blocks, axis=1)
+        if not with_targets:
+            return features
+        n_cycles = min(len(features), len(self.targets))
+        return pd.concat([features.iloc[:n_cycles].reset_index(drop=True),
+                          self.targets.iloc[:n_cycles].reset_index(drop=True)], axis=1)
+
+    # ------------------------------------------------------------------
+    # Cache
+    # ------------------------------------------------------------------
+
+    def cache_info(self) -> Dict:
+        """
+        Zustand des LRU-Caches.
+
+        Returns:
+            Dictionary mit hits, misses, loaded (älteste zuerst), bytes, max_bytes
+            und memoized_features (Anzahl gemerkter Feature-Blöcke)
+        """
+        return {
+            'hits': self._hits,
+            'misses': self._misses,
+            'loaded': list(self._matrices),
+            'bytes': self.nbytes,
+            'max_bytes': self.max_bytes,
+            'memoized_features': len(self._features),
+        }
+
+    @property
+    def nbytes(self) -> int:
+        """Speicher aller geladenen Matrizen."""
+        return sum(values.nbytes for values in self._matrices.values())
+
+    def clear(self, features: bool = False):
+        """
+        Gibt alle geladenen Matrizen frei.
+
+        Args:
+            features: Auch die gemerkten Features und Zielvariablen verwerfen
+        """
+        self._matrices.clear()
+        if features:
+            self._features.clear()
+            self._targets = None
+
+    def close(self):
+        """Gibt Matrizen frei und schließt die Memory-Maps des Zeilen-Index."""
+        self.clear()
+        self._index.close()
+
+    def __enter__(self) -> 'HydraulicDataset':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __repr__(self) -> str:
+        return (f"HydraulicDataset('{self.data_path}', {len(self.sensors)} Sensoren, "
+                f"{len(self._matrices)} geladen, {self.nbytes / 1e6:.0f} / {self.max_bytes / 1e6:.0f} MB)")
+
+    def _evict(self, budget: int):
+        """Verdrängt die am längsten nicht benutzten Matrizen, bis höchstens budget Bytes belegt sind."""
+        while self._matrices and self.nbytes > max(budget, 0):
+            self._matrices.popitem(last=False)
+
+    def _check_sensor(self, name: str) -> str:
+        """Normalisiert den Sensornamen und prüft, ob die Datei vorhanden ist."""
+        name = name.lower()
+        if name not in self.sensors:
+            raise KeyError(f"Unbekannter Sensor '{name}' (vorhanden: {', '.join(self.sensors)})")
+        return name
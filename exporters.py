@@ -0,0 +1,569 @@
+"""
+Hydraulic Systems - Exporter
+============================
+Binäre Spaltenformate für den Feature-Datensatz und die Rohdaten
+
+KONZEPT:
+features_complete.csv muss bei jedem Einlesen komplett als Text geparst
+werden (Floats aus Strings), und die breite Parquet-Datei des Archiv-Skripts
+(43.680 Spalten) ist beim Schreiben und Lesen sehr langsam, weil jede Spalte
+eigene Metadaten und Seiten bekommt. Deshalb gibt es austauschbare Formate:
+
+Tabellen (Features, Zyklen × Spalten):
+- 'csv': wie bisher (optional gzip)
+- 'parquet': spaltenweise, Zeilengruppen à TABLE_BLOCK_ROWS Zyklen, optional komprimiert
+- 'arrow': Arrow-IPC-Datei (Feather v2), unkomprimiert per Memory-Map ohne Kopie lesbar
+
+Rohdaten (pro Sensor eine Matrix Zyklen × Zeitpunkte):
+- 'tensor': pro Sensor eine .npy-Datei + manifest.json → Zyklen per Memory-Map
+- 'long': eine Parquet-Tabelle (sensor, cycle, t, value), sortiert nach Sensor
+  und Zyklus → Zeilengruppen werden über ihre Min/Max-Statistik übersprungen
+
+Alle Leser können Spalten (bzw. Sensoren) und Zyklen auswählen, ohne die
+ganze Datei zu lesen (außer CSV: dort wird nur weniger geparst).
+
+Parquet/Arrow brauchen pyarrow (optional, pip install pyarrow). Eigene
+Formate: register_table_format('name', Klasse).
+
+Nutzung:
+    from exporters import export_table, read_table
+    export_table(df_complete, "out/features_complete.parquet", compression='zstd')
+    df = read_table("out/features_complete.parquet", columns=['ps1_mean'], cycles=slice(0, 100))
+
+    python exporters.py --layout tensor --output out/raw_tensor
+"""
+
+import argparse
+import json
+import os
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from prep_corrected import SAMPLING_RATES, find_sensor_files, read_sensor_file
+
+
+# Zyklen pro Zeilengruppe (Parquet) bzw. Record-Batch (Arrow) → Granularität beim Zyklen-Lesen
+TABLE_BLOCK_ROWS = 256
+
+# Zyklen pro Zeilengruppe im Long-Layout (ein Zyklus PS1 = 6000 Zeilen)
+LONG_BLOCK_CYCLES = 64
+
+Cycles = Union[slice, Sequence[int], np.ndarray, None]
+
+
+def _require_pyarrow():
+    """Importiert pyarrow (optionale Abhängigkeit) mit verständlicher Fehlermeldung."""
+    try:
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError as exc:
+        raise ImportError("Parquet/Arrow-Export braucht pyarrow: pip install pyarrow") from exc
+    return pyarrow
+
+
+def _cycle_index(cycles: Cycles, n_rows: int) -> Optional[np.ndarray]:
+    """Ausgewählte Zyklen als sortiertes Index-Array (None = alle)."""
+    if cycles is None:
+        return None
+    if isinstance(cycles, slice):
+        return np.arange(n_rows)[cycles]
+    index = np.unique(np.asarray(cycles, dtype=np.int64))
+    if len(index) and (index[0] < 0 or index[-1] >= n_rows):
+        raise IndexError(f"Zyklen außerhalb von 0..{n_rows - 1}")
+    return index
+
+
+def _select_blocks(index: np.ndarray, sizes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Welche Blöcke (Zeilengruppen/Batches) enthalten die Zyklen, und wo liegen sie darin?
+
+    Args:
+        index: sortierte Zyklus-Nummern
+        sizes: Zeilen pro Block
+
+    Returns:
+        Tuple aus (Block-Nummern, Zeilen der Zyklen in den aneinandergehängten Blöcken)
+    """
+    starts = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+    block_of = np.searchsorted(starts, index, side='right') - 1
+    blocks = np.unique(block_of)
+    offsets = np.concatenate([[0], np.cumsum(sizes[blocks])])  # Beginn jedes gelesenen Blocks
+    rows = offsets[np.searchsorted(blocks, block_of)] + index - starts[block_of]
+    return blocks, rows
+
+
+# ---------------------------------------------------------------------------
+# Tabellen (Features)
+# ---------------------------------------------------------------------------
+
+class TableFormat:
+    """
+    Basisklasse eines Tabellen-Formats.
+
+    Unterklassen setzen name/suffix und implementieren write und read.
+    Gelesene Tabellen haben die Zyklus-Nummern als Index.
+    """
+
+    name = None
+    suffix = None
+    compressions = (None,)
+
+    def __init__(self, compression: Optional[str] = None):
+        """
+        Args:
+            compression: Kompression (None = Standard des Formats, 'none' = aus)
+        """
+        if compression not in self.compressions:
+            allowed = ', '.join(str(c) for c in self.compressions)
+            raise ValueError(f"Kompression '{compression}' für {self.name} nicht möglich (erlaubt: {allowed})")
+        self.compression = compression
+
+    def write(self, df: pd.DataFrame, path: Path) -> Path:
+        raise NotImplementedError
+
+    def read(self, path: Path, columns: Optional[List[str]] = None, cycles: Cycles = None) -> pd.DataFrame:
+        raise NotImplementedError
+
+
+class CsvFormat(TableFormat):
+    """CSV wie df.to_csv(index=False), optional gzip."""
+
+    name = 'csv'
+    suffix = '.csv'
+    compressions = (None, 'none', 'gzip')
+
+    def write(self, df: pd.DataFrame, path: Path) -> Path:
+        compression = None if self.compression in (None, 'none') else self.compression
+        df.to_csv(path, index=False, compression=compression)
+        return path
+
+    def read(self, path: Path, columns: Optional[List[str]] = None, cycles: Cycles = None) -> pd.DataFrame:
+        # Nur die gewünschten Zeilen parsen (der Text wird trotzdem ganz gelesen)
+        if cycles is None:
+            df = pd.read_csv(path, usecols=columns)
+        elif isinstance(cycles, slice):
+            start = cycles.start or 0
+            nrows = None if cycles.stop is None else max(cycles.stop - start, 0)
+            df = pd.read_csv(path, usecols=columns, skiprows=range(1, start + 1), nrows=nrows)
+            df.index = pd.RangeIndex(start, start + len(df))
+            df = df.iloc[::cycles.step or 1]
+        else:
+            index = np.unique(np.asarray(cycles, dtype=np.int64))
+            wanted = set((index + 1).tolist())  # Zeile 0 = Kopfzeile
+            df = pd.read_csv(path, usecols=columns, skiprows=lambda row: row > 0 and row not in wanted)
+            df.index = index[:len(df)]
+
+        # usecols liefert die Datei-Reihenfolge → wie angefordert sortieren
+        return df if columns is None else df[columns]
+
+
+class ParquetFormat(TableFormat):
+    """Parquet mit Zeilengruppen à TABLE_BLOCK_ROWS Zyklen (Standard-Kompression: snappy)."""
+
+    name = 'parquet'
+    suffix = '.parquet'
+    compressions = (None, 'none', 'snappy', 'zstd', 'lz4', 'gzip')
+
+    def write(self, df: pd.DataFrame, path: Path) -> Path:
+        pa = _require_pyarrow()
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        pa.parquet.write_table(table, path, row_group_size=TABLE_BLOCK_ROWS,
+                               compression=self.compression or 'snappy')
+        return path
+
+    def read(self, path: Path, columns: Optional[List[str]] = None, cycles: Cycles = None) -> pd.DataFrame:
+        pa = _require_pyarrow()
+        parquet_file = pa.parquet.ParquetFile(path)
+        meta = parquet_file.metadata
+        sizes = np.array([meta.row_group(i).num_rows for i in range(meta.num_row_groups)], dtype=np.int64)
+
+        index = _cycle_index(cycles, int(sizes.sum()))
+        if index is None:
+            return parquet_file.read(columns=columns).to_pandas()
+
+        # Nur Zeilengruppen lesen, die ausgewählte Zyklen enthalten
+        groups, rows = _select_blocks(index, sizes)
+        table = parquet_file.read_row_groups(groups.tolist(), columns=columns)
+        df = table.take(pa.array(rows)).to_pandas()
+        df.index = index
+        return df
+
+
+class ArrowFormat(TableFormat):
+    """Arrow-IPC-Datei (Feather v2), Record-Batches à TABLE_BLOCK_ROWS Zyklen."""
+
+    name = 'arrow'
+    suffix = '.arrow'
+    compressions = (None, 'none', 'lz4', 'zstd')
+
+    def write(self, df: pd.DataFrame, path: Path) -> Path:
+        pa = _require_pyarrow()
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        compression = None if self.compression in (None, 'none') else self.compression
+        options = pa.ipc.IpcWriteOptions(compression=compression)
+        with pa.OSFile(str(path), 'wb') as sink, pa.ipc.new_file(sink, table.schema, options=options) as writer:
+            writer.write_table(table, max_chunksize=TABLE_BLOCK_ROWS)
+        return path
+
+    def read(self, path: Path, columns: Optional[List[str]] = None, cycles: Cycles = None) -> pd.DataFrame:
+        pa = _require_pyarrow()
+        # Memory-Map: unkomprimierte Spalten werden ohne Kopie gelesen
+        with pa.memory_map(str(path), 'r') as source:
+            reader = pa.ipc.open_file(source)
+            index = None
+            if cycles is None:
+                table = reader.read_all()
+            else:
+                # Batches liegen per Memory-Map vor: num_rows lesen kostet nichts
+                sizes = np.array([reader.get_batch(i).num_rows for i in range(reader.num_record_batches)],
+                                 dtype=np.int64)
+                index = _cycle_index(cycles, int(sizes.sum()))
+                batches, rows = _select_blocks(index, sizes)
+                table = pa.Table.from_batches([reader.get_batch(int(i)) for i in batches], schema=reader.schema)
+                table = table.take(pa.array(rows))
+            if columns is not None:
+                table = table.select(columns)
+            df = table.to_pandas()
+
+        if index is not None:
+            df.index = index
+        return df
+
+
+TABLE_FORMATS: Dict[str, type] = {fmt.name: fmt for fmt in (CsvFormat, ParquetFormat, ArrowFormat)}
+
+
+def register_table_format(name: str, format_class: type):
+    """
+    Registriert ein eigenes Tabellen-Format (Unterklasse von TableFormat).
+
+    Args:
+        name: Name für export_table/--export-format
+        format_class: Klasse mit suffix, write und read
+    """
+    TABLE_FORMATS[name] = format_class
+
+
+def get_table_format(name: str, compression: Optional[str] = None) -> TableFormat:
+    """
+    Liefert ein Tabellen-Format nach Namen.
+
+    Args:
+        name: 'csv', 'parquet', 'arrow' oder ein registriertes Format
+        compression: Kompression (None = Standard des Formats)
+
+    Returns:
+        TableFormat-Instanz
+    """
+    if name not in TABLE_FORMATS:
+        raise ValueError(f"Unbekanntes Format: '{name}' (verfügbar: {', '.join(TABLE_FORMATS)})")
+    return TABLE_FORMATS[name](compression)
+
+
+def _format_for_path(path: Path) -> str:
+    """Format-Name anhand der Dateiendung (.csv.gz → csv)."""
+    suffixes = [s for s in path.suffixes if s != '.gz']
+    for name, fmt in TABLE_FORMATS.items():
+        if suffixes and suffixes[-1] == fmt.suffix:
+            return name
+    raise ValueError(f"Format von '{path}' nicht erkannt (Endungen: "
+                     f"{', '.join(fmt.suffix for fmt in TABLE_FORMATS.values())})")
+
+
+def export_table(df: pd.DataFrame, path, fmt: Optional[str] = None, compression: Optional[str] = None) -> Path:
+    """
+    Schreibt eine Tabelle (z.B. df_complete) in einem der Formate.
+
+    Args:
+        df: Tabelle Zyklen × Spalten
+        path: Zieldatei
+        fmt: Format-Name (None = aus der Dateiendung)
+        compression: Kompression (None = Standard des Formats)
+
+    Returns:
+        Pfad der geschriebenen Datei
+    """
+    path = Path(path)
+    if compression is None and path.suffix == '.gz':
+        compression = 'gzip'
+    table_format = get_table_format(fmt or _format_for_path(path), compression)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    # Erst .tmp, dann umbenennen → Leser sehen nie eine halbe Datei
+    tmp_path = path.with_name(path.name + '.tmp')
+    table_format.write(df, tmp_path)
+    os.replace(tmp_path, path)
+    return path
+
+
+def read_table(path, columns: Optional[List[str]] = None, cycles: Cycles = None,
+               fmt: Optional[str] = None) -> pd.DataFrame:
+    """
+    Liest eine Tabelle, optional nur ausgewählte Spalten und Zyklen.
+
+    Args:
+        path: Datei (Format aus der Endung, falls fmt None)
+        columns: Spalten (None = alle)
+        cycles: Zyklen als slice oder Liste von Zeilennummern (None = alle)
+        fmt: Format-Name
+
+    Returns:
+        DataFrame, Index = Zyklus-Nummern
+    """
+    path = Path(path)
+    return get_table_format(fmt or _format_for_path(path)).read(path, columns=columns, cycles=cycles)
+
+
+# ---------------------------------------------------------------------------
+# Rohdaten (pro Sensor Zyklen × Zeitpunkte)
+# ---------------------------------------------------------------------------
+
+RawBlock = Tuple[str, np.ndarray, Optional[np.ndarray]]
+
+
+def split_sensor_blocks(values: np.ndarray, columns: List[str]) -> Iterable[RawBlock]:
+    """
+    Zerlegt eine breite Matrix (Spalten '<sensor>_<t>') in Sensor-Blöcke.
+
+    So lassen sich auch die zusammengeführten Matrizen des Archiv-Skripts
+    (ggf. mit entfernten Spalten) im Roh-Layout speichern.
+
+    Args:
+        values: Matrix Zyklen × Spalten
+        columns: Spaltennamen wie 'ps1_0' … 'ps1_5999' oder 'ce'
+
+    Yields:
+        Tuple aus (Sensor, Matrix Zyklen × Zeitpunkte, Zeitpunkt-Nummern)
+    """
+    sensors, times = [], []
+    for col in columns:
+        sensor, _, t = col.rpartition('_')
+        if sensor and t.isdigit():
+            sensors.append(sensor)
+            times.append(int(t))
+        else:
+            sensors.append(col)
+            times.append(0)
+
+    start = 0
+    while start < len(columns):
+        stop = start
+        while stop < len(columns) and sensors[stop] == sensors[start]:
+            stop += 1
+        yield sensors[start], values[:, start:stop], np.array(times[start:stop], dtype=np.int32)
+        start = stop
+
+
+def iter_sensor_files(data_path: str = "data", dtype=np.float64) -> Iterable[RawBlock]:
+    """
+    Liest die Sensor-Dateien nacheinander (immer nur eine Matrix im Speicher).
+
+    Args:
+        data_path: Datenordner
+        dtype: Datentyp der Matrizen
+
+    Yields:
+        Tuple aus (Sensor, Matrix Zyklen × Zeitpunkte, None)
+    """
+    for file_path in find_sensor_files(data_path):
+        values, _ = read_sensor_file(file_path, dtype=dtype)
+        yield file_path.stem.lower(), values, None
+
+
+class RawLayout:
+    """
+    Basisklasse eines Roh-Layouts.
+
+    write bekommt die Sensoren nacheinander (Speicher ∝ ein Sensor),
+    read liefert {Sensor: Matrix Zyklen × Zeitpunkte}.
+    """
+
+    name = None
+
+    def __init__(self, compression: Optional[str] = None):
+        self.compression = compression
+
+    def write(self, blocks: Iterable[RawBlock], path: Path) -> Path:
+        raise NotImplementedError
+
+    def read(self, path: Path, sensors: Optional[List[str]] = None,
+             cycles: Cycles = None) -> Dict[str, np.ndarray]:
+        raise NotImplementedError
+
+
+class TensorLayout(RawLayout):
+    """
+    Ordner mit <sensor>.npy (Zyklen × Zeitpunkte, native Rate) + manifest.json.
+
+    Unkomprimiert, damit Zyklen per Memory-Map gelesen werden können
+    (gemeinsame Zeitachse aller Sensoren: sensor_tensor.py).
+    """
+
+    name = 'tensor'
+
+    def __init__(self, compression: Optional[str] = None):
+        if compression not in (None, 'none'):
+            raise ValueError("Tensor-Layout ist unkomprimiert (Memory-Map), Kompression: Layout 'long'")
+        super().__init__(compression)
+
+    def write(self, blocks: Iterable[RawBlock], path: Path) -> Path:
+        path.mkdir(parents=True, exist_ok=True)
+        manifest = {'sensors': {}}
+        for sensor, values, times in blocks:
+            npy_path = path / f"{sensor}.npy"
+            tmp_path = path / f"{sensor}.npy.tmp"
+            with open(tmp_path, 'wb') as f:
+                np.save(f, np.ascontiguousarray(values))
+            os.replace(tmp_path, npy_path)
+            manifest['sensors'][sensor] = {
+                'file': npy_path.name,
+                'shape': list(values.shape),
+                'dtype': values.dtype.name,
+                'rate_hz': SAMPLING_RATES.get(sensor),
+                'times': None if times is None else times.tolist(),
+            }
+
+        tmp_path = path / "manifest.json.tmp"
+        tmp_path.write_text(json.dumps(manifest, indent=2))
+        os.replace(tmp_path, path / "manifest.json")
+        return path
+
+    def read(self, path: Path, sensors: Optional[List[str]] = None,
+             cycles: Cycles = None) -> Dict[str, np.ndarray]:
+        manifest = json.loads((path / "manifest.json").read_text())['sensors']
+        result = {}
+        for sensor in sensors or list(manifest):
+            values = np.load(path / manifest[sensor]['file'], mmap_mode='r')
+            index = _cycle_index(cycles, values.shape[0])
+            result[sensor] = np.array(values if index is None else values[index])
+        return result
+
+
+class LongLayout(RawLayout):
+    """
+    Parquet-Tabelle (sensor, cycle, t, value), eine Zeilengruppe je Sensor und
+    LONG_BLOCK_CYCLES Zyklen. Standard-Kompression: zstd (cycle/t komprimieren fast vollständig).
+    """
+
+    name = 'long'
+
+    def write(self, blocks: Iterable[RawBlock], path: Path) -> Path:
+        pa = _require_pyarrow()
+        compression = self.compression or 'zstd'
+        writer = None
+        try:
+            for sensor, values, times in blocks:
+                n_cycles, n_times = values.shape
+                times = np.arange(n_times, dtype=np.int32) if times is None else times.astype(np.int32)
+                for start in range(0, n_cycles, LONG_BLOCK_CYCLES):
+                    block = values[start:start + LONG_BLOCK_CYCLES]
+                    n = block.shape[0]
+                    table = pa.table({
+                        'sensor': pa.DictionaryArray.from_arrays(np.zeros(n * n_times, dtype=np.int32), [sensor]),
+                        'cycle': np.repeat(np.arange(start, start + n, dtype=np.int32), n_times),
+                        't': np.tile(times, n),
+                        'value': np.ascontiguousarray(block).ravel(),
+                    })
+                    if writer is None:
+                        writer = pa.parquet.ParquetWriter(path, table.schema, compression=compression)
+                    writer.write_table(table, row_group_size=len(table))
+        finally:
+            if writer is not None:
+                writer.close()
+        return path
+
+    def read(self, path: Path, sensors: Optional[List[str]] = None,
+             cycles: Cycles = None) -> Dict[str, np.ndarray]:
+        pa = _require_pyarrow()
+        parquet_file = pa.parquet.ParquetFile(path)
+        meta = parquet_file.metadata
+        column_index = {meta.schema.column(i).name: i for i in range(meta.num_columns)}
+
+        # Zeilengruppen anhand ihrer Statistik (Sensor, Zyklus-Spanne) auswählen, ohne Daten zu lesen
+        groups = {}
+        for i in range(meta.num_row_groups):
+            row_group = meta.row_group(i)
+            sensor = row_group.column(column_index['sensor']).statistics.min
+            stats = row_group.column(column_index['cycle']).statistics
+            groups.setdefault(sensor, []).append((i, stats.min, stats.max))
+
+        result = {}
+        for sensor in sensors or list(groups):
+            n_cycles = max(hi for _, _, hi in groups[sensor]) + 1
+            index = _cycle_index(cycles, n_cycles)
+            selected = [i for i, lo, hi in groups[sensor]
+                        if index is None or np.any((index >= lo) & (index <= hi))]
+            table = parquet_file.read_row_groups(selected, columns=['cycle', 'value'])
+            cycle = table.column('cycle').to_numpy()
+            value = table.column('value').to_numpy()
+            n_times = int(np.sum(cycle == cycle[0]))
+            matrix = value.reshape(-1, n_times)
+            if index is not None:
+                matrix = matrix[np.isin(cycle[::n_times], index)]
+            result[sensor] = matrix
+        return result
+
+
+RAW_LAYOUTS: Dict[str, type] = {layout.name: layout for layout in (TensorLayout, LongLayout)}
+
+
+def export_raw(blocks: Iterable[RawBlock], path, layout: str = 'tensor',
+               compression: Optional[str] = None) -> Path:
+    """
+    Schreibt Rohdaten (Sensor für Sensor) in einem Roh-Layout.
+
+    Args:
+        blocks: (Sensor, Matrix, Zeitpunkte) z.B. aus iter_sensor_files oder split_sensor_blocks
+        path: Ziel (Ordner für 'tensor', .parquet-Datei für 'long')
+        layout: 'tensor' oder 'long'
+        compression: Kompression (nur 'long')
+
+    Returns:
+        Pfad des Ergebnisses
+    """
+    if layout not in RAW_LAYOUTS:
+        raise ValueError(f"Unbekanntes Layout: '{layout}' (verfügbar: {', '.join(RAW_LAYOUTS)})")
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    return RAW_LAYOUTS[layout](compression).write(blocks, path)
+
+
+def read_raw(path, sensors: Optional[List[str]] = None, cycles: Cycles = None) -> Dict[str, np.ndarray]:
+    """
+    Liest Rohdaten, optional nur ausgewählte Sensoren und Zyklen.
+
+    Args:
+        path: Ordner (Layout 'tensor') oder .parquet-Datei (Layout 'long')
+        sensors: Sensoren (None = alle)
+        cycles: Zyklen als slice oder Liste (None = alle)
+
+    Returns:
+        Dictionary {Sensor: Matrix Zyklen × Zeitpunkte}
+    """
+    path = Path(path)
+    layout = TensorLayout() if path.is_dir() else LongLayout()
+    return layout.read(path, sensors=sensors, cycles=cycles)
+
+
+def main():
+    """Kommandozeile: Sensor-Dateien aus data/ in ein Roh-Layout exportieren."""
+    parser = argparse.ArgumentParser(description="Rohdaten in ein binäres Layout exportieren")
+    parser.add_argument('--data', default='data', help="Datenordner mit den Sensor-Dateien")
+    parser.add_argument('--layout', choices=list(RAW_LAYOUTS), default='tensor', help="Roh-Layout")
+    parser.add_argument('--output', default=None, help="Ziel (Standard: out/raw_<layout>)")
+    parser.add_argument('--compression', default=None, help="Kompression (nur long: zstd, snappy, lz4, gzip, none)")
+    parser.add_argument('--precision', choices=['float64', 'float32'], default='float64', help="Datentyp")
+    args = parser.parse_args()
+
+    output = args.output or f"out/raw_{args.layout}" + ('.parquet' if args.layout == 'long' else '')
+    print(f"[exporters] Exportiere Rohdaten aus '{args.data}' → '{output}' (Layout {args.layout})...")
+    path = export_raw(iter_sensor_files(args.data, dtype=args.precision), output, args.layout, args.compression)
+    size = sum(f.stat().st_size for f in path.rglob('*')) if path.is_dir() else path.stat().st_size
+    print(f"  ✓ Gespeichert: {path} ({size / 1e6:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
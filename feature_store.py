@@ -0,0 +1,255 @@
+"""
+Hydraulic Systems - Inkrementeller Feature-Store
+================================================
+Verarbeitet nur neu angehängte Zyklen
+
+KONZEPT:
+Am Prüfstand werden laufend neue Zeilen (Zyklen) an die Sensor-Dateien
+angehängt. Statt bei jedem Lauf alle Zyklen neu zu aggregieren, merkt sich
+der Store pro Sensor, bis zu welchem Byte (und welcher Zeile) die Datei
+bereits verarbeitet ist:
+
+- Neuer Lauf → nur das neue Ende der Datei parsen und aggregieren
+- Features werden an die gespeicherte Tabelle angehängt
+- Datei gekürzt oder umgeschrieben → kompletter Neuaufbau dieses Sensors
+  (Größe + mtime unverändert → nichts zu tun, sonst Hash des ganzen bereits
+  verarbeiteten Bereichs vergleichen, wie beim SensorCache)
+- Letzte Zeile ohne Zeilenumbruch am Dateiende zählt als Zyklus, wird aber
+  nur vorläufig gespeichert und beim nächsten Lauf neu geparst (falls sie
+  inzwischen fortgesetzt wurde)
+- Andere Feature-Optionen (z.B. --windows, --spectral) oder ein anderer
+  Datentyp (--precision) → ebenfalls Neuaufbau, beides steht im Zustand
+
+Laufzeit ∝ neue Daten, nicht ∝ gesamte Historie.
+
+Dateien pro Sensor im Store-Ordner:
+- <sensor>.f64: Features als rohe float64-Matrix (Zyklen × Features), nur angehängt
+  (float32-Features verlustfrei hochgecastet, load() liefert wieder float32)
+- <sensor>.json: Zustand (Quelle, Byte-Offset, Zeilen, Größe, mtime, Prüfsumme,
+  Optionen, Spalten)
+
+Nutzung:
+    from feature_store import FeatureStore
+    features_df = FeatureStore("cache/feature_store", "data").update()
+    features_df = FeatureStore("cache/feature_store", "data", {'n_windows': 6}).update()
+"""
+
+import hashlib
+import json
+import os
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Dict, Optional
+
+from prep_corrected import FEATURE_STATS, find_sensor_files, parse_sensor_lines, sensor_features
+
+
+DEFAULT_STORE_DIR = "cache/feature_store"
+
+# Bytes pro gelesenem Block beim Hashen des verarbeiteten Bereichs
+HASH_CHUNK_BYTES = 1 << 20
+
+# Neue Zeilen werden in Blöcken dieser Größe geparst (Speicher begrenzt)
+UPDATE_BLOCK_ROWS = 1024
+
+
+def _prefix_hasher(f, stop: int):
+    """Hash-Objekt (BLAKE2b) über die ersten stop Bytes einer geöffneten Datei, blockweise gelesen."""
+    h = hashlib.blake2b(digest_size=16)
+    f.seek(0)
+    while stop > 0:
+        chunk = f.read(min(HASH_CHUNK_BYTES, stop))
+        if not chunk:
+            break
+        h.update(chunk)
+        stop -= len(chunk)
+    return h
+
+
+class FeatureStore:
+    """
+    Persistente Feature-Tabelle, die inkrementell mit neuen Zyklen wächst.
+
+    Die Features eines Zyklus hängen nur von seiner eigenen Zeile ab
+    (zeilenlokal) → angehängte Zeilen ändern keine alten Features.
+    """
+
+    def __init__(self, store_dir: str = DEFAULT_STORE_DIR, data_path: str = "data",
+                 feature_options: Optional[Dict] = None, dtype=np.float64):
+        """
+        Args:
+            store_dir: Ordner für Feature-Dateien und Zustände
+            data_path: Pfad zum Datenordner mit den Sensor-Dateien
+            feature_options: Optionen für sensor_features (z.B. n_windows=6),
+                             müssen zeilenlokal sein und sich als JSON speichern lassen
+            dtype: Datentyp für Rohdaten und Features (np.float32 halbiert den Speicher)
+        """
+        self.store_dir = Path(store_dir)
+        self.data_path = data_path
+        self.feature_options = dict(feature_options or {})
+        self.dtype = np.dtype(dtype)
+
+    def update(self) -> pd.DataFrame:
+        """
+        Bringt alle Sensoren auf den aktuellen Stand und liefert die Feature-Tabelle.
+
+        Returns:
+            DataFrame Zyklen × Features (nur Zyklen, die alle Sensoren haben)
+        """
+        print(f"[FeatureStore.update] Aktualisiere Feature-Store '{self.store_dir}'...")
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+
+        for file_path in find_sensor_files(self.data_path):
+            n_new, rebuilt = self.update_sensor(file_path)
+            sensor_name = file_path.stem.lower()
+            if rebuilt:
+                print(f"  ↻ {sensor_name}: Datei oder Optionen geändert → Neuaufbau ({n_new} Zyklen)")
+            elif n_new > 0:
+                print(f"  ✓ {sensor_name}: {n_new} neue Zyklen")
+            else:
+                print(f"  ✓ {sensor_name}: aktuell")
+
+        features = self.load()
+        print(f"  → Store: {features.shape[0]} Zyklen × {features.shape[1]} Features\n")
+        return features
+
+    def update_sensor(self, file_path) -> tuple:
+        """
+        Verarbeitet die neu angehängten Zeilen einer Sensor-Datei.
+
+        Args:
+            file_path: Pfad zur Sensor-Datei
+
+        Returns:
+            Tuple aus (Anzahl neu verarbeiteter Zyklen, ob neu aufgebaut wurde)
+        """
+        file_path = Path(file_path)
+        sensor_name = file_path.stem.lower()
+        state_path, features_path = self._paths(sensor_name)
+
+        state = self._read_state(state_path)
+        rebuilt = False
+
+        with open(file_path, 'rb') as f:
+            stat = os.fstat(f.fileno())
+            size = stat.st_size
+
+            prefix = None
+            if (state is not None and state.get('options', {}) == self.feature_options and
+                    state.get('dtype', 'float64') == self.dtype.name):
+                if (state.get('source') == str(file_path.resolve()) and
+                        (state.get('size'), state.get('mtime_ns')) == (size, stat.st_mtime_ns)):
+                    return 0, False  # Datei seit dem letzten Lauf unverändert
+                prefix = self._verified_prefix(f, size, state, file_path)
+
+            if prefix is None:
+                rebuilt = state is not None
+                state = {'source': str(file_path.resolve()), 'offset': 0, 'n_rows': 0,
+                         'options': self.feature_options, 'dtype': self.dtype.name}
+                prefix = hashlib.blake2b(digest_size=16)
+                features_path.unlink(missing_ok=True)
+
+            # Vorläufige letzte Zeile (ohne Zeilenumbruch) wird neu geparst,
+            # Reste eines abgebrochenen Laufs abschneiden (Zustand ist maßgeblich)
+            n_rows = state['n_rows'] - int(state.get('open_line', False))
+            if features_path.exists():
+                os.truncate(features_path, n_rows * len(self._columns(sensor_name, state)) * 8)
+
+            # Neues Ende lesen: vollständige Zeilen + evtl. letzte Zeile ohne Zeilenumbruch
+            f.seek(state['offset'])
+            tail = f.read(size - state['offset'])
+            end = tail.rfind(b'\n') + 1
+            lines = [line for line in tail[:end].splitlines() if line.strip()]
+            open_line = bool(tail[end:].strip())
+            if open_line:
+                lines.append(tail[end:].rstrip())
+
+            with open(features_path, 'ab') as out:
+                for start in range(0, len(lines), UPDATE_BLOCK_ROWS):
+                    values, _ = parse_sensor_lines(lines[start:start + UPDATE_BLOCK_ROWS], self.dtype)
+                    features = sensor_features(values, sensor_name, **self.feature_options)
+                    state['columns'] = list(features.columns)
+                    features.to_numpy(dtype=np.float64).tofile(out)
+
+            # Prüfsumme über [0, neuer Offset) = geprüfter Bereich + neue vollständige Zeilen
+            prefix.update(tail[:end])
+            n_new = n_rows + len(lines) - state['n_rows']
+            state.update({
+                'offset': state['offset'] + end,
+                'n_rows': n_rows + len(lines),
+                'open_line': open_line,
+                'size': size,
+                'mtime_ns': stat.st_mtime_ns,
+                'prefix_hash': prefix.hexdigest(),
+            })
+
+        self._write_state(state_path, state)
+        return n_new, rebuilt
+
+    def load(self) -> pd.DataFrame:
+        """
+        Lädt die gespeicherte Feature-Tabelle (ohne die Sensor-Dateien zu lesen).
+
+        Returns:
+            DataFrame Zyklen × Features (Spalten wie in features_complete.csv)
+        """
+        blocks = []
+        for file_path in find_sensor_files(self.data_path):
+            sensor_name = file_path.stem.lower()
+            state_path, features_path = self._paths(sensor_name)
+            state = self._read_state(state_path)
+            if state is None:
+                continue
+
+            columns = self._columns(sensor_name, state)
+            values = np.fromfile(features_path, dtype=np.float64, count=state['n_rows'] * len(columns))
+            values = values.reshape(-1, len(columns)).astype(state.get('dtype', 'float64'), copy=False)
+            blocks.append(pd.DataFrame(values, columns=columns, copy=False))
+
+        if not blocks:
+            return pd.DataFrame()
+
+        # Nur Zyklen, die bereits für alle Sensoren vorliegen
+        n_rows = min(len(block) for block in blocks)
+        return pd.concat([block.iloc[:n_rows] for block in blocks], axis=1)
+
+    def _verified_prefix(self, f, size: int, state: Dict, file_path: Path):
+        """
+        Prüft, ob der bereits verarbeitete Teil [0, offset) der Datei unverändert ist.
+
+        Gekürzt (size < offset), andere Quelle oder andere Prüfsumme über den
+        ganzen verarbeiteten Bereich → None (Neuaufbau nötig).
+
+        Returns:
+            Hash-Objekt über [0, offset) zum Weiterführen mit dem neuen Ende, oder None
+        """
+        offset = state['offset']
+        if state.get('source') != str(file_path.resolve()) or size < offset:
+            return None
+        prefix = _prefix_hasher(f, offset)
+        return prefix if prefix.hexdigest() == state.get('prefix_hash') else None
+
+    @staticmethod
+    def _columns(sensor_name: str, state: Dict) -> list:
+        """Spaltennamen der gespeicherten Features (ältere Zustände: nur die 8 Statistiken)."""
+        return state.get('columns') or [f'{sensor_name}_{stat}' for stat in FEATURE_STATS]
+
+    def _paths(self, sensor_name: str) -> tuple:
+        """Pfade von Zustand (.json) und Features (.f64) eines Sensors."""
+        return self.store_dir / f"{sensor_name}.json", self.store_dir / f"{sensor_name}.f64"
+
+    @staticmethod
+    def _read_state(state_path: Path) -> Optional[Dict]:
+        """Liest den Zustand eines Sensors (None falls fehlend oder kaputt)."""
+        try:
+            return json.loads(state_path.read_text())
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _write_state(state_path: Path, state: Dict):
+        """Schreibt den Zustand atomar (erst .tmp, dann umbenennen)."""
+        tmp_path = state_path.with_suffix('.json.tmp')
+        tmp_path.write_text(json.dumps(state, indent=2))
+        os.replace(tmp_path, state_path)
@@ -0,0 +1,240 @@
+"""
+Hydraulic Systems - Instrumentierung
+====================================
+Laufzeit, CPU, Speicher und Durchsatz pro Stufe als JSONL-Laufbericht
+
+KONZEPT:
+Bisher gibt es nur die print-Ausgaben der Stufen. Um zu sehen, wo ein
+Produktionslauf Zeit und Speicher lässt, misst der RunRecorder jede Stufe
+(und darin verschachtelt z.B. jeden Sensor in load):
+
+- wall_s / cpu_s: Wanduhr- und CPU-Zeit des Prozesses (ohne Worker-Prozesse)
+- peak_rss_mb: RSS-Spitze während der Stufe (Linux: VmHWM, pro Stufe
+  zurückgesetzt; verschachtelte Stufen gehen in die äußere ein)
+- traced_peak_mb: Spitze laut tracemalloc (optional, bremst Python-lastige Stufen)
+- bytes_read: Größe der Eingabedateien, io_read_bytes: tatsächlich gelesene
+  Bytes laut /proc/self/io (Linux, ohne Memory-Maps)
+- cycles / cycles_per_s: verarbeitete Zyklen und Durchsatz
+
+Jede Stufe wird sofort als eine JSON-Zeile an den Bericht angehängt (bleibt
+auch bei einem Abbruch erhalten), am Ende folgt eine Zeile mit den Summen
+des Laufs. Optional schreibt cProfile pro äußerer Stufe eine .prof-Datei.
+
+Nutzung:
+    python prep_corrected.py --report out/run_report.jsonl --profile out/profiles
+    python -m pstats out/profiles/load.prof
+"""
+
+import contextlib
+import cProfile
+import json
+import re
+import time
+import tracemalloc
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows: keine maximale RSS
+    resource = None
+
+
+def reset_peak_rss() -> bool:
+    """Setzt die RSS-Spitze des Prozesses zurück (nur Linux), True bei Erfolg."""
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def peak_rss_mb() -> Optional[float]:
+    """RSS-Spitze des Prozesses seit dem letzten reset_peak_rss (VmHWM) in MB, None ohne /proc."""
+    try:
+        with open('/proc/self/status') as f:
+            return int(re.search(r'VmHWM:\s+(\d+) kB', f.read()).group(1)) / 1e3
+    except (OSError, AttributeError):
+        return None
+
+
+def io_read_bytes() -> Optional[int]:
+    """Bisher vom Prozess gelesene Bytes (rchar aus /proc/self/io), None ohne /proc."""
+    try:
+        with open('/proc/self/io') as f:
+            return int(re.search(r'rchar:\s+(\d+)', f.read()).group(1))
+    except (OSError, AttributeError):
+        return None
+
+
+def max_rss_mb() -> Optional[float]:
+    """Maximale RSS des Prozesses in MB (None unter Windows; seit dem letzten reset_peak_rss)."""
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1e3  # Linux: KB
+
+
+class RunRecorder:
+    """
+    Misst Stufen eines Laufs und schreibt sie als JSONL-Bericht.
+
+    Ohne report_path wird nur im Speicher gesammelt (records), die Messung
+    selbst kostet pro Stufe nur ein paar Systemaufrufe.
+    """
+
+    def __init__(self, report_path: Optional[str] = None, profile_dir: Optional[str] = None,
+                 trace_memory: bool = False):
+        """
+        Args:
+            report_path: JSONL-Datei für den Bericht (wird angehängt), None = nicht schreiben
+            profile_dir: Ordner für cProfile-Dateien <stufe>.prof (nur äußere Stufen)
+            trace_memory: Speicher-Spitzen zusätzlich mit tracemalloc messen
+        """
+        self.report_path = Path(report_path) if report_path else None
+        self.profile_dir = Path(profile_dir) if profile_dir else None
+        self.trace_memory = trace_memory
+        self.run_id = uuid.uuid4().hex[:12]
+        self.records: List[Dict] = []
+        self._stack: List[Dict] = []
+        self._start_wall = time.perf_counter()
+        self._start_cpu = time.process_time()
+        self._started = datetime.now().isoformat(timespec='seconds')
+
+        if self.report_path is not None:
+            self.report_path.parent.mkdir(parents=True, exist_ok=True)
+        if self.profile_dir is not None:
+            self.profile_dir.mkdir(parents=True, exist_ok=True)
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @contextlib.contextmanager
+    def stage(self, name: str, cycles: Optional[int] = None, bytes_read: Optional[int] = None, **fields):
+        """
+        Misst den Block als Stufe name (innerhalb einer anderen Stufe: '<äußere>/<name>').
+
+        Der Block kann das gelieferte Dictionary ergänzen (z.B. record['cycles']).
+
+        Args:
+            name: Name der Stufe
+            cycles: Verarbeitete Zyklen (für cycles_per_s)
+            bytes_read: Größe der Eingabedateien in Bytes
+            **fields: Weitere Felder für den Bericht
+
+        Yields:
+            Dictionary des Eintrags
+        """
+        parent = self._stack[-1] if self._stack else None
+        record = {'type': 'stage', 'run_id': self.run_id,
+                  'stage': f"{parent['stage']}/{name}" if parent else name,
+                  'parent': parent['stage'] if parent else None,
+                  'started': datetime.now().isoformat(timespec='seconds'),
+                  'cycles': cycles, 'bytes_read': bytes_read, **fields}
+
+        if parent is not None:
+            # Bisherige Spitze der äußeren Stufe sichern, bevor sie zurückgesetzt wird
+            self._fold_peaks(parent, parent['_rss_reset'])
+        record['_peak_rss'] = None
+        record['_peak_traced'] = None
+        record['_rss_reset'] = rss_available = reset_peak_rss()
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+
+        profiler = None
+        if self.profile_dir is not None and parent is None:
+            profiler = cProfile.Profile()
+
+        self._stack.append(record)
+        io_start = io_read_bytes()
+        cpu_start = time.process_time()
+        wall_start = time.perf_counter()
+        if profiler is not None:
+            profiler.enable()
+        try:
+            yield record
+        finally:
+            if profiler is not None:
+                profiler.disable()
+            wall_s = time.perf_counter() - wall_start
+            cpu_s = time.process_time() - cpu_start
+            io_end = io_read_bytes()
+            self._stack.pop()
+
+            self._fold_peaks(record, rss_available)
+            del record['_rss_reset']
+            record['wall_s'] = wall_s
+            record['cpu_s'] = cpu_s
+            record['peak_rss_mb'] = record.pop('_peak_rss')
+            traced = record.pop('_peak_traced')
+            if self.trace_memory:
+                record['traced_peak_mb'] = traced
+            record['io_read_bytes'] = io_end - io_start if io_start is not None and io_end is not None else None
+            record['cycles_per_s'] = record['cycles'] / wall_s if record['cycles'] and wall_s > 0 else None
+
+            if parent is not None:
+                # Spitzen der inneren Stufe zählen auch für die äußere
+                for key, value in (('_peak_rss', record['peak_rss_mb']), ('_peak_traced', traced)):
+                    if value is not None:
+                        parent[key] = max(parent[key] or 0.0, value)
+            if profiler is not None:
+                profiler.dump_stats(self.profile_dir / f"{name}.prof")
+                record['profile'] = str(self.profile_dir / f"{name}.prof")
+            self._append(record)
+
+    def record(self, name: str, **fields):
+        """
+        Eintrag ohne Messung (z.B. eine Stufe, die aus dem Cache kommt).
+
+        Args:
+            name: Name der Stufe
+            **fields: Felder für den Bericht
+        """
+        self._append({'type': 'stage', 'run_id': self.run_id, 'stage': name, 'parent': None,
+                      'started': datetime.now().isoformat(timespec='seconds'), **fields})
+
+    def finish(self, **fields) -> Dict:
+        """
+        Schreibt die Summen des Laufs als letzte Zeile des Berichts.
+
+        Args:
+            **fields: Weitere Felder (z.B. die CLI-Argumente)
+
+        Returns:
+            Dictionary der Lauf-Zeile
+        """
+        # ru_maxrss wird mit VmHWM zurückgesetzt → Maximum über die Stufen nehmen
+        peaks = [r['peak_rss_mb'] for r in self.records if r.get('peak_rss_mb') is not None]
+        if max_rss_mb() is not None:
+            peaks.append(max_rss_mb())
+        summary = {
+            'type': 'run', 'run_id': self.run_id, 'started': self._started,
+            'wall_s': time.perf_counter() - self._start_wall,
+            'cpu_s': time.process_time() - self._start_cpu,
+            'max_rss_mb': max(peaks) if peaks else None,
+            'stages': [r['stage'] for r in self.records if r['parent'] is None],
+            **fields,
+        }
+        self._append(summary)
+        if self.report_path is not None:
+            print(f"✓ Laufbericht gespeichert: {self.report_path} (Lauf {self.run_id})")
+        if self.profile_dir is not None:
+            print(f"✓ Profile gespeichert: {self.profile_dir}/<stufe>.prof")
+        return summary
+
+    def _fold_peaks(self, record: Dict, rss: bool):
+        """Übernimmt die aktuellen Spitzen in record (RSS nur, wenn sie zurückgesetzt werden konnte)."""
+        rss = peak_rss_mb() if rss else None
+        if rss is not None:
+            record['_peak_rss'] = max(record['_peak_rss'] or 0.0, rss)
+        if self.trace_memory:
+            traced = tracemalloc.get_traced_memory()[1] / 1e6
+            record['_peak_traced'] = max(record['_peak_traced'] or 0.0, traced)
+
+    def _append(self, record: Dict):
+        """Sammelt einen Eintrag und hängt ihn an den Bericht an."""
+        self.records.append(record)
+        if self.report_path is not None:
+            with open(self.report_path, 'a') as f:
+                f.write(json.dumps(record) + "\n")
@@ -0,0 +1,254 @@
+"""
+Hydraulic Systems - Mutual Information
+======================================
+MI-Ranking der Features für alle fünf Zielvariablen
+
+KONZEPT:
+mutual_info_classif schätzt MI pro Feature mit Nachbarschaften (KNN-Schätzer
+nach Ross 2014): pro Klasse der Abstand zum k-ten Nachbarn, dann die Anzahl
+aller Punkte innerhalb dieses Radius. Dafür baut sklearn für jedes Feature
+und jede Zielvariable neue KD-Bäume. Bei fünf Zielvariablen ist das fünfmal
+dieselbe Vorarbeit. Deshalb:
+
+- Skalieren + Rauschen (wie sklearn, gleicher random_state) nur EINMAL
+- Jedes Feature ist 1-D → einmal sortieren (argsort), danach sind alle
+  Nachbarschaften Index-Rechnungen auf der sortierten Spalte:
+  - k-ter Nachbar innerhalb einer Klasse: unter den k linken/rechten Nachbarn
+  - Punkte im Radius: binäre Suche auf der sortierten Spalte
+- Zielvariablen (und Bootstrap-Wiederholungen) parallel auf mehreren Kernen
+
+Die Abstände werden exakt wie im KD-Baum gerechnet (|x_i - x_j|), sehr
+kleine Klassen (dort sucht sklearn brute-force) direkt mit NearestNeighbors
+→ gleiche Werte wie mutual_info_classif(X, y, random_state=42).
+
+Stabilität (optional): Subsampling-Bootstrap ohne Zurücklegen (Duplikate
+würden den Nachbarschafts-Schätzer verzerren). Die Sortierung wird
+wiederverwendet (Teilmenge einer sortierten Spalte bleibt sortiert) und jede
+Wiederholung rechnet nur auf einem Teil der Zyklen.
+
+Nutzung:
+    from mutual_information import mutual_information_table
+    mi_df = mutual_information_table(df, feature_cols, TARGET_COLUMNS, n_jobs=0)
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from scipy.special import digamma
+from sklearn.neighbors import NearestNeighbors
+from sklearn.preprocessing import scale
+from typing import List, Optional, Tuple
+
+
+def prepare_features(X: np.ndarray, random_state: int = 42) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Skaliert die Features und addiert winziges Rauschen (wie mutual_info_classif).
+
+    Args:
+        X: Feature-Matrix Zyklen × Features (ohne NaN)
+        random_state: Seed für das Rauschen (42 wie in compute_mutual_information)
+
+    Returns:
+        Tuple aus (vorbereitete Matrix, Sortier-Indizes pro Feature-Spalte)
+    """
+    X = np.array(X, dtype=np.float64)
+    X = scale(X, with_mean=False, copy=False)
+
+    # Rauschen gegen identische Werte (Kraskov et al.), gleiche Zufallszahlen wie sklearn
+    rng = np.random.RandomState(random_state)
+    means = np.maximum(1, np.mean(np.abs(X), axis=0))
+    X += 1e-10 * means * rng.standard_normal(size=X.shape)
+
+    return X, np.argsort(X, axis=0, kind='stable')
+
+
+def _kth_neighbor_distance(values: np.ndarray, k: int) -> np.ndarray:
+    """
+    Abstand jedes Punkts zu seinem k-ten Nachbarn (ohne sich selbst), 1-D sortiert.
+
+    Args:
+        values: sortierte Werte einer Klasse
+        k: Nachbar-Nummer (k < len(values))
+
+    Returns:
+        Array mit einem Abstand pro Punkt (in sortierter Reihenfolge)
+    """
+    n = len(values)
+    candidates = np.full((n, 2 * k), np.inf)
+    for offset in range(1, k + 1):
+        candidates[offset:, offset - 1] = np.abs(values[:-offset] - values[offset:])   # links
+        candidates[:-offset, k + offset - 1] = np.abs(values[offset:] - values[:-offset])  # rechts
+    return np.partition(candidates, k - 1, axis=1)[:, k - 1]
+
+
+def _count_within(values: np.ndarray, radius: np.ndarray) -> np.ndarray:
+    """
+    Anzahl Punkte mit |x_j - x_i| <= radius_i (inkl. i selbst), 1-D sortiert.
+
+    Binäre Suche mit exakt derselben Abstandsrechnung wie der KD-Baum
+    (statt x_i ± radius, das beim Runden an der Grenze kippen könnte).
+
+    Args:
+        values: sortierte Werte
+        radius: Radius pro Punkt (gleiche Reihenfolge)
+
+    Returns:
+        Array mit einer Anzahl pro Punkt
+    """
+    n = len(values)
+    position = np.arange(n)
+
+    # Erster Index rechts, der außerhalb liegt
+    lo, hi = position.copy(), np.full(n, n)
+    while np.any(active := lo < hi):
+        mid = (lo + hi) // 2
+        inside = values[np.minimum(mid, n - 1)] - values <= radius
+        lo = np.where(active & inside, mid + 1, lo)
+        hi = np.where(active & ~inside, mid, hi)
+    right = lo
+
+    # Erster Index links, der noch innerhalb liegt
+    lo, hi = np.zeros(n, dtype=position.dtype), position.copy()
+    while np.any(active := lo < hi):
+        mid = (lo + hi) // 2
+        inside = values - values[mid] <= radius
+        hi = np.where(active & inside, mid, hi)
+        lo = np.where(active & ~inside, mid + 1, lo)
+    left = lo
+
+    return right - left
+
+
+def mi_classif(X: np.ndarray, order: np.ndarray, y: np.ndarray, n_neighbors: int = 3,
+               rows: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    MI jedes Features mit einer kategorischen Zielvariable (KNN-Schätzer, wie sklearn).
+
+    Args:
+        X: vorbereitete Matrix aus prepare_features
+        order: Sortier-Indizes aus prepare_features
+        y: Zielvariable (eine Klasse pro Zyklus)
+        n_neighbors: Anzahl Nachbarn (3 wie mutual_info_classif)
+        rows: Optional Boolesche Maske der verwendeten Zyklen (Subsampling)
+
+    Returns:
+        Array mit einem MI-Wert (in nat) pro Feature
+    """
+    y = np.asarray(y)
+    if rows is None:
+        rows = np.ones(len(y), dtype=bool)
+
+    labels, inverse, counts = np.unique(y[rows], return_inverse=True, return_counts=True)
+    label_counts = np.zeros(len(y))
+    label_counts[rows] = counts[inverse]
+    k_per_label = np.minimum(n_neighbors, counts - 1)
+
+    # Zyklen mit einzigartiger Klasse zählen nicht (wie sklearn)
+    used = rows & (label_counts > 1)
+    n_used = used.sum()
+    k_all = np.empty(len(y))
+    k_all[rows] = k_per_label[inverse]
+
+    # Klassen-Teile unabhängig vom Feature
+    base = digamma(n_used) + np.mean(digamma(k_all[used])) - np.mean(digamma(label_counts[used]))
+
+    mi = np.empty(X.shape[1])
+    radius = np.empty(len(y))
+    m_all = np.empty(len(y), dtype=np.intp)
+
+    for j in range(X.shape[1]):
+        x = X[:, j]
+        sorted_idx = order[:, j][used[order[:, j]]]
+        sorted_y = y[sorted_idx]
+
+        for label, k in zip(labels, k_per_label):
+            if k < 1:
+                continue
+            idx = sorted_idx[sorted_y == label]
+            if k >= len(idx) // 2:
+                # Sehr kleine Klasse: sklearn sucht hier brute-force (andere Rundung) → gleicher Weg
+                distance = NearestNeighbors(n_neighbors=k).fit(x[idx, None]).kneighbors()[0][:, -1]
+            else:
+                distance = _kth_neighbor_distance(x[idx], k)
+            radius[idx] = np.nextafter(distance, 0)
+
+        m_all[sorted_idx] = _count_within(x[sorted_idx], radius[sorted_idx])
+        mi[j] = max(0, base - np.mean(digamma(m_all[used])))
+
+    return mi
+
+
+# Vorbereitete Matrix + Sortierung, einmal pro Worker-Prozess übergeben
+_shared = {}
+
+
+def _init_worker(X: np.ndarray, order: np.ndarray):
+    """Initialisiert einen Worker mit der gemeinsamen Matrix (nicht pro Aufgabe pickeln)."""
+    _shared['X'], _shared['order'] = X, order
+
+
+def _mi_task(args) -> np.ndarray:
+    """Worker: MI aller Features für eine Zielvariable (ggf. auf einer Teilmenge)."""
+    y, n_neighbors, rows = args
+    return mi_classif(_shared['X'], _shared['order'], y, n_neighbors, rows)
+
+
+def mutual_information_table(df: pd.DataFrame, feature_cols: List[str], target_cols: List[str],
+                             n_jobs: int = 1, n_bootstrap: int = 0, subsample: float = 0.5,
+                             confidence: float = 0.9, random_state: int = 42) -> pd.DataFrame:
+    """
+    MI-Ranking aller Features für mehrere Zielvariablen (eine Spalte pro Ziel).
+
+    Args:
+        df: Kompletter DataFrame (Features + Zielvariablen)
+        feature_cols: Liste der Feature-Spalten
+        target_cols: Zielspalten (kategorisch)
+        n_jobs: Anzahl Prozesse (1 = seriell, 0 = alle CPU-Kerne)
+        n_bootstrap: Anzahl Subsampling-Wiederholungen (0 = keine Intervalle)
+        subsample: Anteil der Zyklen pro Wiederholung
+        confidence: Breite des Stabilitätsintervalls (0.9 → 5 %/95 %-Quantil)
+        random_state: Seed für Rauschen und Subsampling
+
+    Returns:
+        DataFrame mit Spalte feature, einer MI-Spalte pro Ziel und ggf.
+        <ziel>_lo / <ziel>_hi (Stabilitätsintervall)
+    """
+    X, order = prepare_features(df[feature_cols].fillna(0).to_numpy(), random_state)
+    targets = {col: df[col].to_numpy() for col in target_cols}
+
+    # Aufgaben: volle Daten pro Ziel, dann alle Subsampling-Wiederholungen
+    rng = np.random.default_rng(random_state)
+    n_rows = len(df)
+    n_sub = max(int(round(subsample * n_rows)), 2)
+    masks = []
+    for _ in range(n_bootstrap):
+        rows = np.zeros(n_rows, dtype=bool)
+        rows[rng.choice(n_rows, size=n_sub, replace=False)] = True
+        masks.append(rows)
+
+    tasks = [(targets[col], 3, rows) for rows in [None] + masks for col in target_cols]
+
+    if n_jobs <= 0:
+        n_jobs = os.cpu_count() or 1
+    n_jobs = min(n_jobs, len(tasks))
+    if n_jobs > 1:
+        with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_worker,
+                                 initargs=(X, order)) as executor:
+            results = list(executor.map(_mi_task, tasks))
+    else:
+        _init_worker(X, order)
+        results = [_mi_task(task) for task in tasks]
+
+    mi_df = pd.DataFrame({'feature': feature_cols})
+    for i, col in enumerate(target_cols):
+        mi_df[col] = results[i]
+
+    if n_bootstrap > 0:
+        tail = (1 - confidence) / 2
+        for i, col in enumerate(target_cols):
+            samples = np.array(results[len(target_cols) + i::len(target_cols)])
+            mi_df[f'{col}_lo'] = np.quantile(samples, tail, axis=0)
+            mi_df[f'{col}_hi'] = np.quantile(samples, 1 - tail, axis=0)
+
+    return mi_df
@@ -0,0 +1,195 @@
+"""
+Hydraulic Systems - Online-Features
+===================================
+Feature-Vektor für einzelne, frisch aufgezeichnete Zyklen
+
+KONZEPT:
+Für die Live-Überwachung kommt ein Zyklus nach dem anderen (17 Arrays mit
+60, 600 oder 6000 Werten). Der Umweg über DataFrames und Dateien ist dafür
+zu langsam. Deshalb:
+
+- Eingabe: Dictionary {sensor: NumPy-Array}
+- Gleiche Feature-Definition wie extract_features (compute_sensor_features)
+- Ausgabe: vorallokierter Vektor mit 136 Werten, Reihenfolge exakt wie die
+  Feature-Spalten in features_complete.csv
+- transform_batch: dasselbe für kleine Stapel von Zyklen (Micro-Batches),
+  mit np.sort statt np.partition (bei 60–6000 Werten pro Zeile schneller
+  als 8 Partitionsstellen), ein einzelner Zyklus geht an transform
+
+Nutzung:
+    from online_features import OnlineFeatureExtractor
+    extractor = OnlineFeatureExtractor()
+    vector = extractor.transform({'ps1': ps1_array, ..., 'vs1': vs1_array})
+"""
+
+import numpy as np
+from typing import Dict, List, Optional
+
+from prep_corrected import (CYCLE_SECONDS, FEATURE_STATS, SAMPLING_RATES, SENSOR_NAMES,
+                            _lerp, _quantile_plan, compute_sensor_features)
+
+
+def cycle_features(values: np.ndarray, out: np.ndarray) -> np.ndarray:
+    """
+    Die 8 Features eines einzelnen Zyklus (1-D), ohne Block-Overhead.
+
+    Gleiche Rechenwege wie compute_sensor_features (bitgleiche Ergebnisse),
+    aber für einen einzelnen Zyklus ist np.sort schneller als np.partition
+    mit 8 Positionen, und die Block-Verwaltung entfällt.
+
+    Args:
+        values: 1-D Array der Messwerte
+        out: Ergebnis-Vektor (Länge 8, Reihenfolge wie FEATURE_STATS)
+
+    Returns:
+        out
+    """
+    n = values.shape[0]
+    srt = np.sort(values)
+    if n < 2 or np.isnan(srt[-1]):
+        # NaN (Typos) oder Sonderfälle → allgemeiner Kernel
+        return compute_sensor_features(values.reshape(1, -1), out=out.reshape(1, -1))
+
+    _, lower, upper, weight = _quantile_plan(n)
+    mean = values.sum() / n
+    dev = values - mean
+
+    out[0] = mean
+    out[1] = np.sqrt(np.einsum('i,i->', dev, dev) / (n - 1))
+    out[2] = srt[0]
+    out[3] = srt[-1]
+    for j, col in enumerate((5, 4, 6)):  # q25, median, q75
+        out[col] = _lerp(srt[lower[j]], srt[upper[j]], weight[j])
+    out[7] = out[3] - out[2]
+    return out
+
+
+def batch_features(values: np.ndarray, out: np.ndarray) -> np.ndarray:
+    """
+    Die 8 Features eines Stapels von Zyklen (2-D), Gegenstück zu cycle_features.
+
+    Gleiche Rechenwege wie compute_sensor_features (bitgleiche Ergebnisse),
+    aber mit np.sort pro Zeile statt np.partition mit 8 Positionen.
+
+    Args:
+        values: Array Zyklen × Messwerte (float64)
+        out: Ergebnis-Array (Zyklen × 8, Reihenfolge wie FEATURE_STATS)
+
+    Returns:
+        out
+    """
+    values = np.ascontiguousarray(values)  # Summationsreihenfolge wie compute_sensor_features
+    n = values.shape[1]
+    srt = np.sort(values, axis=1)
+    if n < 2 or np.isnan(srt[:, -1]).any():
+        # NaN (Typos) oder Sonderfälle → allgemeiner Kernel
+        return compute_sensor_features(values, out=out)
+
+    _, lower, upper, weight = _quantile_plan(n)
+    mean = values.sum(axis=1, dtype=np.float64) / n
+    dev = values - mean[:, None]
+
+    out[:, 0] = mean
+    out[:, 1] = np.sqrt(np.einsum('ij,ij->i', dev, dev) / (n - 1))
+    out[:, 2] = srt[:, 0]
+    out[:, 3] = srt[:, -1]
+    for j, col in enumerate((5, 4, 6)):  # q25, median, q75
+        out[:, col] = _lerp(srt[:, lower[j]], srt[:, upper[j]], weight[j])
+    out[:, 7] = out[:, 3] - out[:, 2]
+    return out
+
+
+class OnlineFeatureExtractor:
+    """
+    Berechnet den Feature-Vektor einzelner Zyklen (oder kleiner Stapel) im Prozess.
+
+    Das Ergebnis von transform() ist ein interner, wiederverwendeter Puffer:
+    Er wird beim nächsten Aufruf überschrieben (bei Bedarf .copy()).
+    """
+
+    def __init__(self, sensor_names: List[str] = SENSOR_NAMES, check_lengths: bool = True):
+        """
+        Args:
+            sensor_names: Sensoren (Reihenfolge wird wie in features_complete.csv sortiert)
+            check_lengths: Prüfen, ob jedes Array 60 s bei seiner Sampling-Rate umfasst
+        """
+        # Gleiche Reihenfolge wie find_sensor_files (sortierte Dateinamen)
+        self.sensor_names = sorted(sensor_names, key=str.upper)
+        self.feature_names = [f'{sensor}_{stat}' for sensor in self.sensor_names
+                              for stat in FEATURE_STATS]
+        self.check_lengths = check_lengths
+        self._n_stats = len(FEATURE_STATS)
+        self._vector = np.empty(len(self.feature_names), dtype=np.float64)
+
+    @property
+    def n_features(self) -> int:
+        """Anzahl Features (8 pro Sensor)."""
+        return len(self.feature_names)
+
+    def transform(self, cycle: Dict[str, np.ndarray], out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Feature-Vektor eines einzelnen Zyklus.
+
+        Args:
+            cycle: {sensor: 1-D Array der Messwerte dieses Zyklus}
+            out: Optional eigener Ergebnis-Vektor (Länge n_features)
+
+        Returns:
+            Vektor mit n_features Werten (Reihenfolge wie feature_names)
+        """
+        if out is None:
+            out = self._vector
+        rows = out.reshape(len(self.sensor_names), self._n_stats)
+
+        for i, sensor in enumerate(self.sensor_names):
+            cycle_features(self._sensor_values(cycle, sensor, ndim=1), rows[i])
+
+        return out
+
+    def transform_batch(self, cycles: Dict[str, np.ndarray], out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Feature-Matrix für einen Stapel von Zyklen.
+
+        Args:
+            cycles: {sensor: 2-D Array Zyklen × Messwerte}
+            out: Optional eigenes Ergebnis-Array (Zyklen × n_features)
+
+        Returns:
+            Array Zyklen × n_features
+        """
+        batch = {sensor: self._sensor_values(cycles, sensor, ndim=2) for sensor in self.sensor_names}
+        n_cycles = len(batch[self.sensor_names[0]])
+        for sensor, values in batch.items():
+            if len(values) != n_cycles:
+                raise ValueError(f"{sensor}: {len(values)} Zyklen statt {n_cycles}")
+        if out is None:
+            out = np.empty((n_cycles, self.n_features), dtype=np.float64)
+
+        if n_cycles == 1:
+            # Einzelner Zyklus: 1-D-Kernel ohne Block-Overhead
+            rows = out[0].reshape(len(self.sensor_names), self._n_stats)
+            for i, sensor in enumerate(self.sensor_names):
+                cycle_features(batch[sensor][0], rows[i])
+            return out
+
+        for i, sensor in enumerate(self.sensor_names):
+            # Spaltenblock des Sensors direkt beschreiben (View, keine Kopie)
+            batch_features(batch[sensor], out[:, i * self._n_stats:(i + 1) * self._n_stats])
+
+        return out
+
+    def _sensor_values(self, cycle: Dict[str, np.ndarray], sensor: str, ndim: int) -> np.ndarray:
+        """Holt und prüft das Array eines Sensors."""
+        try:
+            values = np.asarray(cycle[sensor], dtype=np.float64)
+        except KeyError:
+            raise KeyError(f"Sensor '{sensor}' fehlt im Zyklus") from None
+
+        if values.ndim != ndim:
+            raise ValueError(f"{sensor}: {ndim}-D Array erwartet, bekommen: {values.shape}")
+
+        expected = CYCLE_SECONDS * SAMPLING_RATES.get(sensor, 0)
+        if self.check_lengths and expected and values.shape[-1] != expected:
+            raise ValueError(f"{sensor}: {expected} Werte pro Zyklus erwartet "
+                             f"({SAMPLING_RATES[sensor]} Hz), bekommen: {values.shape[-1]}")
+        return values
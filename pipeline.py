@@ -0,0 +1,541 @@
+"""
+Hydraulic Systems - Pipeline
+============================
+main() als Abhängigkeitsgraph benannter Stufen mit Cache pro Stufe
+
+KONZEPT:
+Bisher läuft bei jedem Aufruf alles von vorn: Wer nur die Plots anpasst,
+parst trotzdem 43.680 Spalten neu. Deshalb ist die Aufbereitung in Stufen
+zerlegt (load → merge → statistics/correlation/... → export), und jedes
+Ergebnis wird auf der Platte gespeichert. Der Schlüssel einer Stufe ist ein
+Hash (BLAKE2b) aus:
+
+- Parametern der Stufe (z.B. --precision, --windows)
+- Quellcode der Stufen-Funktion und aller Module, von denen die Stufe
+  abhängt (geänderter Plot-Code → Plots veraltet, geänderter Parser → load)
+- Inhalts-Hashes der Ergebnisse ihrer Abhängigkeiten
+- bei Quell-Stufen: Inhalts-Hashes der Eingabedateien (data/, profile.txt)
+
+Gleicher Schlüssel + unveränderte Ausgabedateien in out/ → Stufe wird
+übersprungen. Weil die Abhängigkeiten über den Inhalt ihres Ergebnisses
+eingehen (nicht über ihren Schlüssel), bleiben nachfolgende Stufen gültig,
+wenn eine Stufe neu läuft, aber dasselbe Ergebnis liefert.
+
+Dateien pro Stufe im Cache-Ordner:
+- <stufe>.pkl: Ergebnis (Pickle)
+- <stufe>.json: Schlüssel, Ergebnis-Hash, Hashes der Ausgabedateien, Laufzeit
+
+Jede Stufe läuft unter einem RunRecorder (instrumentation.py): Zeit, CPU,
+Speicher-Spitze und Durchsatz landen mit --report als JSONL-Bericht.
+
+Nutzung:
+    python prep_corrected.py --only correlation       # nur Korrelation (+ nötige Vorstufen)
+    python prep_corrected.py --force                  # alles neu
+    python prep_corrected.py --force visualizations   # nur die Plots neu
+"""
+
+import hashlib
+import importlib.util
+import inspect
+import json
+import os
+import pickle
+import time
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+import prep_corrected as prep
+from exporters import TABLE_FORMATS, export_table
+from instrumentation import RunRecorder
+from plots import PlotRenderer
+from sensor_cache import file_hash
+
+
+DEFAULT_CACHE_DIR = "cache/stages"
+
+# Ausgabedateien in out/, die zu den Stufen gehören
+STAGE_OUTPUTS = {
+    'statistics': ["out/feature_stats.csv"],
+    'correlation': ["out/correlation.csv", "out/correlation_heatmap.png"],
+    'mutual_information': ["out/mutual_information.csv"],
+    'selection': ["out/features_selected.csv", "out/feature_redundancy.csv"],
+    'visualizations': ["out/feature_distributions.png", "out/boxplots_by_target.png"],
+    'export': ["out/features_complete.csv"],
+}
+
+
+def content_hash(obj) -> str:
+    """
+    Inhalts-Hash eines Stufen-Ergebnisses (DataFrame, Array oder Python-Objekt).
+
+    Args:
+        obj: Ergebnis einer Stufe
+
+    Returns:
+        Hex-String des Hashes (BLAKE2b)
+    """
+    h = hashlib.blake2b(digest_size=16)
+    if isinstance(obj, pd.DataFrame):
+        h.update(pickle.dumps((list(obj.columns), [str(t) for t in obj.dtypes], obj.shape)))
+        h.update(pd.util.hash_pandas_object(obj, index=True).to_numpy().tobytes())
+    elif isinstance(obj, np.ndarray):
+        h.update(pickle.dumps((obj.dtype.str, obj.shape)))
+        h.update(np.ascontiguousarray(obj).tobytes())
+    else:
+        h.update(pickle.dumps(obj, protocol=4))
+    return h.hexdigest()
+
+
+def _source_hash(funcs: Iterable[Callable]) -> str:
+    """Hash des Quellcodes der Stufen-Funktionen (Fallback: qualifizierter Name)."""
+    h = hashlib.blake2b(digest_size=16)
+    for func in funcs:
+        try:
+            h.update(inspect.getsource(func).encode())
+        except (OSError, TypeError):
+            h.update(f"{func.__module__}.{func.__qualname__}".encode())
+    return h.hexdigest()
+
+
+def _module_hash(modules: Iterable[str]) -> str:
+    """
+    Hash der Quelldateien ganzer Module (ohne sie zu importieren).
+
+    Module werden nicht importiert, damit z.B. sklearn hinter
+    mutual_information.py erst in der Stufe selbst geladen wird.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    for module in modules:
+        h.update(module.encode())
+        spec = importlib.util.find_spec(module)
+        if spec is not None and spec.origin and os.path.isfile(spec.origin):
+            with open(spec.origin, 'rb') as f:
+                h.update(f.read())
+    return h.hexdigest()
+
+
+class Stage:
+    """
+    Eine benannte Stufe der Aufbereitung.
+
+    Die Funktion bekommt die Ergebnisse der Abhängigkeiten als Keyword-Argumente
+    (Name der Abhängigkeit = Argumentname) plus params und options.
+    """
+
+    def __init__(self, name: str, func: Callable, deps: List[str] = (), params: Optional[Dict] = None,
+                 options: Optional[Dict] = None, inputs: Callable[[], List[Path]] = None,
+                 outputs: List[str] = (), code: List[Callable] = (), modules: List[str] = ()):
+        """
+        Args:
+            name: Name der Stufe (für --only/--force)
+            func: Funktion func(**deps, **params, **options) → Ergebnis
+            deps: Namen der Stufen, deren Ergebnisse gebraucht werden
+            params: Parameter, die das Ergebnis beeinflussen (gehen in den Schlüssel ein)
+            options: Parameter ohne Einfluss auf das Ergebnis (z.B. Anzahl Prozesse)
+            inputs: Optional Funktion, die die Eingabedateien der Stufe liefert
+            outputs: Dateien, die die Stufe schreibt (müssen für einen Treffer unverändert sein)
+            code: Weitere Funktionen, deren Quellcode in den Schlüssel eingeht
+            modules: Module (Namen), deren kompletter Quellcode in den Schlüssel eingeht
+        """
+        self.name = name
+        self.func = func
+        self.deps = list(deps)
+        self.params = params or {}
+        self.options = options or {}
+        self.inputs = inputs
+        self.outputs = list(outputs)
+        self.code = [func] + list(code)
+        self.modules = list(modules)
+
+
+class Pipeline:
+    """
+    Führt Stufen in Abhängigkeitsreihenfolge aus und speichert jedes Ergebnis.
+
+    Ergebnisse gültiger Stufen werden erst geladen, wenn eine nachfolgende
+    Stufe neu laufen muss oder der Aufrufer sie anfordert.
+
+    Mit background (z.B. PlotRenderer) dürfen Stufen Ausgabedateien im
+    Hintergrund schreiben: Deren Metadaten (mit den Datei-Hashes) werden erst
+    nach background.wait() am Ende von run() gespeichert.
+
+    Jede gerechnete Stufe wird vom recorder gemessen, Treffer im Cache
+    erscheinen im Bericht mit cached=True.
+    """
+
+    def __init__(self, stages: List[Stage], cache_dir: str = DEFAULT_CACHE_DIR, background=None,
+                 recorder: Optional[RunRecorder] = None):
+        """
+        Args:
+            stages: Stufen (Reihenfolge beliebig, Abhängigkeiten über Namen)
+            cache_dir: Ordner für Ergebnisse und Metadaten
+            background: Optional Objekt mit wait() für Hintergrund-Aufträge der Stufen
+            recorder: Optional RunRecorder (instrumentation.py), None = nur im Speicher messen
+        """
+        self.stages = {stage.name: stage for stage in stages}
+        self.cache_dir = Path(cache_dir)
+        self.background = background
+        self.recorder = recorder or RunRecorder()
+        self._results = {}
+        self._hashes = {}
+        self._deferred = []
+
+    def order(self, targets: Optional[List[str]] = None) -> List[str]:
+        """
+        Topologische Reihenfolge der Stufen, die für die Ziel-Stufen nötig sind.
+
+        Args:
+            targets: Ziel-Stufen (None = alle)
+
+        Returns:
+            Liste von Stufen-Namen (Abhängigkeiten zuerst)
+        """
+        targets = list(self.stages) if targets is None else targets
+        order, visiting = [], set()
+
+        def visit(name: str):
+            if name in order:
+                return
+            if name not in self.stages:
+                raise ValueError(f"Unbekannte Stufe: '{name}' (verfügbar: {', '.join(self.stages)})")
+            if name in visiting:
+                raise ValueError(f"Zyklische Abhängigkeit bei Stufe '{name}'")
+            visiting.add(name)
+            for dep in self.stages[name].deps:
+                visit(dep)
+            visiting.discard(name)
+            order.append(name)
+
+        for name in targets:
+            visit(name)
+        return order
+
+    def run(self, targets: Optional[List[str]] = None, force: Iterable[str] = ()) -> Dict[str, object]:
+        """
+        Führt die Ziel-Stufen aus (und alle nötigen Vorstufen, soweit veraltet).
+
+        Args:
+            targets: Ziel-Stufen (None = alle)
+            force: Stufen, die ohne Cache neu laufen ('all' = alle)
+
+        Returns:
+            Dictionary {Stufe: Ergebnis} für die Ziel-Stufen
+        """
+        order = self.order(targets)
+        force = set(order) if 'all' in force else set(force)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        n_cached = 0
+        for name in order:
+            stage = self.stages[name]
+            key = self._stage_key(stage)
+            meta = self._read_meta(name)
+
+            if name not in force and self._is_valid(stage, meta, key):
+                self._hashes[name] = meta['result_hash']
+                self._results.pop(name, None)
+                n_cached += 1
+                self.recorder.record(name, cached=True, saved_s=meta['seconds'])
+                print(f"[Pipeline] '{name}' aus Cache ({meta['seconds']:.2f} s gespart)")
+                continue
+
+            inputs = stage.inputs() if stage.inputs else []
+            with self.recorder.stage(name, cached=False,
+                                     bytes_read=sum(Path(p).stat().st_size for p in inputs) or None) as record:
+                kwargs = {dep: self.result(dep) for dep in stage.deps}
+                result = stage.func(**kwargs, **stage.params, **stage.options)
+                record['cycles'] = _n_cycles(kwargs, result)
+            seconds = record['wall_s']
+
+            self._results[name] = result
+            self._hashes[name] = content_hash(result)
+            self._save(stage, key, result, seconds)
+
+        # Ausgabedateien aus dem Hintergrund erst nach dem Warten hashen
+        if self.background is not None:
+            with self.recorder.stage('background_wait'):
+                self.background.wait()
+        for args in self._deferred:
+            self._write_stage_meta(*args)
+        self._deferred = []
+
+        print(f"[Pipeline] {len(order) - n_cached} Stufen gerechnet, {n_cached} aus Cache\n")
+        return {name: self.result(name) for name in (targets or order)}
+
+    def result(self, name: str):
+        """
+        Ergebnis einer bereits aufgelösten Stufe (lädt es bei Bedarf aus dem Cache).
+
+        Args:
+            name: Name der Stufe
+
+        Returns:
+            Ergebnis der Stufe
+        """
+        if name not in self._results:
+            with open(self.cache_dir / f"{name}.pkl", 'rb') as f:
+                self._results[name] = pickle.load(f)
+        return self._results[name]
+
+    def _stage_key(self, stage: Stage) -> str:
+        """Schlüssel aus Name, Parametern, Quellcode, Abhängigkeiten und Eingabedateien."""
+        parts = {
+            'name': stage.name,
+            'params': {k: repr(v) for k, v in sorted(stage.params.items())},
+            'code': _source_hash(stage.code),
+            'modules': _module_hash(stage.modules),
+            'deps': {dep: self._hashes[dep] for dep in stage.deps},
+            'inputs': self._input_hashes(stage.inputs() if stage.inputs else []),
+        }
+        return hashlib.blake2b(json.dumps(parts, sort_keys=True).encode(), digest_size=16).hexdigest()
+
+    def _input_hashes(self, paths: List[Path]) -> Dict[str, str]:
+        """
+        Inhalts-Hashes der Eingabedateien.
+
+        Wie im SensorCache: Größe + mtime unverändert → gespeicherter Hash
+        (kein erneutes Lesen von Gigabytes), sonst neu hashen.
+        """
+        index_path = self.cache_dir / "inputs.json"
+        index = self._read_json(index_path) or {}
+        hashes, changed = {}, False
+
+        for path in paths:
+            path = Path(path)
+            stat = path.stat()
+            source = str(path.resolve())
+            entry = index.get(source)
+            if entry is None or entry['size'] != stat.st_size or entry['mtime_ns'] != stat.st_mtime_ns:
+                entry = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'hash': file_hash(path)}
+                index[source] = entry
+                changed = True
+            hashes[source] = entry['hash']
+
+        if changed:
+            self._write_json(index_path, index)
+        return hashes
+
+    def _is_valid(self, stage: Stage, meta: Optional[Dict], key: str) -> bool:
+        """Treffer: gleicher Schlüssel, Ergebnis vorhanden, Ausgabedateien unverändert."""
+        if meta is None or meta.get('key') != key:
+            return False
+        if not (self.cache_dir / f"{stage.name}.pkl").exists():
+            return False
+        for path, expected in meta.get('outputs', {}).items():
+            if not Path(path).exists() or file_hash(path) != expected:
+                return False
+        return True
+
+    def _save(self, stage: Stage, key: str, result, seconds: float):
+        """Speichert Ergebnis und Metadaten atomar (erst .tmp, dann umbenennen)."""
+        pkl_path = self.cache_dir / f"{stage.name}.pkl"
+        tmp_path = pkl_path.with_suffix('.pkl.tmp')
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, pkl_path)
+
+        if stage.outputs and self.background is not None:
+            self._deferred.append((stage, key, seconds))
+        else:
+            self._write_stage_meta(stage, key, seconds)
+
+    def _write_stage_meta(self, stage: Stage, key: str, seconds: float):
+        """Metadaten einer Stufe (fehlende Ausgabedateien → None, Stufe beim nächsten Lauf neu)."""
+        self._write_json(self.cache_dir / f"{stage.name}.json", {
+            'key': key,
+            'result_hash': self._hashes[stage.name],
+            'outputs': {path: file_hash(path) if Path(path).exists() else None for path in stage.outputs},
+            'seconds': seconds,
+            'created': time.time(),
+        })
+
+    def _read_meta(self, name: str) -> Optional[Dict]:
+        """Metadaten einer Stufe (None falls fehlend oder kaputt)."""
+        return self._read_json(self.cache_dir / f"{name}.json")
+
+    @staticmethod
+    def _read_json(path: Path):
+        """Liest eine JSON-Datei (None falls fehlend oder kaputt)."""
+        try:
+            return json.loads(path.read_text())
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _write_json(path: Path, data: Dict):
+        """Schreibt eine JSON-Datei atomar."""
+        tmp_path = path.with_suffix('.json.tmp')
+        tmp_path.write_text(json.dumps(data, indent=2))
+        os.replace(tmp_path, path)
+
+
+def _n_cycles(deps: Dict[str, object], result) -> Optional[int]:
+    """Zyklen einer Stufe: Zeilen der ersten Tabelle unter den Abhängigkeiten, sonst des Ergebnisses."""
+    for value in list(deps.values()) + [result]:
+        if isinstance(value, pd.DataFrame):
+            return len(value)
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Stufen der Datenaufbereitung (main in prep_corrected.py)
+# ---------------------------------------------------------------------------
+
+def _feature_cols(merge: pd.DataFrame) -> List[str]:
+    """Feature-Spalten des zusammengeführten Datensatzes."""
+    return [col for col in merge.columns if col not in prep.TARGET_COLUMNS]
+
+
+def _load(windows, spectral, precision, incremental, streaming, chunk_size, jobs, data_path, profile_path,
+          quantile_error=None, cache=False, recorder=None):
+    """Stufe load: Sensordaten laden und aggregieren (Features ohne Zielvariablen)."""
+    feature_options = {'n_windows': windows, 'spectral': bool(spectral),
+                       'spectral_dtype': spectral or 'float64', 'quantile_error': quantile_error}
+    if streaming:
+        # Streaming: Features + Targets blockweise direkt nach out/, die Feature-Blöcke
+        # kommen aus dem Speicher zurück (Rohdaten nie ganz geladen, CSV nicht neu gelesen)
+        df_complete = prep.stream_features_to_csv(data_path, profile_path, "out/features_complete.csv",
+                                                  chunk_size=chunk_size, feature_options=feature_options,
+                                                  dtype=precision)
+        return df_complete[_feature_cols(df_complete)]
+    if incremental:
+        # Nur neue Zyklen aggregieren, Rest aus dem Feature-Store
+        # Andere Optionen oder Präzision als beim letzten Lauf → der Store baut neu auf
+        from feature_store import FeatureStore
+        return FeatureStore("cache/feature_store", data_path, feature_options, dtype=precision).update()
+
+    # Mit --cache landen die geparsten Matrizen als .npy auf der Platte
+    sensor_cache = None
+    if cache:
+        from sensor_cache import SensorCache
+        sensor_cache = SensorCache("cache/sensors")
+    return prep.load_and_aggregate_sensors(data_path, cache=sensor_cache, n_jobs=jobs,
+                                           dtype=precision, recorder=recorder, **feature_options)
+
+
+def _targets(profile_path):
+    """Stufe targets: Zielvariablen aus profile.txt."""
+    return prep.load_targets(profile_path)
+
+
+def _merge(load, targets):
+    """Stufe merge: Features und Targets zusammenführen (nur Zyklen mit beidem)."""
+    print("[main] Führe Features und Targets zusammen...")
+    n_cycles = min(len(load), len(targets))
+    df_complete = pd.concat([load.iloc[:n_cycles].reset_index(drop=True),
+                             targets.iloc[:n_cycles].reset_index(drop=True)], axis=1)
+    print(f"  ✓ Kompletter Datensatz: {df_complete.shape}\n")
+    return df_complete
+
+
+def _statistics(merge, precision, quantile_error=None):
+    """Stufe statistics."""
+    return prep.compute_statistics(merge, _feature_cols(merge), dtype=precision, quantile_error=quantile_error)
+
+
+def _correlation(merge, precision, plots, renderer):
+    """Stufe correlation (Heatmap über den PlotRenderer)."""
+    return prep.compute_correlation(merge, _feature_cols(merge), dtype=precision, renderer=renderer)
+
+
+def _mutual_information(merge, mi_all, mi_bootstrap, jobs):
+    """Stufe mutual_information (ein Ziel oder alle Ziele mit --mi-all)."""
+    if mi_all:
+        return prep.compute_mutual_information_all(merge, _feature_cols(merge), prep.TARGET_COLUMNS,
+                                                   n_jobs=jobs, n_bootstrap=mi_bootstrap)
+    return prep.compute_mutual_information(merge, _feature_cols(merge), 'cooler_condition')
+
+
+def _selection(merge, correlation, mutual_information, prune_threshold):
+    """Stufe selection: redundante Features entfernen."""
+    return prep.compute_feature_selection(merge, correlation, mutual_information, threshold=prune_threshold)
+
+
+def _visualizations(merge, plots, renderer):
+    """Stufe visualizations (über den PlotRenderer)."""
+    prep.create_visualizations(merge, _feature_cols(merge), renderer=renderer)
+
+
+def _export_paths(formats: List[str], streaming: bool) -> Dict[str, str]:
+    """Zieldateien der Stufe export pro Format (CSV im Streaming-Modus schon geschrieben)."""
+    return {fmt: f"out/features_complete{TABLE_FORMATS[fmt].suffix}" for fmt in formats
+            if not (fmt == 'csv' and streaming)}
+
+
+def _export(merge, streaming, formats, compression):
+    """Stufe export: finaler Datensatz in allen gewählten Formaten (CSV immer unkomprimiert)."""
+    paths = _export_paths(formats, streaming)
+    if not paths:
+        return
+    print("[main] Exportiere finalen Datensatz...")
+    for fmt, path in paths.items():
+        export_table(merge, path, fmt, compression=None if fmt == 'csv' else compression)
+        print(f"  ✓ Gespeichert: {path} ({merge.shape})")
+    print()
+
+
+def build_pipeline(args, renderer=None, data_path: str = "data", profile_path: str = "docs/profile.txt",
+                   cache_dir: str = DEFAULT_CACHE_DIR, recorder: Optional[RunRecorder] = None) -> Pipeline:
+    """
+    Baut den Stufen-Graphen der Datenaufbereitung aus den CLI-Optionen.
+
+    Args:
+        args: Namespace aus prep_corrected.parse_args
+        renderer: Optional PlotRenderer (plots.py), None = Plots sofort rendern
+        data_path: Ordner mit den Sensor-Dateien
+        profile_path: Pfad zu profile.txt
+        cache_dir: Ordner für die Stufen-Ergebnisse
+        recorder: Optional RunRecorder (misst auch jeden Sensor in load)
+
+    Returns:
+        Pipeline mit den Stufen load, targets, merge, statistics, correlation,
+        mutual_information, selection, visualizations, export
+    """
+    # Streaming schreibt features_complete.csv schon beim Laden
+    load_outputs = STAGE_OUTPUTS['export'] if args.chunk_size else []
+    export_outputs = list(_export_paths(args.export_format, bool(args.chunk_size)).values())
+
+    renderer = renderer or PlotRenderer('inline')
+    plot_outputs = STAGE_OUTPUTS['visualizations'] if renderer.enabled else []
+    corr_outputs = STAGE_OUTPUTS['correlation'][:None if renderer.enabled else 1]  # ohne Heatmap
+    plot_options = {'renderer': renderer}
+
+    stages = [
+        # --jobs, --chunk-size und --cache ändern das Ergebnis nicht (identisch zum seriellen Lauf)
+        Stage('load', _load,
+              params={'windows': args.windows, 'spectral': args.spectral, 'precision': args.precision,
+                      'incremental': args.incremental, 'streaming': bool(args.chunk_size),
+                      'quantile_error': args.quantile_error},
+              options={'chunk_size': args.chunk_size, 'jobs': args.jobs, 'cache': args.cache,
+                       'data_path': data_path, 'profile_path': profile_path, 'recorder': recorder},
+              inputs=lambda: prep.find_sensor_files(data_path) + ([Path(profile_path)] if args.chunk_size else []),
+              outputs=load_outputs, code=[_feature_cols],
+              modules=['prep_corrected', 'quantile_sketch', 'sensor_cache', 'feature_store']),
+        Stage('targets', _targets, options={'profile_path': profile_path},
+              inputs=lambda: [Path(profile_path)], modules=['prep_corrected']),
+        Stage('merge', _merge, deps=['load', 'targets']),
+        Stage('statistics', _statistics, deps=['merge'],
+              params={'precision': args.precision, 'quantile_error': args.quantile_error},
+              outputs=STAGE_OUTPUTS['statistics'], code=[_feature_cols],
+              modules=['prep_corrected', 'quantile_sketch']),
+        Stage('correlation', _correlation, deps=['merge'],
+              params={'precision': args.precision, 'plots': renderer.enabled}, options=plot_options,
+              outputs=corr_outputs, code=[_feature_cols], modules=['prep_corrected', 'correlation', 'plots']),
+        Stage('mutual_information', _mutual_information, deps=['merge'],
+              params={'mi_all': args.mi_all, 'mi_bootstrap': args.mi_bootstrap}, options={'jobs': args.jobs},
+              outputs=STAGE_OUTPUTS['mutual_information'], code=[_feature_cols],
+              modules=['prep_corrected', 'mutual_information']),
+        Stage('selection', _selection, deps=['merge', 'correlation', 'mutual_information'],
+              params={'prune_threshold': args.prune_threshold}, outputs=STAGE_OUTPUTS['selection'],
+              modules=['prep_corrected']),
+        Stage('visualizations', _visualizations, deps=['merge'], params={'plots': renderer.enabled},
+              options=plot_options, outputs=plot_outputs, code=[_feature_cols],
+              modules=['prep_corrected', 'plots']),
+        Stage('export', _export, deps=['merge'],
+              params={'streaming': bool(args.chunk_size), 'formats': args.export_format,
+                      'compression': args.compression},
+              outputs=export_outputs, modules=['exporters']),
+    ]
+    return Pipeline(stages, cache_dir, background=renderer, recorder=recorder)
@@ -0,0 +1,204 @@
+"""
+Hydraulic Systems - Plots
+=========================
+Rendern der Abbildungen abseits des kritischen Pfads
+
+KONZEPT:
+Die Heatmap (20 × 18 Zoll) und die Mehrfach-Abbildungen bei 150 dpi zu
+rendern dauert länger als die CSV-Exporte dahinter. Deshalb werden Plots
+als Aufträge (kleine Daten + Zielpfad) an einen Hintergrund-Prozess mit
+Agg-Backend übergeben:
+
+- Die Pipeline rechnet weiter, während die Plots entstehen
+- Am Ende wartet wait() auf alle Aufträge (Fehler werden dort gemeldet)
+- Modus 'off' überspringt alle Plots (Produktions-/Batch-Läufe)
+- Modus 'inline' rendert sofort im eigenen Prozess (wie bisher, z.B. Notebook)
+
+matplotlib wird erst beim Rendern importiert (nicht beim Import dieses Moduls).
+
+Nutzung:
+    from plots import PlotRenderer, render_correlation_heatmap
+    with PlotRenderer('background') as renderer:
+        renderer.submit(render_correlation_heatmap, corr, "out/correlation_heatmap.png")
+        ...                                   # weiterrechnen
+        renderer.wait()
+"""
+
+from concurrent.futures import Future, ProcessPoolExecutor
+import pandas as pd
+from typing import Callable, List, Tuple
+
+
+PLOT_MODES = ['background', 'inline', 'off']
+
+
+def render_correlation_heatmap(corr: pd.DataFrame, path: str) -> str:
+    """
+    Korrelations-Heatmap der aggregierten Features.
+
+    Args:
+        corr: Korrelationsmatrix
+        path: Zielpfad (.png)
+
+    Returns:
+        path
+    """
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    plt.figure(figsize=(20, 18))
+    sns.heatmap(corr, cmap='coolwarm', center=0, square=True,
+                linewidths=0.1, cbar_kws={"shrink": 0.8})
+    plt.title('Korrelations-Heatmap (Aggregierte Features)', fontsize=16, pad=20)
+    plt.tight_layout()
+    plt.savefig(path, dpi=150, bbox_inches='tight')
+    plt.close()
+    return path
+
+
+def render_distributions(data: pd.DataFrame, path: str) -> str:
+    """
+    Histogramme von bis zu 16 Features (4 × 4 Raster).
+
+    Args:
+        data: DataFrame mit den zu zeichnenden Spalten
+        path: Zielpfad (.png)
+
+    Returns:
+        path
+    """
+    import matplotlib.pyplot as plt
+
+    fig, axes = plt.subplots(4, 4, figsize=(16, 12))
+    axes = axes.flatten()
+
+    for i, col in enumerate(data.columns[:16]):
+        axes[i].hist(data[col].dropna(), bins=50, edgecolor='black', alpha=0.7)
+        axes[i].set_title(col, fontsize=10)
+        axes[i].set_xlabel('Wert')
+        axes[i].set_ylabel('Häufigkeit')
+        axes[i].grid(alpha=0.3)
+
+    plt.tight_layout()
+    plt.savefig(path, dpi=150, bbox_inches='tight')
+    plt.close()
+    return path
+
+
+def render_boxplots(data: pd.DataFrame, features: List[str], by: str, path: str) -> str:
+    """
+    Boxplots von bis zu 4 Features, gruppiert nach einer Zielvariable (2 × 2 Raster).
+
+    Args:
+        data: DataFrame mit den Features und der Zielspalte
+        features: Zu zeichnende Features
+        by: Zielspalte für die Gruppierung (z.B. cooler_condition)
+        path: Zielpfad (.png)
+
+    Returns:
+        path
+    """
+    import matplotlib.pyplot as plt
+
+    fig, axes = plt.subplots(2, 2, figsize=(14, 10))
+    axes = axes.flatten()
+    label = by.replace('_', ' ').title()
+
+    for i, feat in enumerate(features[:4]):
+        data.boxplot(column=feat, by=by, ax=axes[i])
+        axes[i].set_title(f'{feat} by {label}')
+        axes[i].set_xlabel(label)
+        axes[i].set_ylabel(feat)
+
+    plt.suptitle('')
+    plt.tight_layout()
+    plt.savefig(path, dpi=150, bbox_inches='tight')
+    plt.close()
+    return path
+
+
+def _init_worker():
+    """Worker: Agg-Backend setzen, bevor pyplot geladen wird (kein Display nötig)."""
+    import matplotlib
+    matplotlib.use('Agg')
+
+
+class PlotRenderer:
+    """
+    Nimmt Plot-Aufträge entgegen und rendert sie je nach Modus.
+
+    - 'background': Prozess-Pool mit Agg-Backend, submit() kehrt sofort zurück
+    - 'inline': sofort im eigenen Prozess rendern
+    - 'off': Aufträge verwerfen
+    """
+
+    def __init__(self, mode: str = 'background', n_workers: int = 1):
+        """
+        Args:
+            mode: 'background', 'inline' oder 'off'
+            n_workers: Prozesse im Hintergrund-Pool
+        """
+        if mode not in PLOT_MODES:
+            raise ValueError(f"Unbekannter Plot-Modus: '{mode}' (erlaubt: {', '.join(PLOT_MODES)})")
+        self.mode = mode
+        self.n_workers = max(n_workers, 1)
+        self._executor = None
+        self._pending: List[Tuple[str, Future]] = []
+
+    @property
+    def enabled(self) -> bool:
+        """True, wenn Plots erzeugt werden (Modus nicht 'off')."""
+        return self.mode != 'off'
+
+    def submit(self, func: Callable, *args, label: str = "Plot"):
+        """
+        Übergibt einen Plot-Auftrag.
+
+        Args:
+            func: Render-Funktion (Modul-Ebene, damit sie an Worker gepickelt werden kann)
+            *args: Daten und Zielpfad für func
+            label: Beschreibung für die Konsolen-Ausgabe
+        """
+        if self.mode == 'off':
+            return
+        if self.mode == 'inline':
+            path = func(*args)
+            print(f"  ✓ {label} gespeichert: {path}")
+            return
+
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.n_workers, initializer=_init_worker)
+        self._pending.append((label, self._executor.submit(func, *args)))
+        print(f"  → {label}: Rendern im Hintergrund")
+
+    def wait(self) -> List[str]:
+        """
+        Wartet auf alle offenen Aufträge.
+
+        Returns:
+            Liste der geschriebenen Pfade (Fehler eines Auftrags werden weitergereicht)
+        """
+        if not self._pending:
+            return []
+
+        print(f"[PlotRenderer] Warte auf {len(self._pending)} Plots...")
+        paths = []
+        pending, self._pending = self._pending, []
+        for label, future in pending:
+            paths.append(future.result())
+            print(f"  ✓ {label} gespeichert: {paths[-1]}")
+        print()
+        return paths
+
+    def close(self):
+        """Beendet den Prozess-Pool (offene Aufträge laufen noch zu Ende)."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
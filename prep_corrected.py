@@ -19,14 +19,325 @@ Warum diese 8 Features?
 
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
+import io
+import os
+import sys
+import argparse
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from multiprocessing import resource_tracker, shared_memory
 from pathlib import Path
-from typing import Dict
-from sklearn.feature_selection import mutual_info_classif
+from typing import Dict, List, Optional, Tuple, Union
 
+from correlation import correlation_matrix
 
-def extract_features(df: pd.DataFrame, sensor_name: str) -> pd.DataFrame:
+# matplotlib, seaborn und sklearn werden erst in den Stufen importiert, die sie
+# brauchen (Plots, Mutual Information) → import prep_corrected und ein reiner
+# Feature-Lauf (--features-only) kommen ohne sie aus
+
+
+# Sensor-Namen: CE, CP, EPS1, FS1, FS2, PS1-6, SE, TS1-4, VS1 (Dateien data/<NAME>.txt)
+SENSOR_NAMES = ['ce', 'cp', 'eps1', 'fs1', 'fs2', 'ps1', 'ps2', 'ps3',
+                'ps4', 'ps5', 'ps6', 'se', 'ts1', 'ts2', 'ts3', 'ts4', 'vs1']
+
+# Sampling-Raten laut docs/description.txt (Hz), ein Zyklus dauert 60 s
+SAMPLING_RATES = {'ps1': 100, 'ps2': 100, 'ps3': 100, 'ps4': 100, 'ps5': 100, 'ps6': 100,
+                  'eps1': 100, 'fs1': 10, 'fs2': 10, 'ts1': 1, 'ts2': 1, 'ts3': 1, 'ts4': 1,
+                  'vs1': 1, 'ce': 1, 'cp': 1, 'se': 1}
+CYCLE_SECONDS = 60
+
+# Frequenzbänder (Hz) der Spektral-Features pro Sampling-Rate, bis Nyquist
+SPECTRAL_BANDS = {
+    100: [(0, 1), (1, 5), (5, 15), (15, 50)],
+    10: [(0, 0.5), (0.5, 1.5), (1.5, 3), (3, 5)],
+}
+
+# Zielvariablen in profile.txt (laut Dokumentation)
+TARGET_COLUMNS = ['cooler_condition', 'valve_condition', 'pump_leakage',
+                  'accumulator_pressure', 'stable_flag']
+
+# Zeilen pro Block beim Parsen: Ein Typo kostet nur diesen Block den langsamen Weg
+PARSE_BLOCK_ROWS = 256
+
+
+def read_sensor_file(file_path, dtype=np.float64) -> Tuple[np.ndarray, int]:
+    """
+    Liest eine Sensor-Datei (tab-getrennte Matrix) als float-Array ein.
+    
+    Warum nicht pd.read_csv(engine='python')?
+    - Der Python-Parser ist für 2205 × 6000 Werte (PS1-PS6, EPS1) sehr langsam
+    - np.loadtxt parst die Tab-Matrix in kompiliertem C-Code, um ein Vielfaches schneller
+    
+    Die Datei wird blockweise geparst (PARSE_BLOCK_ROWS Zyklen). Nur ein Block
+    mit Typo (z.B. '12.3x') läuft über pandas + pd.to_numeric(errors='coerce'),
+    genau wie bisher in extract_features → Typos werden NaN und gezählt.
+    
+    Args:
+        file_path: Pfad zur Sensor-Datei (z.B. data/PS1.txt)
+        dtype: Ziel-Datentyp des Arrays
+        
+    Returns:
+        Tuple aus (Array Zyklen × Zeitpunkte, Anzahl zu NaN konvertierter Werte)
+    """
+    with open(file_path, 'rb') as f:
+        lines = [line for line in f.read().splitlines() if line.strip()]
+    
+    return parse_sensor_lines(lines, dtype)
+
+
+def parse_sensor_lines(lines: list, dtype=np.float64) -> Tuple[np.ndarray, int]:
+    """
+    Parst Zeilen (bytes) einer Sensor-Datei blockweise in ein Array.
+    
+    Args:
+        lines: Liste von Zeilen (ohne Zeilenumbruch, keine Leerzeilen)
+        dtype: Ziel-Datentyp des Arrays
+        
+    Returns:
+        Tuple aus (Array Zyklen × Zeitpunkte, Anzahl zu NaN konvertierter Werte)
+    """
+    values = None
+    n_coerced = 0
+    
+    for start in range(0, len(lines), PARSE_BLOCK_ROWS):
+        block, block_coerced = _parse_lines(lines[start:start + PARSE_BLOCK_ROWS], dtype)
+        if values is None:
+            values = np.empty((len(lines), block.shape[1]), dtype=dtype)
+        values[start:start + block.shape[0]] = block
+        n_coerced += block_coerced
+    
+    if values is None:
+        values = np.empty((0, 0), dtype=dtype)
+    
+    return values, n_coerced
+
+
+def _parse_lines(lines: list, dtype=np.float64) -> Tuple[np.ndarray, int]:
+    """
+    Parst Zeilen (bytes) einer Sensor-Datei, Typos → NaN.
+    
+    Args:
+        lines: Liste von Zeilen (ohne Zeilenumbruch)
+        dtype: Ziel-Datentyp des Arrays
+        
+    Returns:
+        Tuple aus (Array, Anzahl zu NaN konvertierter Werte)
+    """
+    try:
+        # Schneller Weg: kompilierter Parser, schlägt bei Typos fehl
+        # Trennung an beliebigem Whitespace (wie sep='\s+') → Tab/Leerzeichen am Zeilenende stören nicht
+        return np.loadtxt(lines, dtype=dtype, ndmin=2), 0
+    except ValueError:
+        pass
+    
+    # Langsamer Weg nur für diesen Block: Text einlesen, Typos → NaN
+    df = pd.read_csv(io.BytesIO(b'\n'.join(lines)), sep=r'\s+', header=None,
+                     engine='c', low_memory=False)
+    return _coerce_numeric(df, dtype)
+
+
+def _coerce_numeric(df: pd.DataFrame, dtype=np.float64) -> Tuple[np.ndarray, int]:
+    """
+    Wandelt nicht-numerische Spalten in Zahlen um (Typos → NaN).
+    
+    Args:
+        df: Roh eingelesener DataFrame
+        dtype: Ziel-Datentyp des Arrays
+        
+    Returns:
+        Tuple aus (Array, Anzahl zu NaN konvertierter Werte)
+    """
+    n_coerced = 0
+    
+    for col in df.columns:
+        if pd.api.types.is_numeric_dtype(df[col]):
+            continue
+        original = df[col]
+        converted = pd.to_numeric(original, errors='coerce')
+        n_coerced += int((converted.isna() & original.notna()).sum())
+        df[col] = converted
+    
+    # C-Reihenfolge wie np.loadtxt (pandas liefert spaltenweise Speicherlayout)
+    return np.ascontiguousarray(df.to_numpy(dtype=dtype)), n_coerced
+
+
+def iter_sensor_blocks(file_path, chunk_size: int, dtype=np.float64):
+    """
+    Liest eine Sensor-Datei blockweise (chunk_size Zyklen pro Block).
+    
+    Streaming: Es liegt nie mehr als ein Block im Speicher, egal wie viele
+    Zyklen die Datei hat. Typos → NaN wie in read_sensor_file.
+    
+    Args:
+        file_path: Pfad zur Sensor-Datei
+        chunk_size: Zyklen (Zeilen) pro Block
+        dtype: Ziel-Datentyp der Blöcke
+        
+    Yields:
+        Tuple aus (Array chunk_size × Zeitpunkte, Anzahl Typos → NaN)
+    """
+    lines = []
+    with open(file_path, 'rb') as f:
+        for line in f:
+            line = line.rstrip(b'\r\n')
+            if not line.strip():
+                continue
+            lines.append(line)
+            if len(lines) == chunk_size:
+                yield _parse_lines(lines, dtype)
+                lines = []
+    
+    if lines:
+        yield _parse_lines(lines, dtype)
+
+
+# Reihenfolge der 8 Features pro Sensor (= Spaltenreihenfolge in features_complete.csv)
+FEATURE_STATS = ['mean', 'std', 'min', 'max', 'median', 'q25', 'q75', 'range']
+
+# Zyklen pro Block im Feature-Kernel (Kopie für np.partition bleibt klein)
+FEATURE_BLOCK_ROWS = 256
+
+
+def compute_sensor_features(values: np.ndarray, out: Optional[np.ndarray] = None,
+                            quantile_error: Optional[float] = None) -> np.ndarray:
+    """
+    Berechnet alle 8 Features einer Sensor-Matrix in einem Durchgang.
+    
+    Statt 7 einzelner pandas-Reduktionen (mean, std, min, max, median,
+    quantile 0.25/0.75 - median und quantile sortieren jeweils neu):
+    - Ein np.partition pro Block liefert min, q25, median, q75, max
+      (Ordnungsstatistiken, lineare Interpolation wie pandas/numpy)
+    - Ein Momenten-Durchgang liefert mean und std (ddof=1 wie pandas)
+    
+    Zyklen mit NaN (Typos) werden wie bei pandas ohne die NaN berechnet.
+    
+    float32-Eingaben (--precision float32): Summen für mean/std laufen in
+    float64, das Ergebnis hat den Datentyp der Eingabe.
+    
+    Mit quantile_error kommen median/q25/q75 aus einem zusammenführbaren
+    Sketch (quantile_sketch.py) statt aus np.partition. Garantiert ist der
+    Rang, nicht der Wert: Das Ergebnis liegt zwischen den exakten Quantilen
+    zu q - quantile_error und q + quantile_error (bewiesen, auch bei
+    Plateaus mit vielen gleichen Werten; Zyklen mit weniger als
+    1 / quantile_error + 1 Zeitpunkten auf ganze Ränge gerundet). min/max,
+    mean/std und range bleiben exakt. Speicher spart das nicht: Der Block
+    liegt wie beim exakten Weg ganz im Speicher, der Sketch macht die
+    Quantile nur zusammenführbar (sharded_features.py).
+    
+    Args:
+        values: Array Zyklen × Zeitpunkte
+        out: Optional vorallokiertes Ergebnis-Array (Zyklen × 8)
+        quantile_error: Näherungs-Quantile mit diesem Rangfehler (None = exakt)
+        
+    Returns:
+        Array Zyklen × 8 in der Reihenfolge von FEATURE_STATS
+    """
+    values = np.asarray(values)
+    n_rows, n_cols = values.shape
+    if out is None:
+        out = np.empty((n_rows, len(FEATURE_STATS)), dtype=_feature_dtype(values))
+    if n_rows == 0:
+        return out
+    if n_cols == 0:
+        out[:] = np.nan
+        return out
+    
+    if quantile_error is None:
+        kth, lower, upper, weight = _quantile_plan(n_cols)
+    
+    for start in range(0, n_rows, FEATURE_BLOCK_ROWS):
+        # Zeilenweise zusammenhängend → Summationsreihenfolge unabhängig vom Speicherlayout
+        block = np.ascontiguousarray(values[start:start + FEATURE_BLOCK_ROWS])
+        res = out[start:start + block.shape[0]]
+        
+        # Momente: mean und std (zweite Summe über Abweichungen, numerisch stabil)
+        mean = block.sum(axis=1, dtype=np.float64) / n_cols
+        dev = block - mean[:, None]
+        res[:, 0] = mean
+        res[:, 1] = np.sqrt(np.einsum('ij,ij->i', dev, dev) / (n_cols - 1)) if n_cols > 1 else np.nan
+        
+        if quantile_error is None:
+            # Ordnungsstatistiken: ein Partition-Durchgang für alle Quantile
+            part = np.partition(block, kth, axis=1)
+            res[:, 2] = part[:, 0]
+            res[:, 3] = part[:, -1]
+            for j, col in enumerate([5, 4, 6]):  # q25, median, q75
+                a = part[:, lower[j]].astype(np.float64)
+                b = part[:, upper[j]].astype(np.float64)
+                res[:, col] = _lerp(a, b, weight[j])
+        else:
+            from quantile_sketch import approximate_quantiles
+            res[:, 2] = block.min(axis=1)
+            res[:, 3] = block.max(axis=1)
+            res[:, [5, 4, 6]] = approximate_quantiles(block, [0.25, 0.5, 0.75], quantile_error)
+        
+        # Zyklen mit NaN: nan-Funktionen nur für diese Zeilen
+        nan_rows = np.isnan(res[:, 0])
+        if nan_rows.any():
+            res[nan_rows] = _nan_features(block[nan_rows])
+    
+    out[:, 7] = out[:, 3] - out[:, 2]
+    return out
+
+
+@lru_cache(maxsize=None)
+def _quantile_plan(n_cols: int) -> Tuple[np.ndarray, Tuple[int, ...], Tuple[int, ...], Tuple[float, ...]]:
+    """
+    Positionen der Ordnungsstatistiken für q25, median, q75 (pro Breite nur einmal).
+    
+    Args:
+        n_cols: Zeitpunkte pro Zyklus
+        
+    Returns:
+        Tuple aus (kth für np.partition, untere/obere Positionen, Gewichte)
+    """
+    positions = np.array([0.25, 0.5, 0.75]) * (n_cols - 1)
+    lower = np.floor(positions).astype(int)
+    upper = np.minimum(lower + 1, n_cols - 1)
+    weight = positions - lower
+    kth = np.unique(np.concatenate([[0, n_cols - 1], lower, upper]))
+    return kth, tuple(lower.tolist()), tuple(upper.tolist()), tuple(weight.tolist())
+
+
+def _feature_dtype(values: np.ndarray) -> np.dtype:
+    """Datentyp der Features: float32 bleibt float32, alles andere → float64."""
+    return values.dtype if values.dtype == np.float32 else np.dtype(np.float64)
+
+
+def _lerp(a: np.ndarray, b: np.ndarray, t: float) -> np.ndarray:
+    """Lineare Interpolation zwischen a und b (gleiche Formel wie np.quantile)."""
+    if t >= 0.5:
+        return b - (b - a) * (1 - t)
+    return a + (b - a) * t
+
+
+def _nan_features(block: np.ndarray) -> np.ndarray:
+    """
+    Die 8 Features für Zyklen mit NaN (NaN werden ignoriert, wie bei pandas).
+    
+    Args:
+        block: Array Zyklen × Zeitpunkte (nur Zyklen mit NaN)
+        
+    Returns:
+        Array Zyklen × 8 (Spalte range wird vom Aufrufer gesetzt)
+    """
+    res = np.full((block.shape[0], len(FEATURE_STATS)), np.nan)
+    
+    with warnings.catch_warnings():
+        # Zyklen ganz ohne gültige Werte → NaN (wie pandas, ohne Warnung)
+        warnings.simplefilter('ignore', RuntimeWarning)
+        res[:, 0] = np.nanmean(block, axis=1, dtype=np.float64)
+        res[:, 1] = np.nanstd(block, axis=1, ddof=1, dtype=np.float64)
+        res[:, 2] = np.nanmin(block, axis=1)
+        res[:, 3] = np.nanmax(block, axis=1)
+        res[:, [5, 4, 6]] = np.nanquantile(block, [0.25, 0.5, 0.75], axis=1).T
+    
+    return res
+
+
+def extract_features(df: Union[pd.DataFrame, np.ndarray], sensor_name: str,
+                     n_windows: int = 1, dtype=None, quantile_error: Optional[float] = None) -> pd.DataFrame:
     """
     Extrahiert 8 aggregierte Features aus Zeitreihen-DataFrame.
     
@@ -40,68 +351,443 @@ def extract_features(df: pd.DataFrame, sensor_name: str) -> pd.DataFrame:
     - Extrema: min, max (Ausschläge)
     - Verteilung: q25, q75 (Quartile)
     
+    Berechnet werden sie mit compute_sensor_features (ein Durchgang statt
+    einzelner pandas-Reduktionen, Ergebnis in ein vorallokiertes Array).
+    
+    Zeitfenster (n_windows > 1):
+    Ein 60-s-Zyklus hat verschiedene Lastphasen, die Gesamt-Statistik
+    verwischt sie. Dann wird jeder Zyklus zusätzlich in n_windows gleich
+    lange Fenster geteilt (z.B. 6 × 10 s) und die 8 Features pro Fenster
+    berechnet → Spalten {sensor}_w1_mean, ..., {sensor}_w6_range.
+    Die Fenster sind Views (reshape) auf die Rohdaten, keine Kopien.
+    
     Args:
-        df: DataFrame mit Zyklen (Zeilen) × Zeitpunkten (Spalten)
+        df: DataFrame oder Array mit Zyklen (Zeilen) × Zeitpunkten (Spalten)
         sensor_name: Name des Sensors (z.B. 'ts1', 'ps2')
+        n_windows: Anzahl gleich langer Zeitfenster pro Zyklus (1 = keine)
+        dtype: Datentyp für Rohdaten und Features (None = float64 bzw. wie
+               das Array; np.float32 halbiert den Speicher)
+        quantile_error: median/q25/q75 aus dem Quantil-Sketch mit diesem
+                        Rangfehler (z.B. 0.01), None = exakt
     
     Returns:
-        DataFrame mit 8 Features pro Zyklus
+        DataFrame mit 8 Features pro Zyklus (+ 8 pro Fenster)
     """
-    features = pd.DataFrame()
+    index = None
     
-    # Konvertiere zu numerisch (bereinigt automatisch Typos → NaN)
-    df_numeric = df.apply(pd.to_numeric, errors='coerce')
+    if isinstance(df, pd.DataFrame):
+        index = df.index
+        # Konvertiere zu numerisch (bereinigt automatisch Typos → NaN)
+        if not all(pd.api.types.is_numeric_dtype(dtype) for dtype in df.dtypes):
+            df = df.apply(pd.to_numeric, errors='coerce')
+        values = df.to_numpy(dtype=dtype or np.float64)
+    else:
+        values = np.asarray(df, dtype=dtype)
     
     # Aggregationen über Zeitachse (axis=1 = über Spalten)
-    features[f'{sensor_name}_mean'] = df_numeric.mean(axis=1)
-    features[f'{sensor_name}_std'] = df_numeric.std(axis=1)
-    features[f'{sensor_name}_min'] = df_numeric.min(axis=1)
-    features[f'{sensor_name}_max'] = df_numeric.max(axis=1)
-    features[f'{sensor_name}_median'] = df_numeric.median(axis=1)
-    features[f'{sensor_name}_q25'] = df_numeric.quantile(0.25, axis=1)
-    features[f'{sensor_name}_q75'] = df_numeric.quantile(0.75, axis=1)
-    features[f'{sensor_name}_range'] = features[f'{sensor_name}_max'] - features[f'{sensor_name}_min']
+    features = compute_sensor_features(values, quantile_error=quantile_error)
+    columns = [f'{sensor_name}_{stat}' for stat in FEATURE_STATS]
+    
+    if n_windows > 1:
+        window_features = compute_window_features(values, n_windows, quantile_error)
+        features = np.concatenate([features, window_features.reshape(len(values), -1)], axis=1)
+        columns += [f'{sensor_name}_w{k + 1}_{stat}' for k in range(n_windows) for stat in FEATURE_STATS]
+    
+    return pd.DataFrame(features, index=index, copy=False, columns=columns)
+
+
+def compute_window_features(values: np.ndarray, n_windows: int,
+                            quantile_error: Optional[float] = None) -> np.ndarray:
+    """
+    Die 8 Features für jedes von n_windows gleich langen Zeitfenstern pro Zyklus.
+    
+    values.reshape(Zyklen, Fenster, Breite) teilt nur die Zeitachse auf und
+    ist daher immer ein View (keine Kopie). Pro Fenster rechnet der Kernel
+    auf einem gestrideten 2-D-View → Speicher wächst nicht mit n_windows.
+    
+    Funktioniert für alle Sampling-Raten (1/10/100 Hz → 60/600/6000 Werte),
+    solange die Werte pro Zyklus durch n_windows teilbar sind.
+    
+    Args:
+        values: Array Zyklen × Zeitpunkte
+        n_windows: Anzahl Fenster pro Zyklus
+        quantile_error: Näherungs-Quantile (siehe compute_sensor_features)
+        
+    Returns:
+        Array Zyklen × Fenster × 8 (Reihenfolge FEATURE_STATS)
+    """
+    n_rows, n_cols = values.shape
+    if n_cols % n_windows != 0:
+        raise ValueError(f"{n_cols} Zeitpunkte pro Zyklus lassen sich nicht in "
+                         f"{n_windows} gleich lange Fenster teilen")
+    
+    windows = values.reshape(n_rows, n_windows, n_cols // n_windows)
+    out = np.empty((n_rows, n_windows, len(FEATURE_STATS)), dtype=_feature_dtype(values))
+    
+    for k in range(n_windows):
+        compute_sensor_features(windows[:, k, :], out=out[:, k, :], quantile_error=quantile_error)
+    
+    return out
+
+
+def extract_spectral_features(values: np.ndarray, sensor_name: str, sampling_rate: int,
+                              dtype=np.float64) -> pd.DataFrame:
+    """
+    Extrahiert Frequenz-Features (FFT) aus einer Sensor-Matrix.
+    
+    Warum? Die 8 Statistiken ignorieren, WIE schnell ein Signal schwankt.
+    Genau das trennt z.B. Ventil-Verzögerung von Pumpen-Leckage.
+    
+    Pro Zyklus (eine reelle FFT über alle Zyklen eines Blocks auf einmal):
+    - band_<von>_<bis>hz: Leistung im Frequenzband (SPECTRAL_BANDS), einseitiges
+      Spektrum → Summe über alle Bänder = Varianz des Zyklus (Parseval)
+    - peak_hz: dominante Frequenz (ohne Gleichanteil)
+    - centroid_hz: spektraler Schwerpunkt Σ f·|X|² / Σ |X|²
+    
+    Der Mittelwert (Gleichanteil) wird vorher abgezogen, NaN (Typos) → 0.
+    
+    Args:
+        values: Array Zyklen × Zeitpunkte
+        sensor_name: Name des Sensors (z.B. 'ps1')
+        sampling_rate: Sampling-Rate in Hz (siehe SAMPLING_RATES)
+        dtype: Rechengenauigkeit der FFT (np.float32 halbiert den Speicher)
+        
+    Returns:
+        DataFrame mit den Spektral-Features pro Zyklus
+    """
+    n_rows, n_cols = values.shape
+    bands = SPECTRAL_BANDS[sampling_rate]
+    freqs = np.fft.rfftfreq(n_cols, d=1.0 / sampling_rate)
+    
+    # Band-Grenzen als Indizes ins Spektrum (für np.add.reduceat)
+    edges = np.searchsorted(freqs, [lo for lo, _ in bands] + [bands[-1][1]], side='left')
+    edges[-1] = len(freqs)
+    
+    # Einseitiges Leistungsspektrum: Bins außer Gleichanteil/Nyquist doppelt zählen
+    scale = np.full(len(freqs), 2.0 / n_cols ** 2)
+    scale[0] = 1.0 / n_cols ** 2
+    if n_cols % 2 == 0:
+        scale[-1] = 1.0 / n_cols ** 2
+    
+    columns = ([f'{sensor_name}_band_{lo:g}_{hi:g}hz' for lo, hi in bands] +
+               [f'{sensor_name}_peak_hz', f'{sensor_name}_centroid_hz'])
+    out = np.empty((n_rows, len(columns)), dtype=_feature_dtype(values))
+    
+    for start in range(0, n_rows, FEATURE_BLOCK_ROWS):
+        block = np.array(values[start:start + FEATURE_BLOCK_ROWS], dtype=dtype)
+        res = out[start:start + block.shape[0]]
+        
+        # Gleichanteil entfernen, Typos (NaN) neutral als 0 behandeln
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            block -= np.nanmean(block, axis=1, keepdims=True)
+        np.nan_to_num(block, copy=False)
+        
+        spectrum = np.fft.rfft(block, axis=1)
+        power = spectrum.real ** 2 + spectrum.imag ** 2
+        power *= scale.astype(power.dtype)
+        
+        res[:, :len(bands)] = np.add.reduceat(power, edges[:-1], axis=1, dtype=np.float64)
+        res[:, len(bands)] = freqs[1 + np.argmax(power[:, 1:], axis=1)] if n_cols > 2 else np.nan
+        total = power.sum(axis=1, dtype=np.float64)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            res[:, len(bands) + 1] = (power @ freqs.astype(power.dtype)) / total
+    
+    return pd.DataFrame(out, columns=columns, copy=False)
+
+
+def sensor_features(values: np.ndarray, sensor_name: str, n_windows: int = 1,
+                    spectral: bool = False, spectral_dtype=np.float64,
+                    quantile_error: Optional[float] = None) -> pd.DataFrame:
+    """
+    Alle Features eines Sensors: die 8 Statistiken plus optionale Zusatz-Blöcke.
+    
+    Args:
+        values: Array Zyklen × Zeitpunkte
+        sensor_name: Name des Sensors (z.B. 'ps1')
+        n_windows: Zusätzlich 8 Features pro Zeitfenster (siehe extract_features)
+        spectral: Spektral-Features anhängen (nur 10/100-Hz-Sensoren)
+        spectral_dtype: Rechengenauigkeit der FFT (np.float32 oder np.float64)
+        quantile_error: Näherungs-Quantile (siehe extract_features), None = exakt
+        
+    Returns:
+        DataFrame mit allen Features dieses Sensors
+    """
+    features = extract_features(values, sensor_name, n_windows=n_windows, quantile_error=quantile_error)
+    
+    rate = SAMPLING_RATES.get(sensor_name)
+    if spectral and rate in SPECTRAL_BANDS:
+        spectral_features = extract_spectral_features(values, sensor_name, rate, dtype=spectral_dtype)
+        features = pd.concat([features, spectral_features.set_axis(features.index)], axis=1)
     
     return features
 
 
-def load_and_aggregate_sensors(data_path: str = "data") -> pd.DataFrame:
+def find_sensor_files(data_path: str = "data") -> list:
     """
-    Lädt alle Sensor-Dateien und extrahiert aggregierte Features.
+    Findet die vorhandenen Sensor-Dateien (feste, sortierte Reihenfolge).
     
     Args:
         data_path: Pfad zum Datenordner
         
     Returns:
-        DataFrame mit aggregierten Features
+        Liste der Pfade (z.B. data/CE.txt, data/CP.txt, ...)
     """
     data_dir = Path(data_path)
-    all_features = []
-    
-    print(f"[load_and_aggregate_sensors] Lade und aggregiere Sensordaten aus '{data_path}'...\n")
     
     # Nur echte Sensor-Dateien laden (keine Dokumentation)
-    # Sensor-Namen: CE, CP, EPS1, FS1, FS2, PS1-6, SE, TS1-4, VS1
-    sensor_names = ['ce', 'cp', 'eps1', 'fs1', 'fs2', 'ps1', 'ps2', 'ps3', 
-                    'ps4', 'ps5', 'ps6', 'se', 'ts1', 'ts2', 'ts3', 'ts4', 'vs1']
-    
-    sensor_files = [data_dir / f"{name.upper()}.txt" for name in sensor_names]
+    sensor_files = [data_dir / f"{name.upper()}.txt" for name in SENSOR_NAMES]
     sensor_files = [f for f in sensor_files if f.exists()]
-    sensor_files = sorted(sensor_files)
+    return sorted(sensor_files)
+
+
+def process_sensor_file(file_path, cache=None, feature_options: Optional[Dict] = None,
+                        dtype=np.float64) -> Tuple[pd.DataFrame, Tuple[int, int], int]:
+    """
+    Lädt eine Sensor-Datei und extrahiert ihre Features.
     
-    for file_path in sensor_files:
-        sensor_name = file_path.stem.lower()
+    Args:
+        file_path: Pfad zur Sensor-Datei
+        cache: Optional SensorCache (sensor_cache.py)
+        feature_options: Zusatz-Optionen für sensor_features (z.B. spectral=True)
+        dtype: Datentyp der Rohdaten und Features (np.float32 halbiert den Speicher)
         
-        print(f"  Verarbeite {sensor_name}...", end=' ')
+    Returns:
+        Tuple aus (Features, Form der Rohdaten, Anzahl Typos → NaN)
+    """
+    file_path = Path(file_path)
+    sensor_name = file_path.stem.lower()
+    
+    # Lade Zeitreihen-Daten (C-Parser bzw. Cache, Typos → NaN)
+    if cache is not None:
+        values, n_coerced = cache.load(file_path, dtype=dtype)
+    else:
+        values, n_coerced = read_sensor_file(file_path, dtype=dtype)
+    
+    # Extrahiere Features
+    features = sensor_features(values, sensor_name, **(feature_options or {}))
+    
+    return features, values.shape, n_coerced
+
+
+def _process_sensor_file_shared(file_path, cache=None, feature_options: Optional[Dict] = None,
+                                dtype=np.float64) -> Tuple[str, Tuple[int, int], str, list, Tuple[int, int], int]:
+    """
+    Worker für den parallelen Modus: Features landen im Shared Memory.
+    
+    Statt das Ergebnis zu pickeln, schreibt der Worker das Feature-Array in
+    einen Shared-Memory-Block. Der Hauptprozess kopiert es heraus und gibt
+    den Block frei (unlink).
+    
+    Args:
+        file_path: Pfad zur Sensor-Datei
+        cache: Optional SensorCache (sensor_cache.py)
+        feature_options: Zusatz-Optionen für sensor_features
+        dtype: Datentyp der Rohdaten und Features
+        
+    Returns:
+        Tuple aus (Name des Shared-Memory-Blocks, Form und Datentyp der
+        Features, Spaltennamen, Form der Rohdaten, Anzahl Typos → NaN)
+    """
+    features, raw_shape, n_coerced = process_sensor_file(file_path, cache, feature_options, dtype)
+    values = features.to_numpy()
+    
+    shm = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+    np.ndarray(values.shape, dtype=values.dtype, buffer=shm.buf)[:] = values
+    shm.close()
+    
+    return shm.name, values.shape, values.dtype.name, list(features.columns), raw_shape, n_coerced
+
+
+def _collect_shared(result) -> Tuple[pd.DataFrame, Tuple[int, int], int]:
+    """
+    Holt das Ergebnis eines Workers aus dem Shared Memory und gibt den Block frei.
+    
+    Args:
+        result: Rückgabe von _process_sensor_file_shared
         
-        # Lade Zeitreihen-Daten
-        df = pd.read_csv(file_path, sep=r'\s+', header=None, engine='python')
+    Returns:
+        Tuple aus (Features, Form der Rohdaten, Anzahl Typos → NaN)
+    """
+    shm_name, shape, dtype, columns, raw_shape, n_coerced = result
+    
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        values = np.ndarray(shape, dtype=dtype, buffer=shm.buf).copy()
+    finally:
+        shm.close()
+        shm.unlink()
+    
+    return pd.DataFrame(values, columns=columns, copy=False), raw_shape, n_coerced
+
+
+def iter_feature_blocks(data_path: str = "data", chunk_size: int = 256,
+                        feature_options: Optional[Dict] = None, dtype=np.float64):
+    """
+    Streaming-Modus: Features aller Sensoren blockweise (chunk_size Zyklen).
+    
+    Alle Sensor-Dateien werden im Gleichschritt gelesen. Pro Block entsteht
+    ein DataFrame mit allen Feature-Spalten für diese Zyklen. Die 8 Features
+    sind zeilenlokal → Ergebnis exakt wie beim Einlesen der ganzen Datei.
+    Spitzen-Speicher: ein Block pro Sensor statt der kompletten Matrizen.
+    
+    Haben die Dateien unterschiedlich viele Zyklen, endet der Strom mit der
+    kürzesten Datei (wie merge_tables in archive_prep.py).
+    
+    Args:
+        data_path: Pfad zum Datenordner
+        chunk_size: Zyklen pro Block
+        feature_options: Zusatz-Optionen für sensor_features (z.B. spectral=True)
+        dtype: Datentyp der Rohdaten-Blöcke und Features
+        
+    Yields:
+        DataFrame Block-Zyklen × Features (Index = Zyklus-Nummer)
+    """
+    sensor_files = find_sensor_files(data_path)
+    readers = [iter_sensor_blocks(f, chunk_size, dtype) for f in sensor_files]
+    start = 0
+    
+    for blocks in zip(*readers):
+        n_rows = min(block.shape[0] for block, _ in blocks)
+        index = pd.RangeIndex(start, start + n_rows)
+        
+        block_features = [sensor_features(block[:n_rows], f.stem.lower(),
+                                          **(feature_options or {})).set_axis(index)
+                          for f, (block, _) in zip(sensor_files, blocks)]
+        
+        yield pd.concat(block_features, axis=1)
+        start += n_rows
+
+
+def stream_features_to_csv(data_path: str = "data", profile_path: str = "docs/profile.txt",
+                           output_path: str = "out/features_complete.csv",
+                           chunk_size: int = 256, feature_options: Optional[Dict] = None,
+                           dtype=np.float64) -> pd.DataFrame:
+    """
+    Schreibt den kompletten Datensatz (Features + Zielvariablen) blockweise als CSV.
+    
+    Gleiche Datei wie df_complete.to_csv(..., index=False) im normalen Modus.
+    Begrenzt wird nur der Speicher für die Rohdaten (ein Block pro Sensor):
+    Die fertigen Feature-Blöcke (Zyklen × Features, klein) werden gesammelt
+    und zurückgegeben, damit Statistik und Korrelation die CSV nicht wieder
+    einlesen müssen.
+    
+    Args:
+        data_path: Pfad zum Datenordner
+        profile_path: Pfad zu profile.txt
+        output_path: Ziel-CSV
+        chunk_size: Zyklen pro Block
+        feature_options: Zusatz-Optionen für sensor_features (z.B. spectral=True)
+        dtype: Datentyp der Rohdaten-Blöcke und Features
         
-        # Extrahiere Features
-        features = extract_features(df, sensor_name)
-        all_features.append(features)
+    Returns:
+        DataFrame mit dem kompletten Datensatz (Inhalt der CSV, Datentyp dtype)
+    """
+    print(f"[stream_features_to_csv] Streaming in Blöcken à {chunk_size} Zyklen → '{output_path}'...")
+    
+    targets = pd.read_csv(profile_path, sep='\t', header=None, names=TARGET_COLUMNS,
+                          chunksize=chunk_size)
+    n_written = 0
+    blocks = []
+    
+    with open(output_path, 'w', newline='') as f:
+        for features, target_block in zip(iter_feature_blocks(data_path, chunk_size, feature_options, dtype), targets):
+            n_rows = min(len(features), len(target_block))
+            block = pd.concat([features.iloc[:n_rows].reset_index(drop=True),
+                               target_block.iloc[:n_rows].reset_index(drop=True)], axis=1)
+            block.to_csv(f, index=False, header=(n_written == 0))
+            blocks.append(block)
+            n_written += n_rows
+    
+    print(f"  ✓ {n_written} Zyklen geschrieben\n")
+    return pd.concat(blocks, ignore_index=True) if blocks else pd.DataFrame()
+
+
+def load_and_aggregate_sensors(data_path: str = "data", cache=None, n_jobs: int = 1,
+                               chunk_size: Optional[int] = None, n_windows: int = 1,
+                               spectral: bool = False, spectral_dtype=np.float64,
+                               dtype=np.float64, quantile_error: Optional[float] = None,
+                               recorder=None) -> pd.DataFrame:
+    """
+    Lädt alle Sensor-Dateien und extrahiert aggregierte Features.
+    
+    Args:
+        data_path: Pfad zum Datenordner
+        cache: Optional SensorCache (sensor_cache.py) → geparste Matrizen
+               werden als .npy gespeichert und beim nächsten Lauf nur gemappt
+        n_jobs: Anzahl Prozesse (1 = seriell, 0 = alle CPU-Kerne).
+                Jeder Sensor ist unabhängig → Parsen + Features parallel.
+                Die Spaltenreihenfolge bleibt identisch zum seriellen Lauf.
+        chunk_size: Streaming-Modus (Zyklen pro Block, siehe iter_feature_blocks).
+                    Rohdaten werden blockweise gelesen, Speicher ∝ chunk_size.
+                    Hat Vorrang vor cache und n_jobs.
+        n_windows: Jeden Zyklus zusätzlich in n_windows gleich lange Zeitfenster
+                   teilen (z.B. 6 × 10 s) und 8 Features pro Fenster berechnen
+        spectral: FFT-Features (Bandenergien, dominante Frequenz, Schwerpunkt)
+                  für die 10/100-Hz-Sensoren anhängen
+        spectral_dtype: Rechengenauigkeit der FFT (np.float32 spart Speicher/Zeit)
+        dtype: Datentyp der Rohdaten und Features. np.float32 halbiert den
+               Speicher (ca. 53 statt 106 MB pro 100-Hz-Sensor), Summen für
+               mean/std laufen weiter in float64.
+        quantile_error: median/q25/q75 aus dem Quantil-Sketch mit diesem
+                        Rangfehler statt exakt (quantile_sketch.py)
+        recorder: Optional RunRecorder (instrumentation.py), misst jeden Sensor
+                  einzeln (mit n_jobs > 1: Wartezeit im Hauptprozess)
         
-        print(f"✓ ({df.shape[0]} Zyklen × {df.shape[1]} Zeitpunkte → {features.shape[1]} Features)")
+    Returns:
+        DataFrame mit aggregierten Features
+    """
+    all_features = []
+    
+    print(f"[load_and_aggregate_sensors] Lade und aggregiere Sensordaten aus '{data_path}'...\n")
+    
+    feature_options = {'n_windows': n_windows, 'spectral': spectral, 'spectral_dtype': spectral_dtype,
+                       'quantile_error': quantile_error}
+    
+    if chunk_size:
+        print(f"  (Streaming in Blöcken à {chunk_size} Zyklen)")
+        combined = pd.concat(iter_feature_blocks(data_path, chunk_size, feature_options, dtype), axis=0)
+        print(f"\n  → Gesamt: {combined.shape[0]} Zyklen × {combined.shape[1]} aggregierte Features\n")
+        return combined
+    
+    sensor_files = find_sensor_files(data_path)
+    
+    if n_jobs <= 0:
+        n_jobs = os.cpu_count() or 1
+    n_jobs = min(n_jobs, max(len(sensor_files), 1))
+    
+    if n_jobs > 1:
+        print(f"  (parallel mit {n_jobs} Prozessen)")
+        # Resource-Tracker vor dem Fork starten → Worker und Hauptprozess teilen ihn
+        # (sonst meldet jeder Worker die später hier freigegebenen Blöcke als Leck)
+        resource_tracker.ensure_running()
+        executor = ProcessPoolExecutor(max_workers=n_jobs)
+        futures = [executor.submit(_process_sensor_file_shared, f, cache, feature_options, dtype)
+                   for f in sensor_files]
+        # Ergebnisse in fester Reihenfolge abholen → deterministische Spalten
+        results = (_collect_shared(future.result()) for future in futures)
+    else:
+        executor = None
+        results = (process_sensor_file(f, cache, feature_options, dtype) for f in sensor_files)
+    
+    from instrumentation import RunRecorder
+    recorder = recorder or RunRecorder()
+    
+    try:
+        for file_path in sensor_files:
+            sensor_name = file_path.stem.lower()
+            with recorder.stage(sensor_name, bytes_read=file_path.stat().st_size) as record:
+                features, raw_shape, n_coerced = next(results)
+                record['cycles'] = raw_shape[0]
+                record['typos'] = n_coerced
+            all_features.append(features)
+            
+            typo_info = f", {n_coerced} Typos → NaN" if n_coerced > 0 else ""
+            print(f"  Verarbeite {sensor_name}... ✓ ({raw_shape[0]} Zyklen × {raw_shape[1]} Zeitpunkte "
+                  f"→ {features.shape[1]} Features{typo_info})")
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
     
     # Alle Features zusammenführen
     combined = pd.concat(all_features, axis=1)
@@ -124,10 +810,7 @@ def load_targets(profile_path: str = "docs/profile.txt") -> pd.DataFrame:
     print(f"[load_targets] Lade Zielvariablen aus '{profile_path}'...")
     
     profile = pd.read_csv(profile_path, sep='\t', header=None)
-    
-    # Laut Dokumentation:
-    profile.columns = ['cooler_condition', 'valve_condition', 'pump_leakage', 
-                       'accumulator_pressure', 'stable_flag']
+    profile.columns = TARGET_COLUMNS
     
     print(f"  ✓ {profile.shape[0]} Zyklen × {profile.shape[1]} Zielvariablen")
     print(f"  Zielvariablen: {list(profile.columns)}\n")
@@ -135,7 +818,8 @@ def load_targets(profile_path: str = "docs/profile.txt") -> pd.DataFrame:
     return profile
 
 
-def compute_statistics(df: pd.DataFrame, feature_cols: list) -> pd.DataFrame:
+def compute_statistics(df: pd.DataFrame, feature_cols: list, dtype=np.float64,
+                       quantile_error: Optional[float] = None) -> pd.DataFrame:
     """
     Berechnet Basis-Statistiken für alle Features.
     
@@ -146,13 +830,19 @@ def compute_statistics(df: pd.DataFrame, feature_cols: list) -> pd.DataFrame:
     Args:
         df: Kompletter DataFrame
         feature_cols: Liste der Feature-Spalten
+        dtype: np.float32 → kompakter Pfad (float32-Matrix, Summen in float64)
+        quantile_error: Quartile aus dem Quantil-Sketch (Zyklen blockweise pro
+                        Feature-Spalte, Rangfehler höchstens quantile_error), None = exakt
         
     Returns:
         DataFrame mit Statistiken
     """
     print("[compute_statistics] Berechne Statistiken...")
     
-    stats = df[feature_cols].describe().T
+    if np.dtype(dtype) == np.float32 or quantile_error is not None:
+        stats = _describe_compact(df[feature_cols].to_numpy(dtype=dtype), feature_cols, quantile_error)
+    else:
+        stats = df[feature_cols].describe().T
     stats['n_missing'] = df[feature_cols].isna().sum()
     stats['pct_missing'] = 100 * stats['n_missing'] / len(df)
     
@@ -165,7 +855,47 @@ def compute_statistics(df: pd.DataFrame, feature_cols: list) -> pd.DataFrame:
     return stats
 
 
-def compute_correlation(df: pd.DataFrame, feature_cols: list) -> pd.DataFrame:
+def _describe_compact(values: np.ndarray, feature_cols: list,
+                      quantile_error: Optional[float] = None) -> pd.DataFrame:
+    """
+    Wie DataFrame.describe().T, aber direkt auf einer float32-Matrix.
+    
+    pandas summiert float32-Spalten in float32 → hier mean/std mit
+    float64-Akkumulatoren, Quartile wie pandas (lineare Interpolation).
+    Mit quantile_error kommen die Quartile aus dem Quantil-Sketch (Zyklen
+    blockweise, keine Sortierung der ganzen Spalte).
+    
+    Args:
+        values: Array Zyklen × Features (float32/float64, NaN = fehlend)
+        feature_cols: Spaltennamen
+        quantile_error: Rangfehler der Näherungs-Quartile (None = exakt)
+        
+    Returns:
+        DataFrame Features × (count, mean, std, min, 25%, 50%, 75%, max)
+    """
+    count = (~np.isnan(values)).sum(axis=0)
+    
+    with warnings.catch_warnings(), np.errstate(invalid='ignore', divide='ignore'):
+        # Spalten ohne gültige Werte → NaN (wie describe, ohne Warnung)
+        warnings.simplefilter('ignore', RuntimeWarning)
+        mean = np.nansum(values, axis=0, dtype=np.float64) / count
+        dev = values - mean
+        std = np.sqrt(np.nansum(dev * dev, axis=0) / (count - 1))
+        if quantile_error is None:
+            quartiles = np.nanquantile(values, [0.25, 0.5, 0.75], axis=0)
+        else:
+            from quantile_sketch import approximate_quantiles
+            quartiles = approximate_quantiles(values, [0.25, 0.5, 0.75], quantile_error, axis=0).T
+        minimum = np.nanmin(values, axis=0)
+        maximum = np.nanmax(values, axis=0)
+    
+    return pd.DataFrame({
+        'count': count.astype(np.float64), 'mean': mean, 'std': std, 'min': minimum,
+        '25%': quartiles[0], '50%': quartiles[1], '75%': quartiles[2], 'max': maximum,
+    }, index=feature_cols)
+
+
+def compute_correlation(df: pd.DataFrame, feature_cols: list, dtype=np.float64, renderer=None) -> pd.DataFrame:
     """
     Berechnet Korrelationsmatrix und erstellt Heatmap.
     
@@ -174,28 +904,30 @@ def compute_correlation(df: pd.DataFrame, feature_cols: list) -> pd.DataFrame:
     - Hilft beim Feature Selection
     - Erkennt Zusammenhänge zwischen Sensoren
     
+    Gerechnet wird mit der gekachelten Engine aus correlation.py (einmal
+    standardisieren, dann Matrixprodukte; NaN paarweise ausgelassen).
+    
     Args:
         df: Kompletter DataFrame
         feature_cols: Liste der Feature-Spalten
+        dtype: np.float32 → Matrixprodukte in float32 (Mittelwerte/Normen in float64)
+        renderer: Optional PlotRenderer (plots.py) für die Heatmap, None = sofort rendern
         
     Returns:
         Korrelationsmatrix
     """
     print("[compute_correlation] Berechne Korrelationsmatrix...")
     
-    corr = df[feature_cols].corr()
+    values = df[feature_cols].to_numpy(dtype=dtype)
+    corr = pd.DataFrame(correlation_matrix(values, dtype=dtype), index=feature_cols, columns=feature_cols)
     corr.to_csv("out/correlation.csv")
     print(f"  ✓ Korrelation gespeichert: out/correlation.csv")
     
     # Heatmap für visuelle Übersicht
-    plt.figure(figsize=(20, 18))
-    sns.heatmap(corr, cmap='coolwarm', center=0, square=True, 
-                linewidths=0.1, cbar_kws={"shrink": 0.8})
-    plt.title('Korrelations-Heatmap (Aggregierte Features)', fontsize=16, pad=20)
-    plt.tight_layout()
-    plt.savefig("out/correlation_heatmap.png", dpi=150, bbox_inches='tight')
-    plt.close()
-    print(f"  ✓ Heatmap gespeichert: out/correlation_heatmap.png\n")
+    from plots import PlotRenderer, render_correlation_heatmap
+    renderer = renderer or PlotRenderer('inline')
+    renderer.submit(render_correlation_heatmap, corr, "out/correlation_heatmap.png", label="Heatmap")
+    print()
     
     return corr
 
@@ -219,6 +951,8 @@ def compute_mutual_information(df: pd.DataFrame, feature_cols: list,
     Returns:
         DataFrame mit MI-Scores
     """
+    from sklearn.feature_selection import mutual_info_classif
+    
     print(f"[compute_mutual_information] Berechne Mutual Information für '{target_col}'...")
     print("  (Optional: Dieser Schritt kann übersprungen werden)")
     
@@ -243,58 +977,229 @@ def compute_mutual_information(df: pd.DataFrame, feature_cols: list,
     return mi_df
 
 
-def create_visualizations(df: pd.DataFrame, feature_cols: list):
+def compute_mutual_information_all(df: pd.DataFrame, feature_cols: list, target_cols: list = TARGET_COLUMNS,
+                                   n_jobs: int = 1, n_bootstrap: int = 0) -> pd.DataFrame:
+    """
+    Mutual Information für alle Zielvariablen auf einmal (eine Spalte pro Ziel).
+    
+    Gleiche Werte wie mutual_info_classif pro Ziel, aber Skalierung und
+    Sortierung der Features werden für alle Ziele geteilt und die Ziele
+    parallel gerechnet (siehe mutual_information.py).
+    
+    Args:
+        df: Kompletter DataFrame
+        feature_cols: Liste der Feature-Spalten
+        target_cols: Zielspalten
+        n_jobs: Anzahl Prozesse (1 = seriell, 0 = alle CPU-Kerne)
+        n_bootstrap: Subsampling-Wiederholungen für Stabilitätsintervalle
+                     (<ziel>_lo / <ziel>_hi = 5 %/95 %-Quantil, 0 = keine)
+        
+    Returns:
+        DataFrame mit MI-Scores (Spalten: feature, ein Ziel pro Spalte)
+    """
+    from mutual_information import mutual_information_table
+    
+    print(f"[compute_mutual_information_all] Berechne Mutual Information für {len(target_cols)} Zielvariablen...")
+    if n_bootstrap > 0:
+        print(f"  (mit {n_bootstrap} Subsampling-Wiederholungen für Stabilitätsintervalle)")
+    
+    mi_df = mutual_information_table(df, feature_cols, target_cols, n_jobs=n_jobs, n_bootstrap=n_bootstrap)
+    mi_df = mi_df.sort_values(target_cols[0], ascending=False, kind='stable')
+    
+    mi_df.to_csv("out/mutual_information.csv", index=False)
+    print(f"  ✓ MI-Scores gespeichert: out/mutual_information.csv")
+    print(f"  → Top 3 Features pro Zielvariable:")
+    for col in target_cols:
+        top = mi_df.nlargest(3, col)
+        print(f"     {col}: " + ", ".join(f"{f} ({v:.4f})" for f, v in zip(top['feature'], top[col])))
+    print()
+    
+    return mi_df
+
+
+def prune_redundant_features(corr: pd.DataFrame, scores: Optional[pd.Series] = None,
+                             threshold: float = 0.9) -> Tuple[List[str], pd.DataFrame]:
+    """
+    Entfernt redundante Features greedy anhand der Korrelationsmatrix.
+
+    Reihenfolge: Features mit den meisten Partnern über der Schwelle zuerst
+    (sie decken die meisten anderen ab), bei Gleichstand das mit dem höheren
+    MI-Score. Jedes behaltene Feature entfernt alle noch offenen Features mit
+    |r| > threshold → die behaltenen Features sind untereinander höchstens
+    threshold korreliert, jedes entfernte hat einen behaltenen Vertreter.
+
+    Args:
+        corr: Korrelationsmatrix (Features × Features)
+        scores: Optional MI-Score pro Feature (Index = Feature-Name) als Tie-Breaker
+        threshold: Schwelle für |r| (0.9 wie im README vorgeschlagen)
+
+    Returns:
+        Tuple aus (behaltene Features in Original-Reihenfolge,
+                   DataFrame mit Spalten dropped, redundant_with, r)
+    """
+    columns = list(corr.columns)
+    strength = np.abs(corr.to_numpy(dtype=np.float64))
+    with np.errstate(invalid='ignore'):
+        redundant = strength > threshold  # NaN (konstante Spalten) → nicht redundant
+    np.fill_diagonal(redundant, False)
+
+    degree = redundant.sum(axis=1)
+    score = np.zeros(len(columns)) if scores is None else scores.reindex(columns).fillna(0).to_numpy()
+    order = np.lexsort((np.arange(len(columns)), -score, -degree))
+
+    open_ = np.ones(len(columns), dtype=bool)
+    keep = np.zeros(len(columns), dtype=bool)
+    dropped, representative = [], []
+    for i in order:
+        if not open_[i]:
+            continue
+        keep[i], open_[i] = True, False
+        partners = np.flatnonzero(redundant[i] & open_)
+        open_[partners] = False
+        dropped.extend(partners)
+        representative.extend([i] * len(partners))
+
+    dropped, representative = np.array(dropped, dtype=np.intp), np.array(representative, dtype=np.intp)
+    mapping = pd.DataFrame({
+        'dropped': [columns[j] for j in dropped],
+        'redundant_with': [columns[i] for i in representative],
+        'r': corr.to_numpy()[dropped, representative],
+    })
+    return [col for col, k in zip(columns, keep) if k], mapping
+
+
+def compute_feature_selection(df: pd.DataFrame, corr: pd.DataFrame, mi_df: Optional[pd.DataFrame] = None,
+                              threshold: float = 0.9) -> List[str]:
+    """
+    Reduziert den Feature-Satz um redundante Features (|r| > threshold).
+
+    Warum?
+    - Viele der 136 Features tragen fast dieselbe Info (z.B. ps1_mean vs. ps2_mean)
+    - Weniger Features → Training und Online-Scoring rechnen weniger pro Zyklus
+
+    Als Tie-Breaker dient der MI-Score (bei --mi-all der Mittelwert über
+    alle Zielvariablen).
+
+    Args:
+        df: Kompletter DataFrame
+        corr: Korrelationsmatrix aus compute_correlation
+        mi_df: Optional MI-Scores aus compute_mutual_information(_all)
+        threshold: Schwelle für |r|
+
+    Returns:
+        Liste der behaltenen Feature-Spalten
+    """
+    print(f"[compute_feature_selection] Entferne redundante Features (|r| > {threshold})...")
+
+    scores = None
+    if mi_df is not None:
+        score_cols = [col for col in TARGET_COLUMNS if col in mi_df.columns] or ['mi_score']
+        scores = mi_df.set_index('feature')[score_cols].mean(axis=1)
+
+    selected, mapping = prune_redundant_features(corr, scores, threshold)
+    targets = [col for col in df.columns if col in TARGET_COLUMNS]
+
+    df[selected + targets].to_csv("out/features_selected.csv", index=False)
+    mapping.to_csv("out/feature_redundancy.csv", index=False)
+    print(f"  ✓ {len(selected)} von {len(corr.columns)} Features behalten: out/features_selected.csv")
+    print(f"  ✓ {len(mapping)} redundante Features zugeordnet: out/feature_redundancy.csv\n")
+
+    return selected
+
+
+def create_visualizations(df: pd.DataFrame, feature_cols: list, renderer=None):
     """
     Erstellt grundlegende Visualisierungen.
     
+    Übergeben werden nur die Spalten, die gezeichnet werden (kleine Aufträge
+    für den Hintergrund-Prozess, siehe plots.py).
+    
     Args:
         df: Kompletter DataFrame
         feature_cols: Liste der Feature-Spalten
+        renderer: Optional PlotRenderer (plots.py), None = sofort rendern
     """
+    from plots import PlotRenderer, render_boxplots, render_distributions
+    renderer = renderer or PlotRenderer('inline')
+    
     print("[create_visualizations] Erstelle Visualisierungen...")
     
     # 1. Mean-Features Verteilungen
     mean_features = [col for col in feature_cols if '_mean' in col][:16]
-    
-    fig, axes = plt.subplots(4, 4, figsize=(16, 12))
-    axes = axes.flatten()
-    
-    for i, col in enumerate(mean_features):
-        axes[i].hist(df[col].dropna(), bins=50, edgecolor='black', alpha=0.7)
-        axes[i].set_title(col, fontsize=10)
-        axes[i].set_xlabel('Wert')
-        axes[i].set_ylabel('Häufigkeit')
-        axes[i].grid(alpha=0.3)
-    
-    plt.tight_layout()
-    plt.savefig("out/feature_distributions.png", dpi=150, bbox_inches='tight')
-    plt.close()
-    print(f"  ✓ Verteilungen gespeichert: out/feature_distributions.png")
+    renderer.submit(render_distributions, df[mean_features], "out/feature_distributions.png",
+                    label="Verteilungen")
     
     # 2. Boxplots nach Cooler Condition
     if 'cooler_condition' in df.columns:
         features_to_plot = ['ts1_mean', 'ts2_mean', 'ps1_mean', 'ps2_mean']
         features_to_plot = [f for f in features_to_plot if f in df.columns][:4]
-        
-        fig, axes = plt.subplots(2, 2, figsize=(14, 10))
-        axes = axes.flatten()
-        
-        for i, feat in enumerate(features_to_plot):
-            df.boxplot(column=feat, by='cooler_condition', ax=axes[i])
-            axes[i].set_title(f'{feat} by Cooler Condition')
-            axes[i].set_xlabel('Cooler Condition')
-            axes[i].set_ylabel(feat)
-        
-        plt.suptitle('')
-        plt.tight_layout()
-        plt.savefig("out/boxplots_by_target.png", dpi=150, bbox_inches='tight')
-        plt.close()
-        print(f"  ✓ Boxplots gespeichert: out/boxplots_by_target.png")
+        renderer.submit(render_boxplots, df[features_to_plot + ['cooler_condition']], features_to_plot,
+                        'cooler_condition', "out/boxplots_by_target.png", label="Boxplots")
     
     print()
 
 
-def main():
+def parse_args(argv=None) -> argparse.Namespace:
+    """
+    Liest die Kommandozeilen-Optionen.
+    
+    Args:
+        argv: Argumente (None = sys.argv)
+        
+    Returns:
+        Namespace mit den Optionen
+    """
+    parser = argparse.ArgumentParser(description="Hydraulic Systems - Data Preparation")
+    parser.add_argument('--jobs', type=int, default=1,
+                        help="Prozesse für Parsen + Features (1 = seriell, 0 = alle CPU-Kerne)")
+    parser.add_argument('--chunk-size', type=int, default=None,
+                        help="Streaming-Modus: Zyklen pro Block (Speicher begrenzt durch Blockgröße)")
+    parser.add_argument('--cache', action='store_true',
+                        help="Geparste Sensor-Matrizen als .npy in cache/sensors/ ablegen und wiederverwenden "
+                             "(schneller, belegt aber ca. 770 MB Platte für den UCI-Datensatz)")
+    parser.add_argument('--incremental', action='store_true',
+                        help="Feature-Store nutzen: nur neu angehängte Zyklen verarbeiten")
+    parser.add_argument('--windows', type=int, default=1,
+                        help="Zusätzlich 8 Features pro Zeitfenster (z.B. 6 → 6 × 10 s pro Zyklus)")
+    parser.add_argument('--spectral', nargs='?', const='float64', choices=['float64', 'float32'],
+                        help="FFT-Features (Bandenergien, Peak, Schwerpunkt) für 10/100-Hz-Sensoren, "
+                             "optional in float32 gerechnet")
+    parser.add_argument('--precision', choices=['float64', 'float32'], default='float64',
+                        help="Datentyp für Rohdaten, Features, Statistiken und Korrelation "
+                             "(float32 halbiert den Speicher, Summen weiter in float64)")
+    parser.add_argument('--quantile-error', type=float, default=None, metavar='EPS',
+                        help="median/q25/q75 (Features) und Quartile (Statistiken) aus einem "
+                             "Quantil-Sketch mit Rangfehler höchstens EPS, z.B. 0.01 (Standard: exakt)")
+    parser.add_argument('--mi-all', action='store_true',
+                        help="Mutual Information für alle 5 Zielvariablen (parallel mit --jobs)")
+    parser.add_argument('--mi-bootstrap', type=int, default=0,
+                        help="Mit --mi-all: Subsampling-Wiederholungen für Stabilitätsintervalle")
+    parser.add_argument('--prune-threshold', type=float, default=0.9,
+                        help="Feature-Auswahl: redundante Features mit |r| über dieser Schwelle entfernen")
+    parser.add_argument('--plots', choices=['background', 'inline', 'off'], default='background',
+                        help="Plots im Hintergrund-Prozess rendern (Standard), sofort oder gar nicht (off)")
+    parser.add_argument('--export-format', nargs='+', choices=['csv', 'parquet', 'arrow'], default=['csv'],
+                        help="Formate für out/features_complete.* (Parquet/Arrow brauchen pyarrow)")
+    parser.add_argument('--compression', choices=['none', 'snappy', 'zstd', 'lz4', 'gzip'], default=None,
+                        help="Kompression für Parquet/Arrow (Standard: snappy bzw. unkomprimiert)")
+    parser.add_argument('--features-only', action='store_true',
+                        help="Nur Features + Zielvariablen nach out/features_complete.csv "
+                             "(ohne Statistik, MI und Plots; lädt weder matplotlib noch sklearn)")
+    parser.add_argument('--only', nargs='+', metavar='STAGE',
+                        help="Nur diese Stufen (+ veraltete Vorstufen) ausführen, z.B. --only correlation")
+    parser.add_argument('--force', nargs='*', metavar='STAGE',
+                        help="Cache ignorieren: ohne Namen alle Stufen, sonst nur die genannten")
+    parser.add_argument('--report', metavar='PATH',
+                        help="Laufbericht (JSONL): Zeit, CPU, Speicher-Spitze, Bytes und Zyklen/s pro Stufe "
+                             "und pro Sensor, wird an PATH angehängt")
+    parser.add_argument('--profile', metavar='DIR',
+                        help="cProfile pro Stufe nach DIR/<stufe>.prof (auswerten mit python -m pstats)")
+    parser.add_argument('--trace-memory', action='store_true',
+                        help="Im Laufbericht zusätzlich die Speicher-Spitze laut tracemalloc (langsamer)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
     """
     Hauptfunktion: Führt komplette Datenaufbereitung durch.
     
@@ -305,9 +1210,15 @@ def main():
     4. Statistiken berechnen
     5. Korrelationsanalyse
     6. Mutual Information (optional)
-    7. Visualisierungen
-    8. Export nach out/
+    7. Feature-Auswahl (redundante Features entfernen)
+    8. Visualisierungen
+    9. Export nach out/
+    
+    Args:
+        argv: Kommandozeilen-Argumente (None = sys.argv), siehe parse_args
     """
+    args = parse_args(argv)
+    
     print("=" * 70)
     print("HYDRAULIC SYSTEMS - DATA PREPARATION")
     print("=" * 70)
@@ -320,37 +1231,33 @@ def main():
     # Erstelle Output-Verzeichnis falls nicht vorhanden
     Path('out').mkdir(exist_ok=True)
     
-    # 1. Lade und aggregiere Sensordaten
-    features_df = load_and_aggregate_sensors("data")
-    
-    # 2. Lade Zielvariablen
-    targets_df = load_targets("docs/profile.txt")
-    
-    # 3. Zusammenführen
-    print("[main] Führe Features und Targets zusammen...")
-    df_complete = pd.concat([features_df.reset_index(drop=True), 
-                            targets_df.reset_index(drop=True)], axis=1)
-    print(f"  ✓ Kompletter Datensatz: {df_complete.shape}\n")
-    
-    # Feature-Spalten identifizieren
-    feature_cols = [col for col in df_complete.columns if col not in targets_df.columns]
-    
-    # 4. Statistiken
-    stats_df = compute_statistics(df_complete, feature_cols)
-    
-    # 5. Korrelation
-    corr_df = compute_correlation(df_complete, feature_cols)
-    
-    # 6. Mutual Information
-    mi_df = compute_mutual_information(df_complete, feature_cols, 'cooler_condition')
+    # 1.-9. Stufen-Graph (pipeline.py): nur veraltete Stufen laufen neu
+    # Plots entstehen im Hintergrund, run() wartet am Ende auf sie
+    # Jede Stufe wird gemessen (--report/--profile schreiben die Messwerte)
+    from instrumentation import RunRecorder
+    from pipeline import build_pipeline
+    from plots import PlotRenderer
+    force = []
+    if args.force is not None:
+        force = args.force or ['all']  # --force ohne Namen → alle Stufen
+    targets = ['export'] if args.features_only else args.only
+    recorder = RunRecorder(args.report, args.profile, args.trace_memory)
+    with PlotRenderer(args.plots) as renderer:
+        pipeline = build_pipeline(args, renderer=renderer, recorder=recorder)
+        pipeline.run(targets, force=force)
+    recorder.finish(argv=sys.argv[1:] if argv is None else list(argv))
     
-    # 7. Visualisierungen
-    create_visualizations(df_complete, feature_cols)
+    if args.features_only:
+        df_complete = pipeline.result('merge')
+        print(f"✓ Features gespeichert: out/features_complete.csv ({df_complete.shape})\n")
+        return
+    if args.only:
+        print(f"✓ Stufen abgeschlossen: {', '.join(args.only)}\n")
+        return
     
-    # 8. Export als CSV
-    print("[main] Exportiere finalen Datensatz...")
-    df_complete.to_csv("out/features_complete.csv", index=False)
-    print(f"  ✓ Gespeichert: out/features_complete.csv ({df_complete.shape})\n")
+    df_complete = pipeline.result('merge')
+    feature_cols = [col for col in df_complete.columns if col not in TARGET_COLUMNS]
+    targets_df = df_complete[[col for col in df_complete.columns if col in TARGET_COLUMNS]]
     
     # Zusammenfassung
     print("=" * 70)
@@ -366,6 +1273,7 @@ def main():
     print("  • out/correlation.csv")
     print("  • out/correlation_heatmap.png")
     print("  • out/mutual_information.csv")
+    print("  • out/features_selected.csv + out/feature_redundancy.csv")
     print("  • out/feature_distributions.png")
     print("  • out/boxplots_by_target.png")
     print("\nZielvariablen:")
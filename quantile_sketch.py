@@ -0,0 +1,389 @@
+"""
+Hydraulic Systems - Quantil-Sketch
+==================================
+Zusammenführbare Quantil-Zusammenfassung mit fester Größe (eine pro Zeile)
+
+KONZEPT:
+Exakte Quantile (median, q25, q75) brauchen alle Werte einer Zeile und eine
+Sortierung. Wenn die Werte eines Zyklus auf mehrere Shards verteilt sind
+(sharded_features.py), braucht jeder Shard eine kleine Zusammenfassung, die
+sich später mit den anderen vereinigen lässt.
+
+Rang-Schranken wie bei Greenwald/Khanna (zusammenführbar wie bei Agarwal
+et al., "Mergeable Summaries"):
+- Ein Sketch speichert pro Zeile `size` echte Datenwerte, jeden mit einer
+  unteren und oberen Schranke seines Rangs (rmin, rmax), plus die Anzahl n
+  der zusammengefassten Werte. Aus Rohdaten gebaut sind die Ränge exakt.
+- Merge: Punkte beider Sketches nach Wert sortieren; der Rang eines Punkts
+  im vereinigten Datensatz liegt zwischen eigenem rmin + rmin des
+  Vorgängers der anderen Seite und eigenem rmax + rmax des Nachfolgers
+  der anderen Seite − 1. Danach auf `size` Punkte ausdünnen (pro Soll-Rang
+  der Punkt, dessen Schranken ihn am engsten einschließen).
+- Abfrage: Soll-Position q · (n - 1) wie bei pandas/numpy; geliefert wird
+  der gespeicherte Wert mit den engsten Schranken um diese Position. Nur
+  wenn beide Nachbar-Ränge exakt gespeichert sind (kleine Zeilen), wird
+  wie bei numpy linear interpoliert → exakt. Sonst keine Interpolation
+  (bei Plateaus in den Daten entstünden Werte, die kein Quantil im
+  Fehlerband annimmt).
+
+Garantie (bewiesen, nicht nur gemessen): Die Schranken sind immer korrekt,
+error_bound() liefert daraus pro Zeile den größten möglichen Rangfehler
+(Anteil der Werte). Jedes Ausdünnen erhöht ihn um höchstens
+1 / (2 · (size - 1)), Mergen ohne Ausdünnen nicht. Ein Sketch der Tiefe d
+(d Merge-Ebenen) hat also Rangfehler ≤ (d + 1) / (2 · (size - 1)) plus einen
+halben Rang Rundung. sketch_size(epsilon, depth) wählt size so, dass der
+Rang des Ergebnisses höchstens epsilon · (n - 1) Positionen von der
+Soll-Position entfernt liegt (sobald epsilon · (n - 1) ≥ 1) → das Ergebnis
+liegt zwischen den exakten Quantilen zu q - epsilon und q + epsilon.
+
+Für lange Ströme sammelt der QuantileAccumulator Blöcke wie ein Binärzähler
+(Sketches gleicher Ebene werden gemergt) → Tiefe ceil(log2(Blöcke)), Speicher
+pro Zeile ca. size · log2(Blöcke). Alles ist über die Zeilen vektorisiert
+(ein Sketch pro Zyklus, ohne Python-Schleife über Zyklen). NaN werden
+ignoriert.
+
+approximate_quantiles arbeitet auf einer Matrix, die schon im Speicher
+liegt: Der Nutzen ist dort die Zusammenführbarkeit (Shards, Blöcke) und
+der Verzicht auf die Sortierung, nicht weniger Speicher. Weniger Speicher
+als die Rohdaten braucht nur, wer die Blöcke selbst einliest und direkt
+in einen QuantileAccumulator gibt.
+
+Nutzung:
+    from quantile_sketch import QuantileSketch, approximate_quantiles
+    sketch = QuantileSketch.from_values(block_a).merge(QuantileSketch.from_values(block_b))
+    q25, median, q75 = sketch.quantile([0.25, 0.5, 0.75]).T
+    quartiles = approximate_quantiles(values, [0.25, 0.5, 0.75], epsilon=0.01)  # Zeilen × 3
+"""
+
+import math
+import numpy as np
+from typing import Dict, List, Optional, Sequence, Union
+
+# Punkte pro Zeile (Rangfehler ≤ (Tiefe + 1) / (2 · 127), z.B. 1,2 % bei Tiefe 2)
+DEFAULT_SKETCH_SIZE = 128
+
+# Werte pro Block in approximate_quantiles (Sortierung pro Block bleibt klein,
+# größere Blöcke → weniger Merge-Ebenen)
+SKETCH_BLOCK_VALUES = 1024
+
+
+def sketch_size(epsilon: float, depth: int = 0) -> int:
+    """
+    Punkte pro Zeile für einen garantierten Rangfehler von höchstens epsilon.
+
+    Der Fehler wächst mit jeder Merge-Ebene um bis zu 1 / (2 · (size - 1)).
+    Die Größe ist so gewählt, dass (depth + 1) / (2 · (size - 1)) nur die
+    Hälfte von epsilon verbraucht; die andere Hälfte deckt die Rundung auf
+    ganze Ränge ab (ab epsilon · (n - 1) ≥ 1).
+
+    Args:
+        epsilon: Erlaubter Rangfehler (z.B. 0.01 = 1 % der Werte)
+        depth: Merge-Ebenen bis zum fertigen Sketch (siehe merge_depth)
+
+    Returns:
+        Sketch-Größe ceil((depth + 1) / epsilon) + 1
+    """
+    if not 0 < epsilon < 1:
+        raise ValueError(f"Fehlerschranke muss zwischen 0 und 1 liegen, nicht {epsilon}")
+    return math.ceil((depth + 1) / epsilon) + 1
+
+
+def merge_depth(n_parts: int) -> int:
+    """Merge-Ebenen, wenn n_parts Sketches paarweise bzw. im QuantileAccumulator vereinigt werden."""
+    return math.ceil(math.log2(n_parts)) if n_parts > 1 else 0
+
+
+class QuantileSketch:
+    """Ein Quantil-Sketch fester Größe pro Zeile (z.B. pro Zyklus)."""
+
+    def __init__(self, points: np.ndarray, rmin: np.ndarray, rmax: np.ndarray, counts: np.ndarray,
+                 depth: int = 0):
+        """
+        Args:
+            points: Array Zeilen × size, gespeicherte Datenwerte pro Zeile aufsteigend (NaN = leere Zeile)
+            rmin, rmax: Schranken der Ränge (1-basiert) der Punkte im zusammengefassten Datensatz
+            counts: Anzahl zusammengefasster Werte pro Zeile
+            depth: Anzahl Merge-Ebenen (0 = direkt aus Werten gebaut)
+        """
+        self.points = np.asarray(points, dtype=np.float64)
+        self.rmin = np.asarray(rmin, dtype=np.int64)
+        self.rmax = np.asarray(rmax, dtype=np.int64)
+        self.counts = np.asarray(counts, dtype=np.int64)
+        self.depth = depth
+
+    @property
+    def size(self) -> int:
+        """Punkte pro Zeile."""
+        return self.points.shape[1]
+
+    @classmethod
+    def from_values(cls, values: np.ndarray, size: int = DEFAULT_SKETCH_SIZE) -> 'QuantileSketch':
+        """
+        Baut einen Sketch pro Zeile aus den Rohwerten (exakte Ränge).
+
+        Args:
+            values: Array Zeilen × Werte (NaN werden ignoriert)
+            size: Punkte pro Zeile
+
+        Returns:
+            QuantileSketch mit len(values) Zeilen
+        """
+        values = np.asarray(values, dtype=np.float64)
+        ordered = np.sort(values, axis=1)  # NaN landen am Ende
+        counts = values.shape[1] - np.isnan(values).sum(axis=1)
+
+        # Gleichmäßig verteilte Positionen inkl. Minimum und Maximum;
+        # wenige Werte → alle speichern (Rest: letzter Wert wiederholt)
+        n = counts[:, None]
+        j = np.arange(size)[None, :]
+        spread = (j * np.maximum(n - 1, 0)) // max(size - 1, 1)
+        index = np.where(n <= size, np.minimum(j, np.maximum(n - 1, 0)), spread)
+        points = np.take_along_axis(ordered, index, axis=1)
+        ranks = np.where(n > 0, index + 1, 0)
+        return cls(points, ranks, ranks, counts)
+
+    def merge(self, other: 'QuantileSketch') -> 'QuantileSketch':
+        """
+        Vereinigt zwei Sketches derselben Zeilen (z.B. zwei Spalten-Shards).
+
+        Args:
+            other: Sketch mit gleicher Zeilenzahl und Größe
+
+        Returns:
+            Neuer Sketch über die Werte beider (Größe wie self)
+        """
+        if self.points.shape != other.points.shape:
+            raise ValueError(f"Sketches passen nicht zusammen: {self.points.shape} vs. {other.points.shape}")
+        size = self.size
+        total = self.counts + other.counts
+
+        # Gemeinsame Ordnung: nach Wert, bei Gleichstand self vor other (stabil)
+        values = np.concatenate([self.points, other.points], axis=1)
+        values[np.isnan(values)] = np.inf  # leere Zeilen (werden unten ersetzt)
+        from_other = np.zeros(values.shape, dtype=bool)
+        from_other[:, size:] = True
+        order = np.argsort(values, axis=1, kind='stable')
+        values = np.take_along_axis(values, order, axis=1)
+        from_other = np.take_along_axis(from_other, order, axis=1)
+        rmin = np.take_along_axis(np.concatenate([self.rmin, other.rmin], axis=1), order, axis=1)
+        rmax = np.take_along_axis(np.concatenate([self.rmax, other.rmax], axis=1), order, axis=1)
+
+        # Vorgänger/Nachfolger auf der anderen Seite (Index in deren Punkten)
+        before = np.where(from_other, np.cumsum(~from_other, axis=1), np.cumsum(from_other, axis=1))
+        prev_index = np.clip(before - 1, 0, size - 1)
+        next_index = np.minimum(before, size - 1)
+        prev_rmin = np.where(from_other, np.take_along_axis(self.rmin, prev_index, axis=1),
+                             np.take_along_axis(other.rmin, prev_index, axis=1))
+        next_rmax = np.where(from_other, np.take_along_axis(self.rmax, next_index, axis=1),
+                             np.take_along_axis(other.rmax, next_index, axis=1))
+        other_count = np.where(from_other, self.counts[:, None], other.counts[:, None])
+
+        rmin = rmin + np.where(before > 0, prev_rmin, 0)
+        rmax = rmax + np.where(before < size, next_rmax - 1, other_count)
+
+        keep = _select(rmin, rmax, total, _target_ranks(total, size))
+        keep.sort(axis=1)  # Reihenfolge der Punkte bleibt erhalten
+        points = np.take_along_axis(values, keep, axis=1)
+        rmin = np.take_along_axis(rmin, keep, axis=1)
+        rmax = np.take_along_axis(rmax, keep, axis=1)
+
+        # Leere Seite → andere Seite unverändert übernehmen
+        for empty, source in ((self.counts == 0, other), (other.counts == 0, self)):
+            points[empty], rmin[empty], rmax[empty] = source.points[empty], source.rmin[empty], source.rmax[empty]
+        return QuantileSketch(points, rmin, rmax, total, max(self.depth, other.depth) + 1)
+
+    def quantile(self, q: Union[float, Sequence[float]]) -> np.ndarray:
+        """
+        Quantile pro Zeile: gespeicherter Wert nahe der Position q · (n - 1) (wie np.quantile).
+
+        Der Rang des Ergebnisses weicht um höchstens error_bound() · n von
+        der Soll-Position ab.
+
+        Args:
+            q: Quantil oder Liste von Quantilen in [0, 1]
+
+        Returns:
+            Array Zeilen (× len(q) bei einer Liste)
+        """
+        q_arr = np.atleast_1d(np.asarray(q, dtype=np.float64))
+        targets = 1 + q_arr[None, :] * np.maximum(self.counts[:, None] - 1, 0)
+        result = np.take_along_axis(self.points, _select(self.rmin, self.rmax, self.counts, targets), axis=1)
+
+        # Beide Nachbar-Ränge exakt bekannt → wie np.quantile interpolieren (exakt)
+        lower_rank = np.floor(targets)
+        upper_rank = np.minimum(lower_rank + 1, np.maximum(self.counts[:, None], 1))
+        lower = _select(self.rmin, self.rmax, self.counts, lower_rank)
+        upper = _select(self.rmin, self.rmax, self.counts, upper_rank)
+        exact = ((np.take_along_axis(self.rmin, lower, axis=1) == lower_rank) &
+                 (np.take_along_axis(self.rmax, lower, axis=1) == lower_rank) &
+                 (np.take_along_axis(self.rmin, upper, axis=1) == upper_rank) &
+                 (np.take_along_axis(self.rmax, upper, axis=1) == upper_rank))
+        a = np.take_along_axis(self.points, lower, axis=1)
+        b = np.take_along_axis(self.points, upper, axis=1)
+        result = np.where(exact, a + (b - a) * (targets - lower_rank), result)
+        result[self.counts == 0] = np.nan
+        return result if np.ndim(q) else result[:, 0]
+
+    def error_bound(self) -> np.ndarray:
+        """
+        Garantierter größter Rangfehler pro Zeile (Anteil der Werte) über alle Quantile.
+
+        Zwischen zwei benachbarten Punkten i, i + 1 ist jeder Soll-Rang auf
+        (rmax[i + 1] - rmin[i]) / 2 genau erreichbar, an den Rändern auf
+        rmax[0] - 1 bzw. n - rmin[-1].
+
+        Returns:
+            Array Zeilen (NaN für leere Zeilen)
+        """
+        n = self.counts.astype(np.float64)
+        gaps = (self.rmax[:, 1:] - self.rmin[:, :-1]) / 2 if self.size > 1 else np.zeros((len(n), 1))
+        worst = np.maximum(np.maximum(gaps.max(axis=1), self.rmax[:, 0] - 1), n - self.rmin[:, -1])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(n > 0, worst / n, np.nan)
+
+    def to_arrays(self, prefix: str = 'sketch') -> Dict[str, np.ndarray]:
+        """Arrays zum Speichern (z.B. np.savez), Gegenstück: from_arrays."""
+        return {f'{prefix}_points': self.points, f'{prefix}_rmin': self.rmin, f'{prefix}_rmax': self.rmax,
+                f'{prefix}_counts': self.counts, f'{prefix}_depth': np.array(self.depth)}
+
+    @classmethod
+    def from_arrays(cls, arrays, prefix: str = 'sketch') -> 'QuantileSketch':
+        """Sketch aus den Arrays von to_arrays."""
+        return cls(arrays[f'{prefix}_points'], arrays[f'{prefix}_rmin'], arrays[f'{prefix}_rmax'],
+                   arrays[f'{prefix}_counts'], int(arrays[f'{prefix}_depth']))
+
+
+class QuantileAccumulator:
+    """
+    Sammelt Sketches eines Stroms von Blöcken (gleiche Zeilen, neue Werte).
+
+    Wie ein Binärzähler: Auf jeder Ebene liegt höchstens ein Sketch, ein neuer
+    Sketch wird mit den belegten Ebenen gemergt, bis eine frei ist. Nach B
+    Blöcken hat sketch() die Tiefe merge_depth(B).
+    """
+
+    def __init__(self, size: int = DEFAULT_SKETCH_SIZE):
+        """
+        Args:
+            size: Punkte pro Zeile
+        """
+        self.size = size
+        self._levels: List[Optional[QuantileSketch]] = []
+
+    def add(self, sketch: QuantileSketch):
+        """Fügt einen Sketch über weitere Werte derselben Zeilen hinzu."""
+        level = 0
+        while level < len(self._levels) and self._levels[level] is not None:
+            sketch = self._levels[level].merge(sketch)
+            self._levels[level] = None
+            level += 1
+        if level == len(self._levels):
+            self._levels.append(None)
+        self._levels[level] = sketch
+
+    def add_values(self, values: np.ndarray):
+        """Fügt einen Block Rohwerte (Zeilen × Werte) hinzu."""
+        self.add(QuantileSketch.from_values(values, self.size))
+
+    def sketch(self) -> Optional[QuantileSketch]:
+        """Sketch über alle bisherigen Blöcke (None, wenn noch nichts hinzugefügt wurde)."""
+        result = None
+        for sketch in self._levels:
+            if sketch is not None:
+                result = sketch if result is None else sketch.merge(result)
+        return result
+
+
+def approximate_quantiles(values: np.ndarray, q: Sequence[float], epsilon: float,
+                          axis: int = 1, block_size: Optional[int] = None) -> np.ndarray:
+    """
+    Näherungs-Quantile mit garantiertem Rangfehler ≤ epsilon, blockweise über einen Sketch.
+
+    Die Werte werden in Blöcken entlang axis in einen QuantileAccumulator
+    gegeben, die Sketch-Größe richtet sich nach der Zahl der Blöcke
+    (sketch_size mit depth = merge_depth(Blöcke)). Ergebnisse sind echte
+    Datenwerte, keine Interpolation.
+
+    Args:
+        values: 2-D-Array (NaN werden ignoriert)
+        q: Liste von Quantilen in [0, 1]
+        epsilon: Erlaubter Rangfehler (siehe sketch_size)
+        axis: 1 = Quantile pro Zeile (z.B. pro Zyklus), 0 = pro Spalte (z.B. pro Feature)
+        block_size: Werte pro Block (None = SKETCH_BLOCK_VALUES, mindestens Sketch-Größe)
+
+    Returns:
+        Array (Zeilen bzw. Spalten) × len(q)
+    """
+    values = np.asarray(values)
+    if axis == 0:
+        values = values.T  # View: Spalten werden zu Zeilen des Sketches
+    n_values = values.shape[1]
+    block_size, size = plan_blocks(n_values, epsilon, block_size)
+
+    accumulator = QuantileAccumulator(size)
+    for start in range(0, n_values, block_size):
+        accumulator.add_values(values[:, start:start + block_size])
+    sketch = accumulator.sketch()
+    if sketch is None:
+        return np.full((values.shape[0], len(q)), np.nan)
+    return sketch.quantile(list(q))
+
+
+def plan_blocks(n_values: int, epsilon: float, block_size: Optional[int] = None) -> tuple:
+    """
+    Blockgröße und Sketch-Größe für approximate_quantiles.
+
+    Args:
+        n_values: Werte pro Zeile
+        epsilon: Erlaubter Rangfehler
+        block_size: Gewünschte Werte pro Block (None = SKETCH_BLOCK_VALUES)
+
+    Returns:
+        Tuple aus (Werte pro Block, Punkte pro Sketch)
+    """
+    block_size = block_size or SKETCH_BLOCK_VALUES
+    size = sketch_size(epsilon, merge_depth(math.ceil(n_values / block_size)))
+    if size > block_size:
+        # Blöcke kleiner als der Sketch bringen nichts → größere Blöcke, weniger Ebenen
+        block_size = size
+        size = sketch_size(epsilon, merge_depth(math.ceil(n_values / block_size)))
+    return block_size, size
+
+
+def _target_ranks(counts: np.ndarray, size: int) -> np.ndarray:
+    """Gleichmäßig verteilte Soll-Ränge 1 … n pro Zeile (Zeilen × size) zum Ausdünnen."""
+    steps = np.arange(size)[None, :] / max(size - 1, 1)
+    return 1 + steps * np.maximum(counts[:, None] - 1, 0)
+
+
+def _select(rmin: np.ndarray, rmax: np.ndarray, counts: np.ndarray, targets: np.ndarray) -> np.ndarray:
+    """
+    Pro Soll-Rang der Punkt, der ihn am engsten einschließt.
+
+    Fehler eines Punkts für Rang r: max(r - rmin, rmax - r). rmin und rmax
+    steigen entlang der Punkte → das Minimum liegt beim ersten Punkt mit
+    rmin + rmax ≥ 2r oder seinem Vorgänger (Suche über alle Zeilen auf einmal,
+    jede Zeile in ihrem eigenen Wertebereich).
+
+    Args:
+        rmin, rmax: Rang-Schranken (Zeilen × Punkte)
+        counts: Werte pro Zeile
+        targets: Soll-Ränge (Zeilen × Anzahl)
+
+    Returns:
+        Indizes der gewählten Punkte (Zeilen × Anzahl)
+    """
+    n_rows, n_points = rmin.shape
+    span = 2 * (int(counts.max(initial=0)) + 2)
+    offsets = (np.arange(n_rows) * span)[:, None]
+    keys = (np.clip(rmin + rmax, 0, span - 1) + offsets).ravel()
+    wanted = np.clip(2 * targets, 0, span - 1) + offsets
+    index = np.searchsorted(keys, wanted.ravel()).reshape(wanted.shape) - offsets // span * n_points
+    upper = np.clip(index, 0, n_points - 1)
+    lower = np.maximum(upper - 1, 0)
+
+    def cost(i):
+        return np.maximum(targets - np.take_along_axis(rmin, i, axis=1),
+                          np.take_along_axis(rmax, i, axis=1) - targets)
+
+    return np.where(cost(lower) <= cost(upper), lower, upper)
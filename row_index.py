@@ -0,0 +1,284 @@
+"""
+Hydraulic Systems - Zeilen-Index
+================================
+Direktzugriff auf einzelne Zyklen der Sensor-Dateien über Byte-Offsets
+
+KONZEPT:
+Um einen Zyklus anzusehen (Notebook, archive/temp_getFeaturesVS1.py), wurde
+bisher die ganze Datei gelesen und geparst: PS1.txt hat ca. 90 MB, das
+dauert über eine Sekunde für eine einzige Zeile. Der RowIndex merkt sich
+stattdessen pro Datei, wo jede Zeile beginnt und endet:
+
+- Aufbau: ein Durchgang über die Datei (Memory-Map, np.flatnonzero auf
+  b'\\n' in Blöcken à INDEX_SCAN_BYTES) → Array Zeilen × (Start, Ende)
+- Persistiert als .npy + .json in cache/row_index/ (Größe + mtime der Quelle)
+- get_cycle / get_cycles: Offsets nachschlagen, nur diese Zeilen aus der
+  Memory-Map schneiden und mit parse_sensor_lines parsen (Typos → NaN wie
+  in read_sensor_file, leere Zeilen zählen nicht als Zyklus)
+- Bei jedem Zugriff wird die Quelle per stat geprüft: Größe oder mtime
+  geändert → Index und Memory-Map werden neu aufgebaut
+
+Das Nachschlagen dauert Mikrosekunden, das Parsen einer 100-Hz-Zeile (6000
+Werte) unter einer Millisekunde.
+
+Nutzung:
+    from row_index import RowIndex
+    index = RowIndex("data")
+    ps1_1800 = index.get_cycle('ps1', 1800)        # Array (6000,)
+    block = index.get_cycles('ps1', slice(0, 100))  # Array (100, 6000)
+
+    python row_index.py ps1 1800
+"""
+
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import time
+import numpy as np
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Tuple, Union
+
+from prep_corrected import FEATURE_STATS, compute_sensor_features, parse_sensor_lines
+
+
+DEFAULT_INDEX_DIR = "cache/row_index"
+
+# Bytes pro Block beim Suchen der Zeilenumbrüche (Hilfs-Arrays bleiben klein)
+INDEX_SCAN_BYTES = 64 * 1024 ** 2
+
+# Whitespace wie bytes.strip() (ASCII), als Byte-Werte
+_WHITESPACE = np.frombuffer(b' \t\n\r\x0b\x0c', dtype=np.uint8)
+
+
+def scan_line_offsets(buffer, scan_bytes: int = INDEX_SCAN_BYTES) -> np.ndarray:
+    """
+    Findet Start und Ende aller nicht-leeren Zeilen eines Puffers.
+
+    Args:
+        buffer: Dateiinhalt (z.B. mmap oder bytes)
+        scan_bytes: Bytes pro Suchblock
+
+    Returns:
+        Array Zeilen × 2 (int64): Start-Offset und Ende (ohne Zeilenumbruch/\\r)
+    """
+    size = len(buffer)
+    if size == 0:
+        return np.empty((0, 2), dtype=np.int64)
+    newlines = [np.flatnonzero(np.frombuffer(buffer, dtype=np.uint8, count=min(scan_bytes, size - start),
+                                             offset=start) == ord('\n')) + start
+                for start in range(0, size, scan_bytes)]
+    ends = np.concatenate(newlines + [np.array([size], dtype=np.int64)]).astype(np.int64)
+    starts = np.concatenate([[0], ends[:-1] + 1]).astype(np.int64)
+    if ends[-1] == starts[-1]:
+        # Datei endet mit Zeilenumbruch → keine Zeile danach
+        starts, ends = starts[:-1], ends[:-1]
+
+    # Windows-Zeilenenden: \r gehört nicht zur Zeile
+    data = np.frombuffer(buffer, dtype=np.uint8)
+    has_cr = data[np.maximum(ends - 1, 0)] == ord('\r')
+    ends = ends - (has_cr & (ends > starts))
+
+    # Leere bzw. nur aus Whitespace bestehende Zeilen sind kein Zyklus (wie line.strip() in
+    # read_sensor_file): Ist das erste oder letzte Byte kein Whitespace, hat die Zeile Inhalt
+    # (vektorisiert); nur die übrigen Zeilen werden ganz geprüft, unabhängig von der Länge
+    keep = ends > starts
+    edges = np.flatnonzero(keep)
+    blank_edges = edges[np.isin(data[starts[edges]], _WHITESPACE) & np.isin(data[ends[edges] - 1], _WHITESPACE)]
+    for row in blank_edges:
+        keep[row] = not np.isin(data[starts[row]:ends[row]], _WHITESPACE).all()
+    return np.column_stack([starts[keep], ends[keep]])
+
+
+class RowIndex:
+    """
+    Byte-Offsets der Zeilen aller Sensor-Dateien eines Datenordners.
+
+    Pro Sensor gibt es einen Eintrag:
+    - <sensor>-<pfad>.npy: Array Zeilen × (Start, Ende)
+    - <sensor>-<pfad>.json: Quelle, Größe, mtime, Anzahl Zeilen
+
+    Geöffnete Memory-Maps bleiben bis close() offen (unter Windows lässt
+    sich die Quelldatei solange nicht ersetzen).
+    """
+
+    def __init__(self, data_path: str = "data", index_dir: str = DEFAULT_INDEX_DIR):
+        """
+        Args:
+            data_path: Ordner mit den Sensor-Dateien
+            index_dir: Ordner für die Index-Dateien
+        """
+        self.data_path = Path(data_path)
+        self.index_dir = Path(index_dir)
+        self._open: Dict[str, Dict] = {}
+
+    def get_cycle(self, sensor: str, i: int, dtype=np.float64) -> np.ndarray:
+        """
+        Liest einen einzelnen Zyklus.
+
+        Args:
+            sensor: Sensorname (z.B. 'ps1')
+            i: Zyklus-Nummer (0-basiert, negativ zählt vom Ende)
+            dtype: Datentyp der Werte
+
+        Returns:
+            Array der Zeitpunkte dieses Zyklus (Typos → NaN)
+        """
+        return self.get_cycles(sensor, [i], dtype)[0]
+
+    def get_cycles(self, sensor: str, rows: Union[slice, Sequence[int]], dtype=np.float64) -> np.ndarray:
+        """
+        Liest mehrere Zyklen (nur diese Zeilen werden geparst).
+
+        Args:
+            sensor: Sensorname (z.B. 'ps1')
+            rows: slice oder Liste von Zyklus-Nummern
+            dtype: Datentyp der Werte
+
+        Returns:
+            Array Zyklen × Zeitpunkte (Typos → NaN)
+        """
+        entry = self._entry(sensor)
+        if not isinstance(rows, slice):
+            rows = np.asarray(rows, dtype=np.int64)
+        buffer = entry['mmap']
+        values, _ = parse_sensor_lines([buffer[start:end] for start, end in entry['offsets'][rows]], dtype)
+        return values
+
+    def n_cycles(self, sensor: str) -> int:
+        """Anzahl Zyklen (nicht-leere Zeilen) der Sensor-Datei."""
+        return len(self._entry(sensor)['offsets'])
+
+    def build(self, sensor: str) -> np.ndarray:
+        """
+        Baut den Index einer Sensor-Datei neu auf und speichert ihn.
+
+        Args:
+            sensor: Sensorname (z.B. 'ps1')
+
+        Returns:
+            Array Zeilen × (Start, Ende)
+        """
+        self._close(sensor)
+        return self._entry(sensor, rebuild=True)['offsets']
+
+    def close(self):
+        """Schließt alle offenen Memory-Maps."""
+        for sensor in list(self._open):
+            self._close(sensor)
+
+    def __enter__(self) -> 'RowIndex':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _entry(self, sensor: str, rebuild: bool = False) -> Dict:
+        """
+        Offener Eintrag (Offsets + Memory-Map), bei geänderter Quelle neu aufgebaut.
+
+        Args:
+            sensor: Sensorname
+            rebuild: Index auf jeden Fall neu aufbauen
+
+        Returns:
+            Dictionary mit offsets, mmap, file und stat-Schlüssel der Quelle
+        """
+        sensor = sensor.lower()
+        file_path = self.data_path / f"{sensor.upper()}.txt"
+        stat = file_path.stat()
+        key = (stat.st_size, stat.st_mtime_ns)
+
+        entry = self._open.get(sensor)
+        if entry is not None and entry['key'] == key and not rebuild:
+            return entry
+        self._close(sensor)
+
+        npy_path, meta_path = self._entry_paths(file_path)
+        f = open(file_path, 'rb')
+        try:
+            # Schlüssel der geöffneten Datei (falls sie sich seit stat geändert hat)
+            stat = os.fstat(f.fileno())
+            key = (stat.st_size, stat.st_mtime_ns)
+            # Leere Dateien lassen sich nicht mappen → leerer Puffer
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if stat.st_size else b''
+            meta = None if rebuild else self._read_meta(meta_path)
+            if meta is not None and npy_path.exists() and (meta['size'], meta['mtime_ns']) == key:
+                offsets = np.load(npy_path)
+            else:
+                offsets = scan_line_offsets(buffer)
+                self._save(npy_path, meta_path, offsets, file_path, key)
+        except BaseException:
+            f.close()
+            raise
+
+        entry = {'offsets': offsets, 'mmap': buffer, 'file': f, 'key': key}
+        self._open[sensor] = entry
+        return entry
+
+    def _close(self, sensor: str):
+        """Schließt Memory-Map und Datei eines Sensors (falls offen)."""
+        entry = self._open.pop(sensor.lower(), None)
+        if entry is None:
+            return
+        if isinstance(entry['mmap'], mmap.mmap):
+            entry['mmap'].close()
+        entry['file'].close()
+
+    def _save(self, npy_path: Path, meta_path: Path, offsets: np.ndarray, file_path: Path, key: Tuple[int, int]):
+        """Schreibt Offsets und Metadaten atomar (erst .tmp, dann umbenennen)."""
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = npy_path.with_suffix('.npy.tmp')
+        with open(tmp_path, 'wb') as f:
+            np.save(f, offsets)
+        os.replace(tmp_path, npy_path)
+
+        tmp_path = meta_path.with_suffix('.json.tmp')
+        tmp_path.write_text(json.dumps({
+            'source': str(file_path.resolve()),
+            'size': key[0],
+            'mtime_ns': key[1],
+            'n_rows': len(offsets),
+        }, indent=2))
+        os.replace(tmp_path, meta_path)
+
+    def _entry_paths(self, file_path: Path) -> Tuple[Path, Path]:
+        """Dateinamen eines Eintrags: Sensorname + Kurz-Hash des Quellpfads."""
+        path_key = hashlib.blake2b(str(file_path.resolve()).encode(), digest_size=4).hexdigest()
+        name = f"{file_path.stem.lower()}-{path_key}"
+        return self.index_dir / f"{name}.npy", self.index_dir / f"{name}.json"
+
+    @staticmethod
+    def _read_meta(meta_path: Path) -> Optional[Dict]:
+        """Liest Metadaten (None falls fehlend oder kaputt)."""
+        try:
+            return json.loads(meta_path.read_text())
+        except (OSError, ValueError):
+            return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Einzelnen Zyklus einer Sensor-Datei lesen (Zeilen-Index)")
+    parser.add_argument('sensor', help="Sensorname, z.B. ps1")
+    parser.add_argument('cycle', type=int, help="Zyklus-Nummer (0-basiert)")
+    parser.add_argument('--data', default='data', help="Ordner mit den Sensor-Dateien")
+    parser.add_argument('--index-dir', default=DEFAULT_INDEX_DIR, help="Ordner für die Index-Dateien")
+    args = parser.parse_args()
+
+    with RowIndex(args.data, args.index_dir) as index:
+        start = time.perf_counter()
+        n_cycles = index.n_cycles(args.sensor)
+        print(f"[RowIndex] {args.sensor}: {n_cycles} Zyklen indexiert ({time.perf_counter() - start:.3f}s)")
+
+        start = time.perf_counter()
+        values = index.get_cycle(args.sensor, args.cycle)
+        print(f"  ✓ Zyklus {args.cycle}: {len(values)} Zeitpunkte ({(time.perf_counter() - start) * 1e3:.2f} ms)\n")
+
+    features = compute_sensor_features(values[None, :])[0]
+    for stat, value in zip(FEATURE_STATS, features):
+        print(f"{args.sensor}_{stat:6s} = {value:10.4f}")
+
+
+if __name__ == "__main__":
+    main()
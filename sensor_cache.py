@@ -0,0 +1,213 @@
+"""
+Hydraulic Systems - Sensor-Cache
+================================
+Persistenter Cache für geparste Sensor-Matrizen
+
+KONZEPT:
+Das Parsen der 17 Text-Dateien kostet bei jedem Lauf Zeit, obwohl sich
+data/ meist nicht ändert. Deshalb: Jede geparste Matrix wird einmal als
+.npy-Datei gespeichert und danach nur noch per Memory-Map geöffnet
+(Millisekunden, kein Kopieren).
+
+- Schlüssel: Größe, mtime und Inhalts-Hash (BLAKE2b) der Quelldatei
+- Geänderte Dateien → Eintrag veraltet → automatisch neu geparst
+- Speicherbudget: Älteste Einträge (zuletzt benutzt) werden gelöscht
+
+Nutzung (z.B. im Notebook):
+    from sensor_cache import SensorCache
+    ps1, n_typos = SensorCache().load('data/PS1.txt')
+"""
+
+import hashlib
+import json
+import os
+import time
+import numpy as np
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from prep_corrected import read_sensor_file
+
+
+DEFAULT_CACHE_DIR = "cache/sensors"
+DEFAULT_MAX_BYTES = 4 * 1024 ** 3  # 4 GB reichen für alle 17 Sensoren (float64)
+
+
+def file_hash(file_path, chunk_size: int = 1 << 20) -> str:
+    """
+    Berechnet den Inhalts-Hash einer Datei (BLAKE2b, blockweise gelesen).
+
+    Args:
+        file_path: Pfad zur Datei
+        chunk_size: Bytes pro gelesenem Block
+
+    Returns:
+        Hex-String des Hashes
+    """
+    h = hashlib.blake2b(digest_size=16)
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class SensorCache:
+    """
+    Cache für geparste Sensor-Matrizen als memory-mapped .npy-Dateien.
+
+    Pro Quelldatei (und dtype) gibt es genau einen Eintrag:
+    - <name>.npy: die Matrix (Zyklen × Zeitpunkte)
+    - <name>.json: Metadaten (Quelle, Größe, mtime, Hash, Typos, letzter Zugriff)
+
+    Gültigkeit:
+    - Größe + mtime unverändert → Treffer ohne Hashen (schnell)
+    - Größe/mtime geändert → Hash vergleichen; gleich → Treffer, sonst neu parsen
+    - verify_hash=True → Hash wird immer geprüft
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES,
+                 verify_hash: bool = False):
+        """
+        Args:
+            cache_dir: Ordner für die Cache-Dateien
+            max_bytes: Speicherbudget für alle .npy-Dateien zusammen
+            verify_hash: Inhalts-Hash bei jedem Zugriff prüfen
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.verify_hash = verify_hash
+
+    def load(self, file_path, dtype=np.float64) -> Tuple[np.ndarray, int]:
+        """
+        Liefert die geparste Matrix einer Sensor-Datei (aus Cache oder frisch geparst).
+
+        Args:
+            file_path: Pfad zur Sensor-Datei (z.B. data/PS1.txt)
+            dtype: Datentyp der Matrix
+
+        Returns:
+            Tuple aus (read-only Memory-Map Zyklen × Zeitpunkte, Anzahl Typos → NaN)
+        """
+        file_path = Path(file_path)
+        npy_path, meta_path = self._entry_paths(file_path, dtype)
+        stat = file_path.stat()
+
+        meta = self._read_meta(meta_path)
+        if meta is not None and npy_path.exists() and self._is_valid(meta, file_path, stat):
+            meta['last_access'] = time.time()
+            self._write_meta(meta_path, meta)
+            return np.load(npy_path, mmap_mode='r'), meta['n_coerced']
+
+        # Neu parsen und speichern (Hash vorher, damit er zum geparsten Stand passt)
+        content_hash = file_hash(file_path)
+        values, n_coerced = read_sensor_file(file_path, dtype=dtype)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        tmp_path = npy_path.with_suffix('.npy.tmp')
+        with open(tmp_path, 'wb') as f:
+            np.save(f, values)
+        os.replace(tmp_path, npy_path)
+
+        self._write_meta(meta_path, {
+            'source': str(file_path.resolve()),
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'hash': content_hash,
+            'dtype': np.dtype(dtype).name,
+            'shape': list(values.shape),
+            'n_coerced': n_coerced,
+            'last_access': time.time(),
+        })
+        self.evict(keep=[npy_path])
+
+        return np.load(npy_path, mmap_mode='r'), n_coerced
+
+    def evict(self, keep: List[Path] = ()) -> int:
+        """
+        Löscht die am längsten nicht benutzten Einträge, bis das Budget passt.
+
+        Args:
+            keep: Einträge (.npy-Pfade), die nicht gelöscht werden dürfen
+
+        Returns:
+            Anzahl freigegebener Bytes
+        """
+        entries = self.entries()
+        total = sum(e['bytes'] for e in entries)
+        freed = 0
+
+        for entry in sorted(entries, key=lambda e: e['last_access']):
+            if total - freed <= self.max_bytes:
+                break
+            if entry['npy_path'] in keep:
+                continue
+            entry['npy_path'].unlink(missing_ok=True)
+            entry['meta_path'].unlink(missing_ok=True)
+            freed += entry['bytes']
+
+        return freed
+
+    def entries(self) -> List[Dict]:
+        """
+        Listet alle Cache-Einträge mit Größe und letztem Zugriff.
+
+        Returns:
+            Liste von Dictionaries (npy_path, meta_path, bytes, last_access, source)
+        """
+        entries = []
+        if not self.cache_dir.exists():
+            return entries
+
+        for meta_path in self.cache_dir.glob("*.json"):
+            meta = self._read_meta(meta_path)
+            npy_path = meta_path.with_suffix('.npy')
+            if meta is None or not npy_path.exists():
+                continue
+            entries.append({
+                'npy_path': npy_path,
+                'meta_path': meta_path,
+                'bytes': npy_path.stat().st_size,
+                'last_access': meta.get('last_access', 0.0),
+                'source': meta.get('source'),
+            })
+        return entries
+
+    def clear(self):
+        """Löscht alle Cache-Einträge."""
+        for entry in self.entries():
+            entry['npy_path'].unlink(missing_ok=True)
+            entry['meta_path'].unlink(missing_ok=True)
+
+    def _is_valid(self, meta: Dict, file_path: Path, stat: os.stat_result) -> bool:
+        """Prüft, ob ein Eintrag noch zur Quelldatei passt (aktualisiert ggf. mtime)."""
+        if meta['size'] != stat.st_size:
+            return False
+        if meta['mtime_ns'] == stat.st_mtime_ns and not self.verify_hash:
+            return True
+
+        # mtime geändert (z.B. kopiert/touch) → Inhalt entscheidet
+        if file_hash(file_path) != meta['hash']:
+            return False
+        meta['mtime_ns'] = stat.st_mtime_ns
+        return True
+
+    def _entry_paths(self, file_path: Path, dtype) -> Tuple[Path, Path]:
+        """Dateinamen eines Eintrags: Sensorname + Kurz-Hash des Quellpfads + dtype."""
+        path_key = hashlib.blake2b(str(file_path.resolve()).encode(), digest_size=4).hexdigest()
+        name = f"{file_path.stem.lower()}-{path_key}-{np.dtype(dtype).name}"
+        return self.cache_dir / f"{name}.npy", self.cache_dir / f"{name}.json"
+
+    @staticmethod
+    def _read_meta(meta_path: Path):
+        """Liest Metadaten (None falls fehlend oder kaputt)."""
+        try:
+            return json.loads(meta_path.read_text())
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _write_meta(meta_path: Path, meta: Dict):
+        """Schreibt Metadaten atomar (erst .tmp, dann umbenennen)."""
+        tmp_path = meta_path.with_suffix('.json.tmp')
+        tmp_path.write_text(json.dumps(meta, indent=2))
+        os.replace(tmp_path, meta_path)
@@ -0,0 +1,236 @@
+"""
+Hydraulic Systems - Sensor-Tensor
+=================================
+Alle 17 Sensoren auf einer gemeinsamen Zeitachse
+
+KONZEPT:
+Die Sensoren messen mit 1 Hz, 10 Hz und 100 Hz. Für Analysen über mehrere
+Sensoren hinweg (z.B. im Notebook) musste bisher von Hand resampled werden.
+Deshalb: Ein Build-Schritt bringt alle Sensoren auf eine gemeinsame Rate
+und schreibt EINEN zusammenhängenden 3-D-Tensor auf die Platte:
+
+    Zyklen (2205) × Zeitpunkte (T = 60 s · Rate) × Sensoren (17)
+
+- Runter-Sampeln: Mittelwert über Blöcke (z.B. 100 Hz → 10 Hz: je 10 Werte)
+- Hoch-Sampeln: Wert wiederholen (Sample-and-Hold, z.B. 1 Hz → 10 Hz)
+- Datei: kleiner JSON-Header + Rohdaten, per Memory-Map lesbar
+
+Nutzung:
+    python sensor_tensor.py --rate 10
+
+    from sensor_tensor import open_sensor_tensor
+    tensor = open_sensor_tensor("cache/sensor_tensor_10hz.bin")
+    ps1 = tensor.sensor('ps1')     # Zyklen × T (View, keine Kopie)
+    cycle = tensor.cycle(1800)     # T × 17
+"""
+
+import argparse
+import json
+import os
+import numpy as np
+from pathlib import Path
+from typing import Dict, List
+
+from prep_corrected import CYCLE_SECONDS, SAMPLING_RATES, find_sensor_files, read_sensor_file
+
+
+MAGIC = b'HYDTNSR1'
+HEADER_ALIGN = 64  # Daten beginnen an einer 64-Byte-Grenze
+
+
+def resample(values: np.ndarray, source_rate: int, target_rate: int) -> np.ndarray:
+    """
+    Bringt eine Sensor-Matrix vektorisiert auf eine andere Sampling-Rate.
+
+    Args:
+        values: Array Zyklen × Zeitpunkte (60 s bei source_rate)
+        source_rate: Sampling-Rate der Daten in Hz
+        target_rate: gewünschte Rate in Hz
+
+    Returns:
+        Array Zyklen × (60 s · target_rate)
+    """
+    n_rows, n_cols = values.shape
+
+    if target_rate == source_rate:
+        return values
+
+    if source_rate % target_rate == 0:
+        # Dezimieren: Mittelwert über je factor Werte (View → mean), Typos ignorieren
+        factor = source_rate // target_rate
+        with np.errstate(invalid='ignore'):
+            blocks = values.reshape(n_rows, n_cols // factor, factor)
+            return np.nanmean(blocks, axis=2) if np.isnan(values).any() else blocks.mean(axis=2)
+
+    if target_rate % source_rate == 0:
+        # Hochsampeln: jeden Wert factor-mal wiederholen (Sample-and-Hold)
+        return np.repeat(values, target_rate // source_rate, axis=1)
+
+    raise ValueError(f"Rate {target_rate} Hz passt nicht zu {source_rate} Hz "
+                     f"(eine Rate muss ein Vielfaches der anderen sein)")
+
+
+def build_sensor_tensor(data_path: str = "data", output_path: str = None, rate: int = 10,
+                        dtype=np.float32, cache=None) -> Path:
+    """
+    Baut den Tensor Zyklen × T × Sensoren und schreibt ihn als Datei.
+
+    Args:
+        data_path: Pfad zum Datenordner
+        output_path: Ziel-Datei (Standard: cache/sensor_tensor_<rate>hz.bin)
+        rate: gemeinsame Sampling-Rate in Hz (z.B. 1, 10, 100)
+        dtype: Datentyp im Tensor (float32 halbiert die Dateigröße)
+        cache: Optional SensorCache (sensor_cache.py)
+
+    Returns:
+        Pfad der geschriebenen Datei
+    """
+    output_path = Path(output_path or f"cache/sensor_tensor_{rate}hz.bin")
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    print(f"[build_sensor_tensor] Baue Tensor mit {rate} Hz → '{output_path}'...")
+
+    sensor_files = find_sensor_files(data_path)
+    sensors = [f.stem.lower() for f in sensor_files]
+    n_steps = CYCLE_SECONDS * rate
+
+    # Zyklenzahl: kürzeste Datei (wie beim Zusammenführen der Features)
+    n_cycles = min(_count_cycles(f) for f in sensor_files)
+
+    header = {
+        'version': 1,
+        'shape': [n_cycles, n_steps, len(sensors)],
+        'dtype': np.dtype(dtype).name,
+        'rate': rate,
+        'cycle_seconds': CYCLE_SECONDS,
+        'sensors': sensors,
+        'source_rates': {s: SAMPLING_RATES[s] for s in sensors},
+    }
+    # Erst in eine .tmp-Datei schreiben → kein halb fertiger Tensor bei Abbruch
+    tmp_path = output_path.with_suffix(output_path.suffix + '.tmp')
+    offset = _write_header(tmp_path, header)
+
+    tensor = np.memmap(tmp_path, dtype=dtype, mode='r+', offset=offset,
+                       shape=tuple(header['shape']))
+
+    for j, (file_path, sensor) in enumerate(zip(sensor_files, sensors)):
+        if cache is not None:
+            values = cache.load(file_path)[0]
+        else:
+            values = read_sensor_file(file_path)[0]
+        tensor[:, :, j] = resample(np.asarray(values[:n_cycles]), SAMPLING_RATES[sensor], rate)
+        print(f"  ✓ {sensor}: {SAMPLING_RATES[sensor]} Hz → {rate} Hz")
+
+    tensor.flush()
+    del tensor
+    os.replace(tmp_path, output_path)
+
+    size_mb = output_path.stat().st_size / 1e6
+    print(f"  → Tensor {tuple(header['shape'])} ({header['dtype']}, {size_mb:.0f} MB)\n")
+    return output_path
+
+
+def _count_cycles(file_path: Path) -> int:
+    """Anzahl Zyklen (nicht-leere Zeilen) einer Sensor-Datei, ohne zu parsen."""
+    with open(file_path, 'rb') as f:
+        return sum(1 for line in f if line.strip())
+
+
+def _write_header(output_path: Path, header: Dict) -> int:
+    """
+    Schreibt Magic + Header-Länge + JSON-Header (aufgefüllt bis HEADER_ALIGN).
+
+    Returns:
+        Byte-Offset, an dem die Daten beginnen
+    """
+    payload = json.dumps(header).encode()
+    prefix = len(MAGIC) + 4
+    padded = -(-(prefix + len(payload)) // HEADER_ALIGN) * HEADER_ALIGN - prefix
+    payload = payload.ljust(padded, b' ')
+
+    n_bytes = int(np.prod(header['shape'])) * np.dtype(header['dtype']).itemsize
+    with open(output_path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(len(payload).to_bytes(4, 'little'))
+        f.write(payload)
+        f.truncate(prefix + len(payload) + n_bytes)
+
+    return prefix + len(payload)
+
+
+class SensorTensor:
+    """
+    Read-only Sicht auf einen Tensor-File (Zyklen × T × Sensoren, Memory-Map).
+
+    Attribute:
+        data: np.memmap Zyklen × T × Sensoren
+        sensors: Sensor-Namen in der Reihenfolge der letzten Achse
+        rate: gemeinsame Sampling-Rate in Hz
+        header: kompletter Metadaten-Header
+    """
+
+    def __init__(self, path):
+        """
+        Args:
+            path: Pfad zur Tensor-Datei (von build_sensor_tensor)
+        """
+        self.path = Path(path)
+        with open(self.path, 'rb') as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"'{self.path}' ist keine Sensor-Tensor-Datei")
+            header_len = int.from_bytes(f.read(4), 'little')
+            self.header = json.loads(f.read(header_len))
+
+        offset = len(MAGIC) + 4 + header_len
+        self.data = np.memmap(self.path, dtype=self.header['dtype'], mode='r', offset=offset,
+                              shape=tuple(self.header['shape']))
+        self.sensors: List[str] = self.header['sensors']
+        self.rate: int = self.header['rate']
+
+    @property
+    def time(self) -> np.ndarray:
+        """Zeitachse eines Zyklus in Sekunden."""
+        return np.arange(self.data.shape[1]) / self.rate
+
+    def sensor(self, name: str) -> np.ndarray:
+        """Alle Zyklen eines Sensors: Zyklen × T (View)."""
+        return self.data[:, :, self.sensors.index(name.lower())]
+
+    def cycle(self, index: int) -> np.ndarray:
+        """Ein Zyklus mit allen Sensoren: T × Sensoren (View)."""
+        return self.data[index]
+
+
+def open_sensor_tensor(path) -> SensorTensor:
+    """
+    Öffnet eine Tensor-Datei per Memory-Map.
+
+    Args:
+        path: Pfad zur Tensor-Datei
+
+    Returns:
+        SensorTensor
+    """
+    return SensorTensor(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Baut den Sensor-Tensor (Zyklen × Zeit × Sensoren)")
+    parser.add_argument('--data', default='data', help="Datenordner mit den Sensor-Dateien")
+    parser.add_argument('--rate', type=int, default=10, help="gemeinsame Sampling-Rate in Hz")
+    parser.add_argument('--output', default=None, help="Ziel-Datei (Standard: cache/sensor_tensor_<rate>hz.bin)")
+    parser.add_argument('--float64', action='store_true', help="float64 statt float32 speichern")
+    parser.add_argument('--cache', action='store_true',
+                        help="Geparste Sensor-Matrizen aus cache/sensors/ nutzen bzw. dort ablegen")
+    args = parser.parse_args()
+
+    cache = None
+    if args.cache:
+        from sensor_cache import SensorCache
+        cache = SensorCache("cache/sensors")
+    build_sensor_tensor(args.data, args.output, rate=args.rate,
+                        dtype=np.float64 if args.float64 else np.float32, cache=cache)
+
+
+if __name__ == "__main__":
+    main()
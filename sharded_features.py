@@ -0,0 +1,462 @@
+"""
+Hydraulic Systems - Verteilte Features
+======================================
+Feature-Extraktion in Shards mit zusammenführbaren Zwischenständen
+
+KONZEPT:
+extract_features rechnet die 8 Features eines Sensors in einem Stück. Für
+sehr lange Zyklen-Historien soll die Arbeit auf mehrere Rechner verteilt
+werden. Dazu wird jede Sensor-Matrix in Shards zerlegt:
+
+- Shard = (Sensor, Zyklen-Bereich, Spalten-Bereich = Zeitpunkte im Zyklus)
+- Jeder Shard liefert einen FeatureState pro Zyklus (map):
+  count, mean, M2 (Welford), min, max und einen QuantileSketch
+- Zusammenführen (reduce) der Spalten-Shards eines Zyklus:
+  mean/M2 mit der Chan-Formel, min/max direkt, Sketches per merge
+- finalize() macht daraus die 8 Features (std mit ddof=1 wie pandas)
+- Zyklen-Shards über alle Spalten brauchen keinen Merge: Sie rechnen direkt
+  mit compute_sensor_features → bitgleich zu extract_features
+
+Bei Spalten-Shards sind mean/std/min/max exakt (bis auf Rundung in der
+letzten Stelle), median/q25/q75 kommen aus dem Sketch. Die Spalten-Shards
+eines Zyklus werden paarweise gemergt (Tiefe ceil(log2(Spalten-Shards))),
+der Rangfehler ist damit garantiert höchstens --quantile-error (ohne:
+(Tiefe + 1) / (2 · (sketch_size - 1)) plus ein halber Rang, siehe
+quantile_sketch.py). Garantiert ist der Rang, nicht der Wert.
+
+Die Zustände werden als .npz-Dateien in einen Ordner geschrieben (im
+Cluster: gemeinsames Laufwerk oder Objekt-Speicher). Der lokale Runner
+verteilt die Shards auf einen Prozess-Pool statt auf Rechner. Lokal liest
+ein Shard die Datei nur bis zu seiner letzten Zeile, behält davon nur seine
+Zeilen r0..r1 und schneidet nach dem Parsen seine Spalten heraus.
+
+Nutzung:
+    python sharded_features.py run --row-shards 4 --col-shards 2 --jobs 0 --quantile-error 0.005 --check
+    # verteilt: jeder Knoten rechnet seinen Teil der Shards, einer führt zusammen
+    python sharded_features.py map --node 0 --nodes 3 --states shared/states
+    python sharded_features.py reduce --states shared/states
+"""
+
+import argparse
+import itertools
+import os
+import time
+import warnings
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import prep_corrected as prep
+from quantile_sketch import DEFAULT_SKETCH_SIZE, QuantileSketch, merge_depth, sketch_size
+
+
+DEFAULT_STATE_DIR = "cache/shards"
+
+
+class FeatureState:
+    """
+    Zusammenführbarer Zwischenstand der 8 Features für einen Block von Zyklen.
+
+    Entweder exakt (exact = fertige Features, Shard über alle Spalten) oder
+    partiell (Momente, Extrema und Sketch über einen Teil der Spalten).
+    """
+
+    def __init__(self, count: np.ndarray = None, mean: np.ndarray = None, m2: np.ndarray = None,
+                 minimum: np.ndarray = None, maximum: np.ndarray = None,
+                 sketch: Optional[QuantileSketch] = None, exact: Optional[np.ndarray] = None):
+        """
+        Args:
+            count: Gültige Werte pro Zyklus (ohne NaN)
+            mean: Mittelwert pro Zyklus
+            m2: Summe der quadrierten Abweichungen vom Mittelwert
+            minimum, maximum: Extrema pro Zyklus
+            sketch: QuantileSketch pro Zyklus
+            exact: Fertige Features (Zyklen × 8), dann bleiben die anderen Felder leer
+        """
+        self.count = count
+        self.mean = mean
+        self.m2 = m2
+        self.minimum = minimum
+        self.maximum = maximum
+        self.sketch = sketch
+        self.exact = exact
+
+    @property
+    def n_cycles(self) -> int:
+        """Anzahl Zyklen im Zustand."""
+        return len(self.exact) if self.exact is not None else len(self.count)
+
+    @classmethod
+    def from_block(cls, values: np.ndarray, complete: bool = False,
+                   sketch_size: int = DEFAULT_SKETCH_SIZE) -> 'FeatureState':
+        """
+        Zwischenstand aus einem Block Rohdaten.
+
+        Args:
+            values: Array Zyklen × Zeitpunkte (Teil der Spalten oder alle)
+            complete: True, wenn values alle Zeitpunkte der Zyklen enthält
+            sketch_size: Punkte pro Quantil-Sketch
+
+        Returns:
+            FeatureState für die Zyklen des Blocks
+        """
+        values = np.asarray(values, dtype=np.float64)
+        if complete:
+            return cls(exact=prep.compute_sensor_features(values))
+
+        count = values.shape[1] - np.isnan(values).sum(axis=1)
+        with warnings.catch_warnings(), np.errstate(invalid='ignore', divide='ignore'):
+            # Zyklen ohne gültige Werte → NaN (ohne Warnung)
+            warnings.simplefilter('ignore', RuntimeWarning)
+            mean = np.nansum(values, axis=1) / count
+            dev = values - mean[:, None]
+            m2 = np.nansum(dev * dev, axis=1)
+            minimum = np.nanmin(values, axis=1)
+            maximum = np.nanmax(values, axis=1)
+        mean[count == 0] = 0.0
+        return cls(count, mean, m2, minimum, maximum, QuantileSketch.from_values(values, sketch_size))
+
+    def merge(self, other: 'FeatureState') -> 'FeatureState':
+        """
+        Vereinigt die Zwischenstände zweier Spalten-Shards derselben Zyklen.
+
+        mean und M2 mit der Formel von Chan et al. (paarweise Welford):
+            n = n_a + n_b,  δ = mean_b - mean_a
+            mean = mean_a + δ · n_b / n
+            M2 = M2_a + M2_b + δ² · n_a · n_b / n
+
+        Args:
+            other: Zwischenstand derselben Zyklen (andere Spalten)
+
+        Returns:
+            Neuer FeatureState
+        """
+        if self.exact is not None or other.exact is not None:
+            raise ValueError("Zustände über alle Spalten sind schon vollständig und lassen sich nicht mergen")
+        if self.n_cycles != other.n_cycles:
+            raise ValueError(f"Zyklen passen nicht zusammen: {self.n_cycles} vs. {other.n_cycles}")
+
+        count = self.count + other.count
+        safe = np.maximum(count, 1)
+        delta = other.mean - self.mean
+        mean = self.mean + delta * other.count / safe
+        m2 = self.m2 + other.m2 + delta * delta * self.count * other.count / safe
+        return FeatureState(count, mean, m2, np.fmin(self.minimum, other.minimum),
+                            np.fmax(self.maximum, other.maximum), self.sketch.merge(other.sketch))
+
+    def finalize(self) -> np.ndarray:
+        """
+        Die 8 Features in der Reihenfolge von FEATURE_STATS.
+
+        Returns:
+            Array Zyklen × 8
+        """
+        if self.exact is not None:
+            return self.exact
+
+        out = np.empty((self.n_cycles, len(prep.FEATURE_STATS)))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            out[:, 0] = np.where(self.count > 0, self.mean, np.nan)
+            out[:, 1] = np.where(self.count > 1, np.sqrt(self.m2 / (self.count - 1)), np.nan)
+        out[:, 2] = self.minimum
+        out[:, 3] = self.maximum
+        out[:, [5, 4, 6]] = self.sketch.quantile([0.25, 0.5, 0.75])
+        out[:, 7] = out[:, 3] - out[:, 2]
+        return out
+
+    def save(self, path, **meta):
+        """
+        Speichert den Zustand als .npz (atomar: erst .tmp, dann umbenennen).
+
+        Args:
+            path: Zielpfad (.npz)
+            **meta: Zusätzliche skalare Angaben (z.B. Anzahl Typos)
+        """
+        path = Path(path)
+        if self.exact is not None:
+            arrays = {'exact': self.exact}
+        else:
+            arrays = {'count': self.count, 'mean': self.mean, 'm2': self.m2,
+                      'minimum': self.minimum, 'maximum': self.maximum, **self.sketch.to_arrays()}
+        arrays.update({f'meta_{key}': np.array(value) for key, value in meta.items()})
+        tmp_path = path.with_suffix('.tmp.npz')
+        np.savez(tmp_path, **arrays)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path) -> 'FeatureState':
+        """Lädt einen mit save gespeicherten Zustand."""
+        with np.load(path) as arrays:
+            if 'exact' in arrays:
+                return cls(exact=arrays['exact'])
+            return cls(arrays['count'], arrays['mean'], arrays['m2'], arrays['minimum'], arrays['maximum'],
+                       QuantileSketch.from_arrays(arrays))
+
+
+def _scan_file(file_path) -> tuple:
+    """Anzahl nicht-leerer Zeilen (= Zyklen) und Werte in der ersten Zeile (= Zeitpunkte)."""
+    n_rows, n_cols = 0, 0
+    with open(file_path, 'rb') as f:
+        for line in f:
+            if line.strip():
+                if n_rows == 0:
+                    n_cols = len(line.split())  # Trennung wie parse_sensor_lines (beliebiger Whitespace)
+                n_rows += 1
+    return n_rows, n_cols
+
+
+def plan_shards(data_path: str = "data", n_row_shards: int = 1, n_col_shards: int = 1,
+                sketch_size: int = DEFAULT_SKETCH_SIZE) -> List[Dict]:
+    """
+    Zerlegt alle Sensor-Dateien in Shards (feste Reihenfolge → auf allen Knoten gleich).
+
+    Args:
+        data_path: Ordner mit den Sensor-Dateien
+        n_row_shards: Zyklen-Bereiche pro Sensor
+        n_col_shards: Spalten-Bereiche pro Zyklus (höchstens so viele wie Zeitpunkte)
+        sketch_size: Punkte pro Quantil-Sketch
+
+    Returns:
+        Liste von Aufträgen (Sensor, Datei, Zeilen- und Spalten-Bereich)
+    """
+    tasks = []
+    for file_path in prep.find_sensor_files(data_path):
+        sensor = file_path.stem.lower()
+        # Breite aus der Datei, nicht aus CYCLE_SECONDS · Abtastrate (sonst gilt ein
+        # Shard über die nominelle Breite als vollständig, obwohl Spalten fehlen)
+        n_rows, n_cols = _scan_file(file_path)
+        row_edges = np.linspace(0, n_rows, min(n_row_shards, max(n_rows, 1)) + 1).astype(int)
+        col_edges = np.linspace(0, n_cols, min(n_col_shards, n_cols) + 1).astype(int)
+        for (r0, r1), (c0, c1) in itertools.product(zip(row_edges[:-1], row_edges[1:]),
+                                                    zip(col_edges[:-1], col_edges[1:])):
+            tasks.append({'sensor': sensor, 'path': str(file_path), 'rows': (int(r0), int(r1)),
+                          'cols': (int(c0), int(c1)), 'n_rows': n_rows, 'n_cols': n_cols,
+                          'sketch_size': sketch_size})
+    return tasks
+
+
+def _state_name(task: Dict) -> str:
+    """Dateiname des Zustands eines Shards."""
+    (r0, r1), (c0, c1) = task['rows'], task['cols']
+    return f"{task['sensor']}__r{r0}-{r1}__c{c0}-{c1}.npz"
+
+
+def compute_shard(task: Dict, state_dir: str = DEFAULT_STATE_DIR) -> str:
+    """
+    Map-Schritt: Rechnet den Zwischenstand eines Shards und speichert ihn.
+
+    Args:
+        task: Auftrag aus plan_shards
+        state_dir: Ordner für die Zustände
+
+    Returns:
+        Pfad der geschriebenen .npz-Datei
+    """
+    (r0, r1), (c0, c1) = task['rows'], task['cols']
+    # Nur die Zeilen r0..r1 behalten (Datei wird bis r1 durchlaufen, nicht ganz gelesen)
+    with open(task['path'], 'rb') as f:
+        rows = (line.rstrip(b'\r\n') for line in f if line.strip())
+        lines = list(itertools.islice(rows, r0, r1))
+    values, _ = prep.parse_sensor_lines(lines)
+    del lines
+    if values.shape[1] != task['n_cols']:
+        raise ValueError(f"{task['path']}: {values.shape[1]} Werte pro Zeile in Zyklen {r0}-{r1}, "
+                         f"geplant mit {task['n_cols']} (Datei geändert?)")
+
+    block = values[:, c0:c1]
+    complete = (c0, c1) == (0, task['n_cols'])
+    state = FeatureState.from_block(block, complete=complete, sketch_size=task['sketch_size'])
+
+    path = Path(state_dir) / _state_name(task)
+    n_typos = int(np.isnan(block).sum())
+    state.save(path, sensor=task['sensor'], r0=r0, r1=r1, c0=c0, c1=c1, n_rows=task['n_rows'],
+               n_cols=task['n_cols'], typos=n_typos)
+    return str(path)
+
+
+def merge_states(state_dir: str = DEFAULT_STATE_DIR) -> pd.DataFrame:
+    """
+    Reduce-Schritt: Führt alle Zustände im Ordner zu den Features zusammen.
+
+    Pro Sensor und Zyklen-Bereich werden die Spalten-Shards gemergt und
+    finalisiert, danach die Zyklen-Bereiche aneinandergehängt. Fehlt ein
+    Shard (Lücke oder Überlappung bei Zyklen oder Spalten, fehlende Zyklen
+    am Ende), bricht der Merge mit ValueError ab.
+
+    Args:
+        state_dir: Ordner mit den .npz-Zuständen aus compute_shard
+
+    Returns:
+        DataFrame Zyklen × (8 Features pro Sensor), Spalten wie load_and_aggregate_sensors
+    """
+    print(f"[merge_states] Führe Shards aus '{state_dir}' zusammen...")
+    shards: Dict[str, Dict[tuple, list]] = {}
+    for path in sorted(Path(state_dir).glob("*.npz")):
+        with np.load(path) as arrays:
+            meta = {key[len('meta_'):]: arrays[key].item() for key in arrays.files if key.startswith('meta_')}
+        shards.setdefault(meta['sensor'], {}).setdefault((meta['r0'], meta['r1']), []).append((meta, path))
+    if not shards:
+        raise ValueError(f"Keine Shard-Zustände in '{state_dir}'")
+
+    all_features = []
+    for sensor in sorted(shards):
+        blocks, n_typos, expected_start = [], 0, 0
+        n_rows = next(iter(shards[sensor].values()))[0][0]['n_rows']
+        for (r0, r1), parts in sorted(shards[sensor].items()):
+            if r0 != expected_start:
+                raise ValueError(f"Shards für {sensor} unvollständig (Zyklen {expected_start}-{r0} fehlen "
+                                 f"oder überlappen)")
+            parts.sort(key=lambda part: part[0]['c0'])
+            edges = [0] + [meta['c1'] for meta, _ in parts]
+            starts = [meta['c0'] for meta, _ in parts]
+            if starts != edges[:-1] or edges[-1] != parts[0][0]['n_cols']:
+                raise ValueError(f"Shards für {sensor} unvollständig (Zyklen {r0}-{r1}, Spalten-Bereiche "
+                                 f"{[(meta['c0'], meta['c1']) for meta, _ in parts]} von {parts[0][0]['n_cols']})")
+            expected_start = r1
+
+            states = [FeatureState.load(path) for _, path in parts]
+            n_typos += sum(meta['typos'] for meta, _ in parts)
+            blocks.append(_merge_pairwise(states).finalize())
+        if expected_start != n_rows:
+            raise ValueError(f"Shards für {sensor} unvollständig ({expected_start} von {n_rows} Zyklen)")
+
+        features = np.concatenate(blocks, axis=0)
+        all_features.append(pd.DataFrame(features, columns=[f'{sensor}_{stat}' for stat in prep.FEATURE_STATS]))
+        typo_info = f", {n_typos} Typos → NaN" if n_typos > 0 else ""
+        print(f"  ✓ {sensor}: {len(shards[sensor])} Zyklen-Bereiche, {features.shape[0]} Zyklen{typo_info}")
+
+    combined = pd.concat(all_features, axis=1)
+    print(f"  → Gesamt: {combined.shape[0]} Zyklen × {combined.shape[1]} Features\n")
+    return combined
+
+
+def _merge_pairwise(states: List[FeatureState]) -> FeatureState:
+    """Merget Nachbarn paarweise (Baum statt Kette → Sketch-Tiefe ceil(log2(Anzahl)))."""
+    while len(states) > 1:
+        states = [states[i].merge(states[i + 1]) if i + 1 < len(states) else states[i]
+                  for i in range(0, len(states), 2)]
+    return states[0]
+
+
+def run_local(data_path: str = "data", state_dir: str = DEFAULT_STATE_DIR, n_row_shards: int = 1,
+              n_col_shards: int = 1, n_jobs: int = 1, sketch_size: int = DEFAULT_SKETCH_SIZE) -> pd.DataFrame:
+    """
+    Lokaler Ersatz für den Cluster: map auf einem Prozess-Pool, dann reduce.
+
+    Args:
+        data_path: Ordner mit den Sensor-Dateien
+        state_dir: Ordner für die Zustände (wird vorher geleert)
+        n_row_shards: Zyklen-Bereiche pro Sensor
+        n_col_shards: Spalten-Bereiche pro Zyklus
+        n_jobs: Anzahl Prozesse (1 = seriell, 0 = alle CPU-Kerne)
+        sketch_size: Punkte pro Quantil-Sketch
+
+    Returns:
+        DataFrame mit den Features (wie merge_states)
+    """
+    tasks = plan_shards(data_path, n_row_shards, n_col_shards, sketch_size)
+    state_dir = Path(state_dir)
+    state_dir.mkdir(parents=True, exist_ok=True)
+    for old in state_dir.glob("*.npz"):
+        old.unlink()
+
+    if n_jobs <= 0:
+        n_jobs = os.cpu_count() or 1
+    print(f"[run_local] {len(tasks)} Shards ({n_row_shards} Zyklen- × {n_col_shards} Spalten-Bereiche "
+          f"pro Sensor) mit {n_jobs} Prozessen...")
+    start = time.perf_counter()
+    if n_jobs > 1:
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            list(executor.map(compute_shard, tasks, itertools.repeat(str(state_dir))))
+    else:
+        for task in tasks:
+            compute_shard(task, str(state_dir))
+    print(f"  ✓ map: {time.perf_counter() - start:.2f}s\n")
+
+    return merge_states(str(state_dir))
+
+
+def compare_with_exact(features: pd.DataFrame, data_path: str = "data") -> pd.DataFrame:
+    """
+    Maximale Abweichung pro Feature-Art gegenüber load_and_aggregate_sensors.
+
+    Args:
+        features: Ergebnis von merge_states / run_local
+        data_path: Ordner mit den Sensor-Dateien
+
+    Returns:
+        DataFrame Feature-Art × (max. absolute, max. relative Abweichung)
+    """
+    exact = prep.load_and_aggregate_sensors(data_path)
+    rows = []
+    for stat in prep.FEATURE_STATS:
+        cols = [col for col in exact.columns if col.endswith(f'_{stat}')]
+        diff = (features[cols] - exact[cols]).abs().to_numpy()
+        scale = exact[cols].abs().to_numpy()
+        with np.errstate(invalid='ignore', divide='ignore'):
+            rel = np.where(scale > 0, diff / scale, diff)
+        rows.append({'stat': stat, 'max_abs': np.nanmax(diff), 'max_rel': np.nanmax(rel)})
+    return pd.DataFrame(rows).set_index('stat')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Feature-Extraktion in Shards (map/reduce)")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    def shard_options(p):
+        p.add_argument('--data', default='data', help="Ordner mit den Sensor-Dateien")
+        p.add_argument('--row-shards', type=int, default=1, help="Zyklen-Bereiche pro Sensor")
+        p.add_argument('--col-shards', type=int, default=1, help="Spalten-Bereiche (Zeitpunkte) pro Zyklus")
+        p.add_argument('--sketch-size', type=int, default=DEFAULT_SKETCH_SIZE,
+                       help="Punkte pro Quantil-Sketch (Rangfehler höchstens "
+                            "(ceil(log2(Spalten-Shards)) + 1) / (2 · (Größe - 1)) plus ein halber Rang)")
+        p.add_argument('--quantile-error', type=float, default=None, metavar='EPS',
+                       help="Garantierter Rangfehler für median/q25/q75, setzt --sketch-size passend "
+                            "zu --col-shards (quantile_sketch.sketch_size)")
+        p.add_argument('--states', default=DEFAULT_STATE_DIR, help="Ordner für die Shard-Zustände")
+
+    run = sub.add_parser('run', help="map + reduce lokal mit einem Prozess-Pool")
+    shard_options(run)
+    run.add_argument('--jobs', type=int, default=1, help="Prozesse (0 = alle CPU-Kerne)")
+    run.add_argument('--output', default='out/features_sharded.csv', help="Ziel-CSV")
+    run.add_argument('--check', action='store_true', help="Mit dem exakten Weg vergleichen")
+
+    node = sub.add_parser('map', help="Shards eines Knotens rechnen (Auftrag k, k + N, k + 2N, ...)")
+    shard_options(node)
+    node.add_argument('--node', type=int, required=True, help="Nummer dieses Knotens (0 … N-1)")
+    node.add_argument('--nodes', type=int, required=True, help="Anzahl Knoten N")
+
+    reduce = sub.add_parser('reduce', help="Alle Zustände zusammenführen")
+    reduce.add_argument('--states', default=DEFAULT_STATE_DIR, help="Ordner mit den Shard-Zuständen")
+    reduce.add_argument('--output', default='out/features_sharded.csv', help="Ziel-CSV")
+
+    args = parser.parse_args()
+    if getattr(args, 'quantile_error', None) is not None:
+        args.sketch_size = sketch_size(args.quantile_error, merge_depth(args.col_shards))
+
+    if args.command == 'map':
+        tasks = plan_shards(args.data, args.row_shards, args.col_shards, args.sketch_size)[args.node::args.nodes]
+        Path(args.states).mkdir(parents=True, exist_ok=True)
+        print(f"[map] Knoten {args.node}/{args.nodes}: {len(tasks)} Shards")
+        for task in tasks:
+            print(f"  ✓ {compute_shard(task, args.states)}")
+        return
+
+    if args.command == 'run':
+        features = run_local(args.data, args.states, args.row_shards, args.col_shards, args.jobs, args.sketch_size)
+    else:
+        features = merge_states(args.states)
+
+    Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+    features.to_csv(args.output, index=False)
+    print(f"✓ Features gespeichert: {args.output} ({features.shape})")
+
+    if args.command == 'run' and args.check:
+        print("\nAbweichung gegenüber dem exakten Weg (load_and_aggregate_sensors):")
+        print(compare_with_exact(features, args.data).to_string(float_format=lambda v: f"{v:.2e}"))
+
+
+if __name__ == "__main__":
+    main()
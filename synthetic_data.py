@@ -0,0 +1,301 @@
+"""
+Hydraulic Systems - Synthetische Daten
+======================================
+Sensor-Dateien in der Form des UCI-Datensatzes, für beliebig viele Zyklen
+
+KONZEPT:
+Die echten Daten liegen nicht im Repo (data/ muss heruntergeladen werden).
+Für Benchmarks und Tests ohne Download erzeugt dieses Modul einen Ordner
+mit demselben Aufbau:
+
+- <ziel>/data/<SENSOR>.txt: 17 tab-getrennte Matrizen, Zeilen = Zyklen,
+  Spalten = Zeitpunkte (60 s × Sampling-Rate, also 60/600/6000 Spalten)
+- <ziel>/docs/profile.txt: 5 Zielvariablen mit den Werten und Häufigkeiten
+  aus dem Original, in Blöcken gleicher Zustände (wie im Versuchsstand)
+- Wertebereiche und Nachkommastellen an das Original angelehnt, die
+  Zielvariablen verschieben die passenden Sensoren (z.B. Kühler → CE, TS1-4)
+- Tippfehler wie '101.3x' in einem Anteil der Zeilen (typo_rate), damit
+  der langsame Parser-Weg (Typos → NaN) mitgemessen wird
+
+Die Dateien werden blockweise geschrieben (Speicher ∝ Blockgröße), die
+Zahlen vektorisiert formatiert → auch 220.500 Zyklen (ca. 70 GB Text)
+sind machbar. Gleicher Seed → identische Dateien.
+
+Nutzung:
+    python synthetic_data.py --cycles 22050 --output synthetic/22k
+    cd synthetic/22k && python ../../prep_corrected.py
+"""
+
+import argparse
+import json
+import numpy as np
+from pathlib import Path
+from typing import Dict, Optional
+
+from prep_corrected import CYCLE_SECONDS, SAMPLING_RATES, SENSOR_NAMES
+
+# Zyklen im Original-Datensatz
+UCI_CYCLES = 2205
+
+# Anteil der Zeilen mit einem Tippfehler (ca. 2 pro Datei bei 2205 Zyklen)
+DEFAULT_TYPO_RATE = 1e-3
+
+# Zeilen pro geschriebenem Block
+WRITE_BLOCK_ROWS = 256
+
+# Pro Sensor: (typischer Wert, Rauschen, Nachkommastellen)
+SENSOR_LEVELS = {
+    'ps1': (160.0, 1.5, 2), 'ps2': (109.0, 1.0, 2), 'ps3': (1.75, 0.05, 2),
+    'ps4': (2.6, 0.1, 2), 'ps5': (9.16, 0.02, 3), 'ps6': (9.08, 0.02, 3),
+    'eps1': (2500.0, 15.0, 0), 'fs1': (6.2, 0.1, 3), 'fs2': (9.65, 0.02, 3),
+    'ts1': (45.4, 0.05, 3), 'ts2': (50.9, 0.05, 3), 'ts3': (48.3, 0.05, 3), 'ts4': (40.7, 0.05, 3),
+    'vs1': (0.61, 0.01, 3), 'ce': (31.3, 0.3, 3), 'cp': (1.81, 0.02, 3), 'se': (55.3, 0.5, 3),
+}
+
+# Zielvariablen in profile.txt: Werte und Häufigkeiten im Original (2205 Zyklen),
+# der erste Wert ist der Normalzustand, der letzte der schlechteste
+TARGET_VALUES = [
+    ([100, 20, 3], [741, 732, 732]),            # cooler_condition
+    ([100, 90, 80, 73], [1125, 360, 360, 360]),  # valve_condition
+    ([0, 1, 2], [1221, 492, 492]),               # pump_leakage
+    ([130, 115, 100, 90], [599, 399, 399, 808]),  # accumulator_pressure
+    ([0, 1], [1449, 756]),                       # stable_flag
+]
+
+# Relative Verschiebung eines Sensors pro Zielvariable bei schlechtestem Zustand
+CONDITION_EFFECTS = {
+    'ce': [-0.6, 0, 0, 0], 'cp': [-0.5, 0, 0, 0], 'se': [-0.05, 0, -0.1, 0],
+    'ts1': [0.1, 0, 0, 0], 'ts2': [0.1, 0, 0, 0], 'ts3': [0.1, 0, 0, 0], 'ts4': [0.12, 0, 0, 0],
+    'ps1': [0, -0.05, 0, -0.03], 'ps2': [0, -0.04, 0, -0.02], 'ps3': [0, -0.1, 0, 0],
+    'fs1': [0, 0, -0.1, 0], 'eps1': [0, 0, 0.03, 0], 'vs1': [0, 0, 0, 0.2],
+}
+
+# Mittlere Zyklen pro Block gleicher Zustände (Original: ca. 11)
+MEAN_RUN_LENGTH = 11
+
+
+def generate_profile(n_cycles: int, seed: int = 42) -> np.ndarray:
+    """
+    Zielvariablen für n_cycles Zyklen (Blöcke gleicher Zustände).
+
+    Args:
+        n_cycles: Anzahl Zyklen
+        seed: Zufalls-Seed
+
+    Returns:
+        Integer-Array Zyklen × 5 (Spalten wie TARGET_COLUMNS)
+    """
+    rng = np.random.default_rng([seed, 0])
+    run_lengths = rng.geometric(1 / MEAN_RUN_LENGTH, n_cycles)  # jeder Block ≥ 1 Zyklus → reicht immer
+    n_runs = int(np.searchsorted(np.cumsum(run_lengths), n_cycles)) + 1
+    run_of_cycle = np.repeat(np.arange(n_runs), run_lengths[:n_runs])[:n_cycles]
+
+    columns = []
+    for values, counts in TARGET_VALUES:
+        p = np.asarray(counts) / sum(counts)
+        columns.append(np.asarray(values)[rng.choice(len(values), n_runs, p=p)][run_of_cycle])
+    return np.column_stack(columns)
+
+
+def _severity(profile: np.ndarray) -> np.ndarray:
+    """Zielvariablen → Schweregrad 0 (Normalzustand) … 1 (schlechtester Zustand)."""
+    severity = np.empty(profile.shape, dtype=np.float64)
+    for j, (values, _) in enumerate(TARGET_VALUES):
+        best, worst = values[0], values[-1]
+        severity[:, j] = (profile[:, j] - best) / (worst - best)
+    return severity
+
+
+def _load_curve(n_points: int) -> np.ndarray:
+    """Lastprofil eines Zyklus (0 … 1) mit Lastwechseln, auf n_points Zeitpunkte."""
+    knots_t = [0, 5, 6, 20, 21, 30, 31, 45, 46, 60]
+    knots_y = [0.2, 0.2, 1.0, 1.0, 0.6, 0.6, 0.9, 0.9, 0.2, 0.2]
+    return np.interp(np.linspace(0, CYCLE_SECONDS, n_points, endpoint=False), knots_t, knots_y)
+
+
+def sensor_block(sensor: str, severity: np.ndarray, cycles: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    """
+    Rohwerte eines Sensors für einen Block von Zyklen.
+
+    Args:
+        sensor: Sensor-Name (z.B. 'ps1')
+        severity: Schweregrade der Zyklen im Block (Zyklen × 5, siehe _severity)
+        cycles: Zyklus-Nummern im Block (für die langsame Drift)
+        rng: Zufallsgenerator des Sensors
+
+    Returns:
+        Array Zyklen × Zeitpunkte (float64)
+    """
+    level, noise, _ = SENSOR_LEVELS[sensor]
+    n_points = CYCLE_SECONDS * SAMPLING_RATES[sensor]
+
+    effects = np.asarray(CONDITION_EFFECTS.get(sensor, [0, 0, 0, 0]))
+    factor = 1 + severity[:, :4] @ effects + 0.01 * np.sin(2 * np.pi * cycles / 500)
+    noise_scale = noise * (1 + severity[:, 4])  # instabile Zyklen rauschen stärker
+
+    if SAMPLING_RATES[sensor] > 1:
+        shape = 1 + 0.3 * (_load_curve(n_points) - 0.5)
+    else:
+        shape = 1 + 0.02 * np.linspace(-1, 1, n_points)  # langsame Sensoren: Drift im Zyklus
+    values = rng.standard_normal((len(cycles), n_points))
+    values *= noise_scale[:, None]
+    values += level * factor[:, None] * shape[None, :]
+    return values
+
+
+def format_block(values: np.ndarray, decimals: int) -> bytes:
+    """
+    Formatiert eine Matrix als tab-getrennten Text (wie f'{v:.{decimals}f}').
+
+    Statt jede Zahl einzeln zu formatieren, werden die Ziffern aller Werte
+    auf einmal als Byte-Array berechnet (feste Breite, führende Nullen als
+    Leerzeichen) und die Leerzeichen am Ende entfernt.
+
+    Args:
+        values: Array Zeilen × Spalten
+        decimals: Nachkommastellen
+
+    Returns:
+        Text mit einer Zeile pro Matrix-Zeile (inkl. Zeilenumbruch)
+    """
+    scaled = np.rint(values * 10 ** decimals).astype(np.int64)
+    negative = scaled < 0
+    np.abs(scaled, out=scaled)
+
+    n_digits = max(len(str(int(scaled.max()))) if scaled.size else 1, decimals + 1)
+    powers = 10 ** np.arange(n_digits - 1, -1, -1, dtype=np.int64)
+    digits = ((scaled[..., None] // powers) % 10).astype(np.uint8)
+
+    n_int = n_digits - decimals
+    parts = [np.where(negative, ord('-'), ord(' ')).astype(np.uint8)[..., None]]
+    int_chars = digits[..., :n_int] + np.uint8(ord('0'))
+    if n_int > 1:
+        # führende Nullen (außer der Einerstelle) → Leerzeichen
+        leading = np.cumsum(digits[..., :n_int - 1], axis=-1) == 0
+        int_chars[..., :n_int - 1][leading] = ord(' ')
+    parts.append(int_chars)
+    if decimals:
+        parts.append(np.full(values.shape + (1,), ord('.'), dtype=np.uint8))
+        parts.append(digits[..., n_int:] + np.uint8(ord('0')))
+    sep = np.full(values.shape + (1,), ord('\t'), dtype=np.uint8)
+    sep[:, -1] = ord('\n')
+    parts.append(sep)
+
+    text = np.concatenate(parts, axis=-1).ravel()
+    return text[text != ord(' ')].tobytes()
+
+
+def _insert_typos(text: bytes, rows: np.ndarray, rng: np.random.Generator) -> bytes:
+    """Hängt in den gewählten Zeilen an einen zufälligen Wert ein 'x' an (z.B. '101.3x')."""
+    lines = text.split(b'\n')
+    for row in rows:
+        fields = lines[row].split(b'\t')
+        col = rng.integers(len(fields))
+        fields[col] += b'x'
+        lines[row] = b'\t'.join(fields)
+    return b'\n'.join(lines)
+
+
+def write_sensor_file(file_path, sensor: str, profile: np.ndarray, seed: int = 42,
+                      typo_rate: float = DEFAULT_TYPO_RATE, block_rows: int = WRITE_BLOCK_ROWS) -> int:
+    """
+    Schreibt die Datei eines Sensors blockweise.
+
+    Args:
+        file_path: Zielpfad (z.B. data/PS1.txt)
+        sensor: Sensor-Name (z.B. 'ps1')
+        profile: Zielvariablen (siehe generate_profile), bestimmt die Zyklenzahl
+        seed: Zufalls-Seed (pro Sensor abgeleitet → unabhängig von der Reihenfolge)
+        typo_rate: Anteil der Zeilen mit einem Tippfehler
+        block_rows: Zeilen pro Block
+
+    Returns:
+        Anzahl eingebauter Tippfehler
+    """
+    rng = np.random.default_rng([seed, 1 + SENSOR_NAMES.index(sensor)])
+    severity = _severity(profile)
+    decimals = SENSOR_LEVELS[sensor][2]
+    n_typos = 0
+
+    with open(file_path, 'wb') as f:
+        for start in range(0, len(profile), block_rows):
+            cycles = np.arange(start, min(start + block_rows, len(profile)))
+            text = format_block(sensor_block(sensor, severity[cycles], cycles, rng), decimals)
+            typo_rows = np.flatnonzero(rng.random(len(cycles)) < typo_rate)
+            if len(typo_rows):
+                text = _insert_typos(text, typo_rows, rng)
+                n_typos += len(typo_rows)
+            f.write(text)
+
+    return n_typos
+
+
+def generate_dataset(output: str, n_cycles: int = UCI_CYCLES, seed: int = 42,
+                     typo_rate: float = DEFAULT_TYPO_RATE, sensors: Optional[list] = None,
+                     force: bool = False) -> Dict:
+    """
+    Erzeugt einen kompletten Datensatz (data/ + docs/profile.txt) unter output.
+
+    Liegt dort schon ein Datensatz mit denselben Parametern (synthetic.json),
+    wird nichts neu geschrieben.
+
+    Args:
+        output: Zielordner
+        n_cycles: Anzahl Zyklen (Original: 2205)
+        seed: Zufalls-Seed
+        typo_rate: Anteil der Zeilen mit einem Tippfehler
+        sensors: Sensor-Namen (None = alle 17)
+        force: Auch bei passendem synthetic.json neu schreiben
+
+    Returns:
+        Manifest (Parameter, Typos und Bytes pro Datei)
+    """
+    output = Path(output)
+    params = {'n_cycles': n_cycles, 'seed': seed, 'typo_rate': typo_rate,
+              'sensors': sorted(sensors or SENSOR_NAMES)}
+    manifest_path = output / 'synthetic.json'
+    if manifest_path.exists() and not force:
+        manifest = json.loads(manifest_path.read_text())
+        if manifest['params'] == params:
+            print(f"[generate_dataset] Synthetischer Datensatz vorhanden: {output} ({n_cycles} Zyklen)\n")
+            return manifest
+
+    print(f"[generate_dataset] Erzeuge {n_cycles} Zyklen in '{output}'...")
+    (output / 'data').mkdir(parents=True, exist_ok=True)
+    (output / 'docs').mkdir(parents=True, exist_ok=True)
+    manifest_path.unlink(missing_ok=True)  # erst nach vollständigem Schreiben neu anlegen
+
+    profile = generate_profile(n_cycles, seed)
+    np.savetxt(output / 'docs' / 'profile.txt', profile, fmt='%d', delimiter='\t')
+
+    files = {}
+    for sensor in params['sensors']:
+        file_path = output / 'data' / f"{sensor.upper()}.txt"
+        n_typos = write_sensor_file(file_path, sensor, profile, seed, typo_rate)
+        files[sensor] = {'bytes': file_path.stat().st_size, 'typos': n_typos}
+        print(f"  ✓ {file_path.name}: {n_cycles} × {CYCLE_SECONDS * SAMPLING_RATES[sensor]}, "
+              f"{files[sensor]['bytes'] / 1e6:.1f} MB, {n_typos} Typos")
+
+    manifest = {'params': params, 'files': files}
+    manifest_path.write_text(json.dumps(manifest, indent=2))
+    total = sum(f['bytes'] for f in files.values())
+    print(f"  → Gesamt: {total / 1e9:.2f} GB\n")
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Synthetischer Datensatz in der Form der UCI-Daten")
+    parser.add_argument('--cycles', type=int, default=UCI_CYCLES, help="Anzahl Zyklen (z.B. 2205, 22050, 220500)")
+    parser.add_argument('--output', default='synthetic', help="Zielordner (enthält danach data/ und docs/)")
+    parser.add_argument('--seed', type=int, default=42, help="Zufalls-Seed")
+    parser.add_argument('--typo-rate', type=float, default=DEFAULT_TYPO_RATE,
+                        help="Anteil der Zeilen mit einem Tippfehler wie '101.3x'")
+    parser.add_argument('--sensors', nargs='+', choices=SENSOR_NAMES, default=None, help="Nur diese Sensoren")
+    parser.add_argument('--force', action='store_true', help="Vorhandenen Datensatz überschreiben")
+    args = parser.parse_args()
+
+    generate_dataset(args.output, args.cycles, args.seed, args.typo_rate, args.sensors, args.force)
+
+
+if __name__ == "__main__":
+    main()